@@ -0,0 +1,43 @@
+# benchmarks/bench_assign.py
+# Compare the linear-scan and indexed assignment engines on synthetic data.
+# Run from the project folder:  python -m benchmarks.bench_assign
+
+import argparse
+import time
+
+from engine import assign_parcels, assign_parcels_linear
+from benchmarks.generate import DataSpec, build_repos
+
+
+def make_fleet(n_hubs, riders_per_hub, parcels_per_hub, seed=42):
+    spec = DataSpec(hubs=n_hubs, riders=n_hubs * riders_per_hub, parcels=n_hubs * parcels_per_hub, seed=seed)
+    hubs, parcels, riders = build_repos(spec)
+    return hubs, riders, parcels
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Linear vs indexed assign_parcels")
+    parser.add_argument("--hubs", type=int, default=4)
+    parser.add_argument("--riders", type=int, default=300, help="riders per hub")
+    parser.add_argument("--parcels", type=int, default=20000, help="parcels per hub")
+    args = parser.parse_args()
+
+    hubs, riders, parcels = make_fleet(args.hubs, args.riders, args.parcels)
+    t_linear, linear = timed(assign_parcels_linear, hubs, riders, parcels)
+    t_indexed, indexed = timed(assign_parcels, hubs, riders, parcels)
+
+    print(f"{args.hubs} hubs x {args.riders} riders x {args.parcels} parcels")
+    print(f"  linear : {t_linear:8.3f} s")
+    print(f"  indexed: {t_indexed:8.3f} s  ({t_linear / t_indexed:.1f}x)")
+    same = linear == indexed and list(linear[0]) == list(indexed[0])
+    print(f"  identical output: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_bulk.py
+# Rows/second for load_parcels vs load_parcels_bulk on a file with bad rows.
+# Logging goes to a real (null) stream so per-row warnings cost what they do
+# in production. Run from the project folder:  python -m benchmarks.bench_bulk
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from engine import load_parcels
+from bulk import load_parcels_bulk
+from benchmarks.generate import DataSpec, write_csvs
+
+
+def dirty_copy(src, dst, bad_ratio, seed=1):
+    rng = random.Random(seed)
+    with open(src) as f, open(dst, "w") as out:
+        out.write(next(f))
+        for line in f:
+            if rng.random() < bad_ratio:
+                line = line.rsplit(",", 1)[0] + ",n/a\n"
+            out.write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk vs row-by-row parcel loading")
+    parser.add_argument("--parcels", type=int, default=300000)
+    parser.add_argument("--bad-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    devnull = open(os.devnull, "w")
+    root.addHandler(logging.StreamHandler(devnull))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, clean, _ = write_csvs(DataSpec(parcels=args.parcels), tmp)
+        dirty = os.path.join(tmp, "dirty.csv")
+        dirty_copy(clean, dirty, args.bad_ratio)
+
+        print(f"{args.parcels} rows, {args.bad_ratio:.0%} bad")
+        for label, path in (("clean", clean), ("dirty", dirty)):
+            start = time.perf_counter()
+            slow = load_parcels(path)
+            t_slow = time.perf_counter() - start
+            start = time.perf_counter()
+            fast, report = load_parcels_bulk(path)
+            t_fast = time.perf_counter() - start
+            same = [p.to_row() for p in slow.all()] == [p.to_row() for p in fast.all()]
+            print(f"  {label}: load_parcels {args.parcels / t_slow:10.0f} rows/s | "
+                  f"bulk {args.parcels / t_fast:10.0f} rows/s ({t_slow / t_fast:.1f}x) "
+                  f"rejected={report.total} identical={same}")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_dispatch.py
+# Parcels arriving in batches: re-sorting the whole waiting list per batch
+# vs pushing into DispatchQueue, then popping the next parcels to dispatch.
+# Run from the project folder:  python -m benchmarks.bench_dispatch
+
+import argparse
+import time
+
+from models import DavyJonesLocker, HuecoMundo, ShiraiRyu
+from dispatch import DispatchQueue
+from benchmarks.generate import DataSpec, build_repos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heap dispatch vs re-sorting per batch")
+    parser.add_argument("--parcels", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=500, help="parcels arriving per batch")
+    parser.add_argument("--take", type=int, default=400, help="parcels dispatched per batch")
+    args = parser.parse_args()
+
+    _, parcels, _ = build_repos(DataSpec(hubs=3, parcels=args.parcels))
+    parcels = parcels.all()
+    points = [DavyJonesLocker("PK1", "H1"), ShiraiRyu("PK2", "H2"), HuecoMundo("PK3", "H3")]
+    batches = [parcels[i:i + args.batch] for i in range(0, len(parcels), args.batch)]
+
+    queue = DispatchQueue(points, age_rate=0.001)
+    start = time.perf_counter()
+    heap_out = []
+    for batch in batches:
+        queue.extend(batch)
+        for _ in range(min(args.take, len(queue))):
+            heap_out.append(queue.pop())
+    heap_out.extend(queue.drain())
+    t_heap = time.perf_counter() - start
+
+    scorer = DispatchQueue(points, age_rate=0.001)
+    start = time.perf_counter()
+    waiting, sort_out, seq = [], [], 0
+    for batch in batches:
+        for parcel in batch:
+            waiting.append((scorer.score(parcel, seq), seq, parcel))
+            seq += 1
+        waiting.sort(key=lambda e: (e[0], e[1]))
+        sort_out.extend(e[2] for e in waiting[:args.take])
+        del waiting[:args.take]
+    sort_out.extend(e[2] for e in waiting)
+    t_sort = time.perf_counter() - start
+
+    print(f"{args.parcels} parcels in batches of {args.batch}, dispatching {args.take} per batch")
+    print(f"  re-sort per batch : {t_sort:8.3f} s")
+    print(f"  DispatchQueue     : {t_heap:8.3f} s  ({t_sort / t_heap:.1f}x)")
+    print(f"  same order        : {[p.get_id() for p in heap_out] == [p.get_id() for p in sort_out]}")
+
+
+if __name__ == "__main__":
+    main()
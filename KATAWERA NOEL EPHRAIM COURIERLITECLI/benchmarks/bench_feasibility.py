@@ -0,0 +1,53 @@
+# benchmarks/bench_feasibility.py
+# Time of the capacity pre-analysis against a full assignment run, and of
+# prefilter + assign against assign alone, for ParcelRepo and ParcelTable.
+# Uses NumPy when installed (--python forces the plain loop).
+# Run from the project folder:  python -m benchmarks.bench_feasibility
+
+import argparse
+import time
+
+from models import ParcelTable
+from engine import assign_parcels
+from feasibility import analyse, np, prefilter
+from benchmarks.generate import add_spec_arguments, build_repos, spec_from_args
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capacity pre-analysis vs full assignment")
+    add_spec_arguments(parser)
+    parser.add_argument("--python", action="store_true", help="use the pure-Python backend even with NumPy")
+    parser.set_defaults(hubs=8, riders=32, parcels=200000, weights="pareto")
+    args = parser.parse_args()
+    use_numpy = np is not None and not args.python
+
+    hubs, repo, riders = build_repos(spec_from_args(args))
+    table = ParcelTable.from_parcels(repo.all())
+    print(f"{args.parcels} parcels, {args.riders} riders in {args.hubs} hubs, "
+          f"{args.weights} weights, backend={'numpy' if use_numpy else 'python'}")
+
+    for label, parcels in (("ParcelRepo", repo), ("ParcelTable", table)):
+        (report, _), t_analyse = timed(analyse, riders, parcels, use_numpy)
+        (full, t_assign) = timed(assign_parcels, hubs, riders, parcels)
+        start = time.perf_counter()
+        kept, report = prefilter(riders, parcels, use_numpy)
+        assignments, unassigned = assign_parcels(hubs, riders, kept)
+        t_filtered = time.perf_counter() - start
+        same = (unassigned | set(report.unassignable)) == full[1] and \
+            {r: [p.get_id() for p in ps] for r, ps in assignments.items()} == \
+            {r: [p.get_id() for p in ps] for r, ps in full[0].items()}
+        print(f"  {label}:")
+        print(f"    analyse           : {t_analyse:8.3f} s  ({len(report.unassignable)} never fit, "
+              f"overloaded hubs: {len(report.overloaded())}/{len(report.hubs)})")
+        print(f"    assign            : {t_assign:8.3f} s")
+        print(f"    prefilter + assign: {t_filtered:8.3f} s  ({t_assign / t_filtered:.2f}x)  identical={same}")
+
+
+if __name__ == "__main__":
+    main()
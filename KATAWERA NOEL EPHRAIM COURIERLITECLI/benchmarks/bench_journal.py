@@ -0,0 +1,67 @@
+# benchmarks/bench_journal.py
+# Cost of journaling an assignment run and time to recover after a crash.
+# A full journaled run is cut at --crash-at of its bytes (usually mid-record,
+# like a real crash) and then resumed; that is compared with recomputing
+# from scratch and with replaying the compacted journal of a finished run.
+# Run from the project folder:  python -m benchmarks.bench_journal
+
+import argparse
+import os
+import tempfile
+import time
+
+from engine import assign_parcels_with_loads
+from journal import assign_parcels_journaled, compact_journal, read_journal
+from benchmarks.generate import add_spec_arguments, build_repos, spec_from_args
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def same(a, b):
+    ids = lambda assignments: {rid: [p.get_id() for p in ps] for rid, ps in assignments.items()}
+    return ids(a[0]) == ids(b[0]) and a[1] == b[1] and a[2] == b[2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Journaled assignment: overhead and recovery time")
+    add_spec_arguments(parser)
+    parser.set_defaults(parcels=500000, riders=40000)
+    parser.add_argument("--batch-size", type=int, default=4096, help="decisions per fsync'd record")
+    parser.add_argument("--crash-at", type=float, default=0.9, help="fraction of the journal that survives")
+    args = parser.parse_args()
+
+    hubs, parcels, riders = build_repos(spec_from_args(args))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "assign.journal")
+        t_plain, plain = timed(assign_parcels_with_loads, hubs, riders, parcels)
+        t_nosync, _ = timed(assign_parcels_journaled, hubs, riders, parcels, path,
+                            batch_size=args.batch_size, fsync=False)
+        os.remove(path)
+        t_full, full = timed(assign_parcels_journaled, hubs, riders, parcels, path, batch_size=args.batch_size)
+        size = os.path.getsize(path)
+
+        with open(path, "r+b") as f:
+            f.truncate(int(size * args.crash_at))
+        survived = len(read_journal(path))
+        t_resume, resumed = timed(assign_parcels_journaled, hubs, riders, parcels, path,
+                                  batch_size=args.batch_size)
+        t_compact, (before, after) = timed(compact_journal, path)
+        t_replay, replayed = timed(assign_parcels_journaled, hubs, riders, parcels, path)
+
+        print(f"{args.parcels} parcels, {args.riders} riders, batch {args.batch_size}")
+        print(f"  plain assignment          : {t_plain:8.3f} s")
+        print(f"  journaled, no fsync       : {t_nosync:8.3f} s")
+        print(f"  journaled, fsync per batch: {t_full:8.3f} s  ({size / 1e6:.1f} MB) identical={same(full, plain)}")
+        print(f"  resume after crash at {args.crash_at:.0%}: {t_resume:8.3f} s  "
+              f"({survived} decisions replayed) identical={same(resumed, plain)}")
+        print(f"  compaction                : {t_compact:8.3f} s  {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+        print(f"  replay of compacted run   : {t_replay:8.3f} s  ({replayed[3]} decisions) "
+              f"identical={same(replayed, plain)}")
+
+
+if __name__ == "__main__":
+    main()
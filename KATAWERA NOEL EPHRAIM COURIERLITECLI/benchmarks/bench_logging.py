@@ -0,0 +1,100 @@
+# benchmarks/bench_logging.py
+# Rows/second for load_parcels on a file with bad rows, with logging going to
+# a real log file plus a console stream (devnull), as logging.conf sets up.
+# Compares handlers called in the loader's thread against the QueueListener
+# from logsetup, each with every bad row logged and with RowWarnings' limit.
+# --sink-delay-us makes every console write that slow (a busy terminal or a
+# network share); the queued handlers take it off the loader's thread.
+# Run from the project folder:  python -m benchmarks.bench_logging
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import logsetup
+from engine import load_parcels
+from benchmarks.bench_bulk import dirty_copy
+from benchmarks.generate import DataSpec, write_csvs
+
+
+class SlowStream:
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def use_handlers(log_path, console, queued):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
+    handlers = [logging.FileHandler(log_path), logging.StreamHandler(console)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    if queued:
+        # setup_logging moves whatever is on root behind the queue
+        logsetup.setup_logging(config_path=None)
+    return handlers
+
+
+def timed_load(path, log_path, console, queued, limit):
+    logsetup.ROW_WARNING_LIMIT = limit
+    handlers = use_handlers(log_path, console, queued)
+    start = time.perf_counter()
+    repo = load_parcels(path)
+    loaded = time.perf_counter() - start
+    logsetup.stop_logging()    # drain the queue; not part of the loader's time
+    drained = time.perf_counter() - start
+    for handler in handlers:
+        handler.close()
+    with open(log_path) as f:
+        lines = sum(1 for _ in f)
+    os.remove(log_path)
+    return repo, loaded, drained, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loader throughput with logging enabled")
+    parser.add_argument("--parcels", type=int, default=300000)
+    parser.add_argument("--bad-ratio", type=float, default=0.05)
+    parser.add_argument("--sink-delay-us", type=float, default=0.0, help="extra cost of each console write")
+    args = parser.parse_args()
+
+    default_limit = logsetup.ROW_WARNING_LIMIT
+    devnull = open(os.devnull, "w")
+    console = SlowStream(devnull, args.sink_delay_us / 1e6) if args.sink_delay_us else devnull
+    with tempfile.TemporaryDirectory() as tmp:
+        _, clean, _ = write_csvs(DataSpec(parcels=args.parcels), tmp)
+        dirty = os.path.join(tmp, "dirty.csv")
+        dirty_copy(clean, dirty, args.bad_ratio)
+        log_path = os.path.join(tmp, "courierlite.log")
+
+        print(f"{args.parcels} rows, {args.bad_ratio:.0%} bad, console write +{args.sink_delay_us:.0f} us")
+        baseline = None
+        for queued in (False, True):
+            for label, limit in (("every row", args.parcels), ("rate-limited", default_limit)):
+                repo, loaded, drained, lines = timed_load(dirty, log_path, console, queued, limit)
+                rows = [p.to_row() for p in repo.all()]
+                if baseline is None:
+                    baseline = rows
+                mode = "queue" if queued else "sync "
+                print(f"  {mode} {label:12s}: {args.parcels / loaded:10.0f} rows/s "
+                      f"(drained after {drained * 1000:7.1f} ms) log lines={lines:6d} "
+                      f"identical={rows == baseline}")
+    logsetup.ROW_WARNING_LIMIT = default_limit
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
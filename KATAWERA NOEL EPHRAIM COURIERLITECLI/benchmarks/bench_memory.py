@@ -0,0 +1,72 @@
+# benchmarks/bench_memory.py
+# Bytes per parcel for a dict-based model, the __slots__ Parcel and ParcelTable.
+# Run from the project folder:  python -m benchmarks.bench_memory
+
+import argparse
+import tracemalloc
+
+from models import Parcel, ParcelTable
+from engine import ParcelRepo
+from benchmarks.generate import DataSpec, parcel_rows
+
+
+class DictParcel:
+    # Same fields as Parcel before it gained __slots__
+    def __init__(self, parcel_id, recipient, priority, hub_id, destination, weight_kg):
+        self.id = parcel_id
+        self.recipient = recipient
+        self.priority = priority.upper()
+        self.hub_id = hub_id
+        self.destination = destination
+        self.weight_kg = weight_kg
+
+    def get_id(self):
+        return str(self.id)
+
+
+def measure(build, n):
+    rows = list(parcel_rows(DataSpec(parcels=n)))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    holder = build(rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del holder
+    return (after - before) / n
+
+
+def build_dict_repo(rows):
+    repo = ParcelRepo()
+    for row in rows:
+        repo.add(DictParcel(*row))
+    return repo
+
+
+def build_slots_repo(rows):
+    repo = ParcelRepo()
+    for row in rows:
+        repo.add(Parcel(*row))
+    return repo
+
+
+def build_table(rows):
+    table = ParcelTable()
+    for row in rows:
+        table.append(*row)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per parcel by representation")
+    parser.add_argument("--parcels", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{args.parcels} parcels (bytes per parcel, strings from the CSV rows excluded)")
+    for label, build in (("dict Parcel + ParcelRepo", build_dict_repo),
+                         ("slots Parcel + ParcelRepo", build_slots_repo),
+                         ("ParcelTable", build_table)):
+        print(f"  {label:28s}: {measure(build, args.parcels):7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# benchmarks/bench_parallel.py
+# Scaling of assign_parcels_parallel across worker counts.
+# Run from the project folder:  python -m benchmarks.bench_parallel
+
+import argparse
+import os
+import time
+
+from engine import assign_parcels
+from parallel import assign_parcels_parallel
+from benchmarks.bench_assign import make_fleet
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-hub process pool scaling")
+    parser.add_argument("--hubs", type=int, default=16)
+    parser.add_argument("--riders", type=int, default=300, help="riders per hub")
+    parser.add_argument("--parcels", type=int, default=50000, help="parcels per hub")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    hubs, riders, parcels = make_fleet(args.hubs, args.riders, args.parcels)
+    start = time.perf_counter()
+    serial = assign_parcels(hubs, riders, parcels)
+    t_serial = time.perf_counter() - start
+    print(f"{args.hubs} hubs x {args.riders} riders x {args.parcels} parcels")
+    print(f"  serial     : {t_serial:8.3f} s")
+
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        result = assign_parcels_parallel(hubs, riders, parcels, workers=workers)
+        elapsed = time.perf_counter() - start
+        same = result == serial and list(result[0]) == list(serial[0])
+        print(f"  workers={workers:<3}: {elapsed:8.3f} s  ({t_serial / elapsed:.2f}x)  identical={same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_repos.py
+# ParcelRepo / RiderRepo secondary indexes vs the dict-plus-copy way of
+# answering the same questions: one hub's parcels of one priority, the
+# EXPRESS-then-NORMAL dispatch order, riders grouped by hub in id order, and
+# counting. Also shows what building and maintaining the indexes costs.
+# Run from the project folder:  python -m benchmarks.bench_repos
+
+import argparse
+import time
+
+from engine import ParcelRepo
+from benchmarks.generate import add_spec_arguments, build_repos, spec_from_args
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def scan_partition(parcels, hub_id, priority):
+    return [p for p in parcels.all() if p.hub_id == hub_id and p.priority == priority]
+
+
+def scan_dispatch_order(parcels):
+    all_parcels = parcels.all()
+    return [p for p in all_parcels if p.priority == 'EXPRESS'] + [p for p in all_parcels if p.priority == 'NORMAL']
+
+
+def group_riders(riders):
+    hub_riders = {}
+    for rider in riders.all():
+        hub_riders.setdefault(rider.home_hub_id, []).append(rider)
+    return {hub_id: sorted(group, key=lambda r: r.get_id()) for hub_id, group in hub_riders.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repo secondary indexes vs full scans and copies")
+    add_spec_arguments(parser)
+    parser.set_defaults(parcels=500000, riders=5000, hubs=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    _, parcels, riders = build_repos(spec_from_args(args))
+    items = parcels.all()
+    hub_id = parcels.hub_ids()[-1]
+    print(f"{args.parcels} parcels, {args.riders} riders, {args.hubs} hubs (best of {args.repeat})")
+
+    def fill(indexed):
+        repo = ParcelRepo()
+        if indexed:
+            repo.hub_ids()   # build the (empty) indexes so every add() maintains them
+        for parcel in items:
+            repo.add(parcel)
+        return repo
+
+    t_plain, _ = best(lambda: fill(False), args.repeat)
+    t_live, _ = best(lambda: fill(True), args.repeat)
+
+    def first_query():
+        parcels.invalidate()
+        parcels.by_priority('EXPRESS')
+        return parcels.hub_ids()
+
+    t_build, _ = best(first_query, args.repeat)
+    print(f"  add() x{len(items)}: {t_plain * 1000:8.1f} ms, keeping indexes live {t_live * 1000:8.1f} ms; "
+          f"building both indexes in one pass each {t_build * 1000:8.1f} ms")
+
+    rows = [
+        ("hub partition, NORMAL", lambda: scan_partition(parcels, hub_id, 'NORMAL'),
+         lambda: list(parcels.by_hub(hub_id, 'NORMAL'))),
+        ("dispatch order", lambda: scan_dispatch_order(parcels),
+         lambda: [*parcels.by_priority('EXPRESS'), *parcels.by_priority('NORMAL')]),
+        ("riders by hub", lambda: group_riders(riders),
+         lambda: {h: riders.by_hub(h) for h in riders.hub_ids()}),
+        ("count parcels", lambda: len(parcels.ids()), lambda: len(parcels)),
+        ("iterate parcels", lambda: sum(1 for _ in parcels.all()), lambda: sum(1 for _ in parcels.values())),
+    ]
+    for label, old, new in rows:
+        t_old, a = best(old, args.repeat)
+        t_new, b = best(new, args.repeat)
+        if isinstance(a, dict):
+            same = {k: [r.get_id() for r in v] for k, v in a.items()} == \
+                   {k: [r.get_id() for r in v] for k, v in b.items()}
+        elif isinstance(a, list):
+            same = [p.get_id() for p in a] == [p.get_id() for p in b]
+        else:
+            same = a == b
+        speedup = f"{t_old / t_new:8.1f}x" if t_new else "     inf"
+        print(f"  {label:22s}: copy/scan {t_old * 1000:9.3f} ms | index {t_new * 1000:9.3f} ms "
+              f"{speedup} identical={same}")
+
+
+if __name__ == "__main__":
+    main()
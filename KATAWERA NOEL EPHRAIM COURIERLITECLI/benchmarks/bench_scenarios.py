@@ -0,0 +1,70 @@
+# benchmarks/bench_scenarios.py
+# N what-if scenarios: reload the CSVs and assign for each one (what ops do
+# today) vs run_scenarios on one load at each worker count.
+# Run from the project folder:  python -m benchmarks.bench_scenarios
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from cli import load_all
+from engine import RiderRepo, assign_parcels
+from models import Rider
+from scenarios import Scenario, run_scenarios
+from benchmarks.generate import add_spec_arguments, spec_from_args, write_csvs
+
+
+def make_scenarios(riders, hubs, n, seed=7):
+    rng = random.Random(seed)
+    rider_ids = sorted(riders.ids())
+    scenarios = []
+    for i in range(n):
+        hub = f"H{rng.randrange(hubs) + 1}"
+        rider = rng.choice(rider_ids)
+        text = rng.choice([f"add:{hub}:{rng.randrange(5, 40)}:{rng.randrange(1, 4)}",
+                           f"limit:{rider}:{rng.randrange(3, 20)}",
+                           f"remove:{rider}"])
+        scenarios.append(Scenario.parse(f"s{i}={text}"))
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if scenarios: reload per scenario vs shared parcels")
+    add_spec_arguments(parser)
+    parser.add_argument("--scenarios", type=int, default=16)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.set_defaults(hubs=8, riders=400, parcels=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_csvs(spec_from_args(args), tmp)
+        _, _, riders, _ = load_all(tmp)
+        scenarios = make_scenarios(riders, args.hubs, args.scenarios)
+        print(f"{args.scenarios} scenarios, {args.parcels} parcels, {args.riders} riders, {os.cpu_count()} CPU(s)")
+
+        start = time.perf_counter()
+        reloaded = []
+        for scenario in scenarios:
+            hubs, parcels, base, _ = load_all(tmp)
+            roster = RiderRepo()
+            for row in scenario.apply(base):
+                roster.add(Rider(*row))
+            reloaded.append(len(assign_parcels(hubs, roster, parcels)[1]))
+        t_reload = time.perf_counter() - start
+        print(f"  reload + assign each : {t_reload:8.3f} s")
+
+        start = time.perf_counter()
+        _, parcels, _, _ = load_all(tmp)
+        t_load = time.perf_counter() - start
+        for workers in range(1, args.max_workers + 1):
+            start = time.perf_counter()
+            results = run_scenarios(riders, parcels, scenarios, workers=workers, baseline=False)
+            elapsed = t_load + time.perf_counter() - start
+            same = [r.unassigned for r in results] == reloaded
+            print(f"  shared, workers={workers:<3} : {elapsed:8.3f} s  ({t_reload / elapsed:.2f}x)  identical={same}")
+
+
+if __name__ == "__main__":
+    main()
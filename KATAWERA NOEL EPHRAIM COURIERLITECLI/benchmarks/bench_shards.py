@@ -0,0 +1,63 @@
+# benchmarks/bench_shards.py
+# Loading one parcels file split into N shards: sequential load_parcels per
+# shard vs load_parcel_shards at each worker count. Speedup is bounded by the
+# core count. Run from the project folder:  python -m benchmarks.bench_shards
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from engine import ParcelRepo, load_parcels
+from shards import load_parcel_shards
+from benchmarks.generate import DataSpec, write_csvs
+
+
+def split(path, out_dir, shards):
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = list(reader)
+    paths = []
+    for n in range(shards):
+        shard = os.path.join(out_dir, f"parcels_{n:03d}.csv")
+        with open(shard, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows[n::shards])
+        paths.append(shard)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel loading of sharded parcel files")
+    parser.add_argument("--parcels", type=int, default=500000)
+    parser.add_argument("--shards", type=int, default=50)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, parcels_csv, _ = write_csvs(DataSpec(parcels=args.parcels), tmp)
+        paths = split(parcels_csv, tmp, args.shards)
+
+        start = time.perf_counter()
+        serial = ParcelRepo()
+        for path in paths:
+            serial.parcels.update(load_parcels(path).parcels)
+        t_serial = time.perf_counter() - start
+        print(f"{args.parcels} parcels in {args.shards} shards, {os.cpu_count()} CPU(s)")
+        print(f"  load_parcels x{args.shards:<4}: {t_serial:8.3f} s")
+
+        for workers in range(1, args.max_workers + 1):
+            start = time.perf_counter()
+            repo, stats = load_parcel_shards(paths, workers=workers)
+            elapsed = time.perf_counter() - start
+            same = [p.to_row() for p in repo.all()] == [p.to_row() for p in serial.all()]
+            slowest = max(s.seconds for s in stats)
+            print(f"  workers={workers:<3}       : {elapsed:8.3f} s  ({t_serial / elapsed:.2f}x)  "
+                  f"slowest shard {slowest * 1000:.1f} ms  identical={same}")
+
+
+if __name__ == "__main__":
+    main()
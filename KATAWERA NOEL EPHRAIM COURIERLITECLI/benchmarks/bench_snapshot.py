@@ -0,0 +1,41 @@
+# benchmarks/bench_snapshot.py
+# Cold (CSV parse + snapshot write) vs warm (snapshot) parcel loading.
+# Run from the project folder:  python -m benchmarks.bench_snapshot
+
+import argparse
+import os
+import tempfile
+import time
+
+from engine import load_parcels
+from snapshot import load_parcels_cached
+from benchmarks.generate import DataSpec, write_csvs
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot cache cold vs warm start")
+    parser.add_argument("--parcels", type=int, default=500000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, path, _ = write_csvs(DataSpec(parcels=args.parcels), tmp)
+        cache = os.path.join(tmp, "cache")
+
+        t_csv, _ = timed(load_parcels, path)
+        t_cold, (_, warm_cold) = timed(load_parcels_cached, path, cache)
+        t_warm, (_, warm_warm) = timed(load_parcels_cached, path, cache)
+
+        print(f"{args.parcels} parcels")
+        print(f"  plain CSV load      : {t_csv:8.3f} s")
+        print(f"  cold (CSV + write)  : {t_cold:8.3f} s  snapshot hit={warm_cold}")
+        print(f"  warm (snapshot)     : {t_warm:8.3f} s  snapshot hit={warm_warm}  ({t_csv / t_warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_sqlite.py
+# SQLite repos: bulk import time, indexed by_hub queries vs scanning all(),
+# and hub-at-a-time assignment vs the in-memory path.
+# Run from the project folder:  python -m benchmarks.bench_sqlite
+
+import argparse
+import os
+import tempfile
+import time
+
+from engine import assign_parcels, assign_parcels_by_hub, load_hubs, load_parcels, load_riders
+from sqlite_repo import import_csvs
+from benchmarks.generate import DataSpec, write_csvs
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite-backed repositories")
+    parser.add_argument("--parcels", type=int, default=200000)
+    parser.add_argument("--hubs", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_csvs(DataSpec(hubs=args.hubs, riders=args.hubs * 40, parcels=args.parcels), tmp)
+        t_import, (hubs, parcels, riders) = timed(import_csvs, os.path.join(tmp, "courier.db"), *paths)
+        print(f"{args.parcels} parcels, {args.hubs} hubs")
+        print(f"  import CSVs (executemany)    : {t_import:8.3f} s")
+
+        t_query, rows = timed(parcels.by_hub, "H2", "NORMAL")
+        t_scan, scanned = timed(lambda: [p for p in parcels.all() if p.hub_id == "H2" and p.priority == "NORMAL"])
+        print(f"  by_hub('H2', 'NORMAL') index : {t_query:8.3f} s  ({len(rows)} rows)")
+        print(f"  all() + filter               : {t_scan:8.3f} s  ({len(scanned)} rows)")
+
+        t_db, _ = timed(assign_parcels_by_hub, hubs, riders, parcels)
+        mem = load_hubs(paths[0]), load_riders(paths[2]), load_parcels(paths[1])
+        t_mem, _ = timed(assign_parcels, *mem)
+        print(f"  assign_parcels_by_hub (db)   : {t_db:8.3f} s")
+        print(f"  assign_parcels (in memory)   : {t_mem:8.3f} s")
+        parcels.conn.close()
+
+
+if __name__ == "__main__":
+    main()
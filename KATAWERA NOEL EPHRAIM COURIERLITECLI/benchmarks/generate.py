@@ -0,0 +1,131 @@
+# benchmarks/generate.py
+# Seeded synthetic data for CourierLite: hubs, riders and parcels with
+# configurable size and shape. Same seed + options => same files.
+#
+#   python -m benchmarks.generate --out bench_data --parcels 100000 --hub-skew 1.2 --weights pareto
+
+import argparse
+import csv
+import os
+import random
+from typing import Iterator, List, Tuple
+
+from models import Hub, Parcel, Rider
+from engine import HubRepo, ParcelRepo, RiderRepo
+
+WEIGHT_DISTRIBUTIONS = ("uniform", "lognormal", "pareto")
+
+HOSTELS = ["Kawagai Hostel", "Shiketsu Hostel", "Kagami Block", "Black Gate Hostel",
+           "UA Apartments", "Library Annex", "Science Block", "Sports Complex"]
+
+
+class DataSpec:
+    def __init__(self, hubs=4, riders=100, parcels=10000, hub_skew=0.0, weights="uniform",
+                 express_ratio=0.3, seed=42):
+        if weights not in WEIGHT_DISTRIBUTIONS:
+            raise ValueError(f"weights must be one of {WEIGHT_DISTRIBUTIONS}")
+        self.hubs = hubs
+        self.riders = riders
+        self.parcels = parcels
+        self.hub_skew = hub_skew            # Zipf exponent for parcels per hub, 0 = even
+        self.weights = weights
+        self.express_ratio = express_ratio
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def _hub_weights(spec: DataSpec) -> List[float]:
+    return [1.0 / (rank + 1) ** spec.hub_skew for rank in range(spec.hubs)]
+
+
+def _parcel_weight(rng: random.Random, distribution: str) -> float:
+    if distribution == "lognormal":
+        value = rng.lognormvariate(0.5, 0.8)
+    elif distribution == "pareto":
+        value = 0.5 * rng.paretovariate(1.8)
+    else:
+        value = rng.uniform(0.1, 6.0)
+    return round(min(value, 50.0), 2)
+
+
+def hub_rows(spec: DataSpec) -> Iterator[Tuple]:
+    for h in range(spec.hubs):
+        yield (f"H{h + 1}", f"Hub {h + 1}", f"Campus {h % 3 + 1}")
+
+
+def rider_rows(spec: DataSpec) -> Iterator[Tuple]:
+    rng = random.Random(spec.seed + 1)
+    for r in range(spec.riders):
+        yield (f"R{r + 1:05d}", f"Rider {r + 1}", round(rng.uniform(5.0, 40.0), 1), f"H{r % spec.hubs + 1}")
+
+
+def parcel_rows(spec: DataSpec) -> Iterator[Tuple]:
+    rng = random.Random(spec.seed)
+    hub_ids = [f"H{h + 1}" for h in range(spec.hubs)]
+    hub_weights = _hub_weights(spec)
+    for p in range(spec.parcels):
+        hub_id = rng.choices(hub_ids, hub_weights)[0]
+        priority = "EXPRESS" if rng.random() < spec.express_ratio else "NORMAL"
+        destination = f"{rng.choice(HOSTELS)} Room {rng.randrange(1, 400)}"
+        yield (f"P{p + 1:08d}", f"Student {rng.randrange(100000)}", priority, hub_id, destination,
+               _parcel_weight(rng, spec.weights))
+
+
+def write_csvs(spec: DataSpec, out_dir: str) -> Tuple[str, str, str]:
+    os.makedirs(out_dir, exist_ok=True)
+    files = (
+        ("hubs.csv", ["hub_id", "hub_name", "campus"], hub_rows(spec)),
+        ("parcels.csv", ["parcel_id", "recipient", "priority", "hub_id", "destination", "weight_kg"], parcel_rows(spec)),
+        ("riders.csv", ["rider_id", "name", "max_load_kg", "home_hub_id"], rider_rows(spec)),
+    )
+    paths = []
+    for name, header, rows in files:
+        path = os.path.join(out_dir, name)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        paths.append(path)
+    return tuple(paths)
+
+
+def build_repos(spec: DataSpec) -> Tuple[HubRepo, ParcelRepo, RiderRepo]:
+    # Same data as write_csvs, built in memory for benchmarks that skip loading
+    hubs, parcels, riders = HubRepo(), ParcelRepo(), RiderRepo()
+    for row in hub_rows(spec):
+        hubs.add(Hub(*row))
+    for row in parcel_rows(spec):
+        parcels.add(Parcel(*row))
+    for row in rider_rows(spec):
+        riders.add(Rider(*row))
+    return hubs, parcels, riders
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--hubs", type=int, default=4)
+    parser.add_argument("--riders", type=int, default=100)
+    parser.add_argument("--parcels", type=int, default=10000)
+    parser.add_argument("--hub-skew", type=float, default=0.0, help="Zipf exponent for parcels per hub")
+    parser.add_argument("--weights", choices=WEIGHT_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--express-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def spec_from_args(args) -> DataSpec:
+    return DataSpec(hubs=args.hubs, riders=args.riders, parcels=args.parcels, hub_skew=args.hub_skew,
+                    weights=args.weights, express_ratio=args.express_ratio, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic CourierLite CSVs")
+    parser.add_argument("--out", default="bench_data")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    for path in write_csvs(spec_from_args(args), args.out):
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
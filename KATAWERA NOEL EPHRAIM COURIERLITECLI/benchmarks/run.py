@@ -0,0 +1,103 @@
+# benchmarks/run.py
+# Times loading, assignment and reporting on generated data and writes the
+# results as JSON so two commits can be compared:
+#
+#   python -m benchmarks.run --parcels 200000 --output before.json
+#   ... change code ...
+#   python -m benchmarks.run --parcels 200000 --output after.json --compare before.json
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from engine import assign_parcels_with_loads, load_hubs, load_parcels, load_riders
+from report import write_report
+from benchmarks.generate import add_spec_arguments, spec_from_args, write_csvs
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_once(hubs_csv, parcels_csv, riders_csv):
+    timings = {}
+
+    def phase(name, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings[name] = time.perf_counter() - start
+        return result
+
+    hubs = phase("load_hubs", load_hubs, hubs_csv)
+    parcels = phase("load_parcels", load_parcels, parcels_csv)
+    riders = phase("load_riders", load_riders, riders_csv)
+    assignments, unassigned, rider_load = phase("assign_parcels", assign_parcels_with_loads, hubs, riders, parcels)
+    phase("report", write_report, io.StringIO(), riders, assignments, unassigned, rider_load)
+    counts = {"parcels": len(parcels.all()), "assigned": sum(len(ps) for ps in assignments.values()),
+              "unassigned": len(unassigned)}
+    return timings, counts
+
+
+def summarise(runs):
+    phases = runs[0].keys()
+    return {name: {"min": min(r[name] for r in runs), "median": statistics.median(r[name] for r in runs)}
+            for name in phases}
+
+
+def print_comparison(current, baseline):
+    print(f"\nvs {baseline.get('commit') or 'baseline'} (median, >1.0 is slower):")
+    for name, stats in current["phases"].items():
+        old = baseline["phases"].get(name)
+        if old:
+            ratio = stats["median"] / old["median"] if old["median"] else float("inf")
+            print(f"  {name:15s} {old['median']:9.4f} s -> {stats['median']:9.4f} s  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CourierLite benchmark runner")
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="results JSON from an earlier run")
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_csvs(spec, tmp)
+        runs, counts = [], None
+        for _ in range(args.repeat):
+            timings, counts = run_once(*paths)
+            runs.append(timings)
+
+    result = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "spec": spec.as_dict(),
+        "counts": counts,
+        "phases": summarise(runs),
+    }
+    for name, stats in result["phases"].items():
+        print(f"{name:15s} min {stats['min']:9.4f} s  median {stats['median']:9.4f} s")
+    print(f"counts: {counts}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# bulk.py
+# Fast path for big parcels.csv files. Rows are read with csv.reader in
+# chunks, weights are converted a whole column at a time and priorities are
+# normalised through a small cache. Rejected rows go into a RejectReport
+# instead of one log line each; the report is logged (or raised as a
+# DataFormatError with strict=True) once at the end.
+#
+# Accepts and rejects exactly the rows load_parcels does: a row is rejected
+# when its weight is not a float or its priority is missing.
+
+import csv
+import gc
+import logging
+from itertools import islice
+from typing import Dict, List, Tuple
+
+from models import Parcel
+from engine import ParcelRepo
+from exceptions import DataFormatError
+from instrumentation import metrics
+
+PARCEL_COLUMNS = ("parcel_id", "recipient", "priority", "hub_id", "destination", "weight_kg")
+
+
+class RejectReport:
+    """Rejected rows grouped by reason, keeping the first few as samples."""
+
+    def __init__(self, source: str, max_samples: int = 10):
+        self.source = source
+        self.max_samples = max_samples
+        self.total = 0
+        self.read = 0        # rows read, accepted or not
+        self.reasons: Dict[str, int] = {}
+        self.samples: List[Tuple[int, str, list]] = []   # (record number, reason, raw row)
+
+    def add(self, record: int, reason: str, row: list):
+        self.total += 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((record, reason, row))
+
+    def __bool__(self):
+        return self.total > 0
+
+    def summary(self) -> str:
+        reasons = ", ".join(f"{reason} x{count}" for reason, count in
+                            sorted(self.reasons.items(), key=lambda item: -item[1]))
+        first = "; ".join(f"record {record}: {reason}" for record, reason, _ in self.samples[:3])
+        return f"{self.source}: {self.total} row(s) rejected ({reasons}). First: {first}"
+
+    def raise_if_any(self):
+        if self.total:
+            raise DataFormatError(self.summary())
+
+
+def _weights(column: list, start: int, chunk: list, report: RejectReport) -> list:
+    try:
+        return list(map(float, column))
+    except (TypeError, ValueError):
+        pass
+    # Slow path only for chunks that contain a bad value
+    weights = []
+    for offset, raw in enumerate(column):
+        try:
+            weights.append(float(raw))
+        except (TypeError, ValueError):
+            weights.append(None)
+            report.add(start + offset, "bad weight_kg" if raw is not None else "missing weight_kg", chunk[offset])
+    return weights
+
+
+def load_parcels_bulk(path: str, chunk_size: int = 65536,
+                      strict: bool = False) -> Tuple[ParcelRepo, RejectReport]:
+    repo = ParcelRepo()
+    report = RejectReport(path)
+    read = 0
+    # Millions of small acyclic objects: the cyclic GC would only rescan them
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with metrics.timer("load_parcels.bulk"), open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            missing = [name for name in PARCEL_COLUMNS if name not in header]
+            if missing:
+                raise DataFormatError(f"{path}: missing column(s) {', '.join(missing)}")
+            width = len(header)
+            # Last occurrence wins for duplicate headers, as in csv.DictReader
+            cols = [len(header) - 1 - header[::-1].index(name) for name in PARCEL_COLUMNS]
+            i_id, i_recipient, i_priority, i_hub, i_dest, i_weight = cols
+            upper: Dict[str, str] = {}
+            parcels = repo.parcels
+
+            while True:
+                # csv.DictReader skips blank lines, so do the same
+                chunk = [row for row in islice(reader, chunk_size) if row]
+                if not chunk:
+                    break
+                start = read + 1
+                read += len(chunk)
+                for row in chunk:
+                    if len(row) < width:
+                        row.extend([None] * (width - len(row)))
+
+                weights = _weights([row[i_weight] for row in chunk], start, chunk, report)
+                for offset, row in enumerate(chunk):
+                    weight = weights[offset]
+                    if weight is None:
+                        continue
+                    raw = row[i_priority]
+                    priority = upper.get(raw)
+                    if priority is None:
+                        if raw is None:
+                            report.add(start + offset, "missing priority", row)
+                            continue
+                        priority = upper[raw] = raw.upper()
+                    parcel_id = row[i_id]
+                    # Same key as ParcelRepo.add (get_id() is str(id)) without the method call
+                    parcels[str(parcel_id)] = Parcel(parcel_id, row[i_recipient], priority,
+                                                     row[i_hub], row[i_dest], weight)
+    except DataFormatError as e:
+        if strict:
+            raise
+        logging.error("Failed to load parcels file: %s", e)
+        return repo, report
+    except OSError as e:
+        if strict:
+            raise DataFormatError(f"Failed to open parcels file: {e}") from e
+        logging.error("Failed to open parcels file: %s", e)
+        return repo, report
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        report.read = read
+        metrics.incr("parcels.rows_read", read)
+        metrics.incr("parcels.rows_skipped", report.total)
+
+    if report:
+        if strict:
+            report.raise_if_any()
+        if logging.getLogger().isEnabledFor(logging.WARNING):
+            logging.warning("%s", report.summary())
+    return repo, report
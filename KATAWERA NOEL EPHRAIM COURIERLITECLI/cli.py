@@ -1,43 +1,220 @@
 # cli.py
+import argparse
+import functools
+import json
+import os
+import sys
+import time
 from models import Hub, Parcel, Rider
-from engine import load_hubs, load_parcels, load_riders, assign_parcels, rider_load_iterator
+from engine import load_hubs, load_parcels, load_riders, assign_parcels_by_hub, assign_parcels_with_loads
+from bulk import load_parcels_bulk
+from shards import format_shard_stats, load_parcel_shards
+from instrumentation import metrics, profiling
+from logsetup import CONFIG as LOG_CONFIG, setup_logging
+from report import FORMATS, open_output, write_report
+from strategies import STRATEGIES, format_reports, run_strategy
+from routing import DistanceMatrix, plan_routes
+from feasibility import format_feasibility, prefilter
+from journal import assign_parcels_journaled, compact_journal
+from scenarios import Scenario, format_results, run_scenarios
+from sqlite_repo import import_complete, import_csvs, open_repos
+from snapshot import load_hubs_cached, load_parcels_cached, load_riders_cached
 from typing import Dict, List
 from exceptions import DataFormatError, DomainRuleError
 
 
-def main():
-    hubs_csv = "data/hubs.csv"
-    parcels_csv = "data/parcels.csv"
-    riders_csv = "data/riders.csv"
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CourierLite Campus Delivery CLI")
+    parser.add_argument("--data-dir", default="data", help="folder with hubs.csv, parcels.csv and riders.csv")
+    parser.add_argument("--cache-dir", help="keep binary snapshots of the CSVs here for faster startup")
+    # Each of these picks how parcels are assigned, so only one can be given
+    assigner = parser.add_mutually_exclusive_group()
+    assigner.add_argument("--db", metavar="PATH",
+                        help="use a SQLite database (imported from the CSVs on first use) instead of the CSVs")
+    parser.add_argument("--reimport", action="store_true", help="with --db, rebuild the database from the CSVs")
+    parser.add_argument("--bulk", action="store_true",
+                        help="parse parcels.csv with the chunked bulk loader (one summary for bad rows)")
+    parser.add_argument("--parcel-shards", metavar="GLOB",
+                        help="load parcels from every file matching GLOB (in parallel) instead of parcels.csv")
+    parser.add_argument("--strict", action="store_true",
+                        help="with --bulk or --parcel-shards, stop on any rejected or duplicate parcel row")
+    assigner.add_argument("--strategy", choices=sorted(STRATEGIES),
+                        help="bin-packing policy (default: first-fit) and print its utilisation report")
+    parser.add_argument("--compare-strategies", action="store_true",
+                        help="run every strategy and print runtime, placed parcels and utilisation")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="print per-hub capacity bounds and drop parcels no rider can ever carry before assigning")
+    parser.add_argument("--scenario", action="append", default=[], metavar="NAME=CHANGES",
+                        help="what-if run, e.g. 'two more at H1=add:H1:10:2' or 'R02 at 6 kg=limit:R02:6' "
+                             "(repeatable; prints one comparison table instead of the report)")
+    parser.add_argument("--scenarios", metavar="FILE", help="read what-if scenarios from FILE, one per line")
+    assigner.add_argument("--journal", metavar="PATH",
+                        help="journal assignment decisions to PATH and resume from it after an interrupted run")
+    parser.add_argument("--routes", metavar="DISTANCES_CSV",
+                        help="order each rider's parcels into a route using this campus distance file")
+    parser.add_argument("--format", choices=FORMATS, default="text", help="report format (default: text)")
+    parser.add_argument("--output", metavar="PATH", help="write the report to PATH instead of stdout")
+    parser.add_argument("--summary-only", action="store_true", help="one line per rider, no per-parcel detail")
+    parser.add_argument("--metrics", nargs="?", const="-", metavar="PATH",
+                        help="emit timers/counters as JSON at the end (stdout, or PATH)")
+    parser.add_argument("--profile", metavar="PATH", help="run under cProfile and dump stats to PATH")
+    parser.add_argument("--tracemalloc", action="store_true", help="track peak memory with tracemalloc")
+    parser.add_argument("--log-config", default=LOG_CONFIG, metavar="PATH",
+                        help="logging configuration file (default: logging.conf next to cli.py)")
+    return parser.parse_args(argv)
 
-    print("\n=== ⚜️CourierLite Campus Delivery CLI⚜️ ===\n")
 
-    hubs = load_hubs(hubs_csv)
-    parcels = load_parcels(parcels_csv)
-    riders = load_riders(riders_csv)
+def load_all(data_dir: str, cache_dir=None, parcel_loader=load_parcels):
+    hubs_csv = os.path.join(data_dir, "hubs.csv")
+    parcels_csv = os.path.join(data_dir, "parcels.csv")
+    riders_csv = os.path.join(data_dir, "riders.csv")
 
-    print(f"Hubs loaded: {len(hubs.all())}")
-    print(f"Parcels loaded: {len(parcels.all())}")
-    print(f"Riders loaded: {len(riders.all())}")
+    if cache_dir is None:
+        return load_hubs(hubs_csv), parcel_loader(parcels_csv), load_riders(riders_csv), False
 
-    assignments, unassigned = assign_parcels(hubs, riders, parcels)
-    print("\nParcel assignments per rider:")
+    hubs, warm_hubs = load_hubs_cached(hubs_csv, cache_dir)
+    parcels, warm_parcels = load_parcels_cached(parcels_csv, cache_dir, parcel_loader)
+    riders, warm_riders = load_riders_cached(riders_csv, cache_dir)
+    return hubs, parcels, riders, warm_hubs and warm_parcels and warm_riders
 
-    for rider_id in assignments:
-        rider = riders.get(rider_id)
-        rider_parcels = assignments[rider_id]
-        parcel_ids = [p.get_id() for p in rider_parcels]
-        total_load = sum(p.weight_kg for p in rider_parcels)
-        first_three_dests = [p.destination for p in rider_parcels[:3]]
-        print(f"\nRider {rider_id} ({rider.name})")
-        print(f"  Parcels: {parcel_ids}")
-        print(f"  Total load: {total_load} kg")
-        print(f"  First 3 destinations: {first_three_dests}")
 
-        print("  Step-by-step rider load:")
-        for parcel_info in rider_load_iterator(rider, rider_parcels):
-            print("    Parcel:", parcel_info)
-    print("\nUnassigned parcels (couldn't fit):", sorted(list(unassigned)))
+def load_sharded(data_dir: str, pattern: str, strict: bool = False):
+    """Hubs and riders from data_dir, parcels from every shard matching pattern."""
+    parcels, stats = load_parcel_shards(pattern, strict=strict)
+    hubs = load_hubs(os.path.join(data_dir, "hubs.csv"))
+    riders = load_riders(os.path.join(data_dir, "riders.csv"))
+    return hubs, parcels, riders, stats
+
+
+def open_database(db_path: str, data_dir: str, reimport: bool = False):
+    """SQLite repos at db_path, importing the CSVs first unless a completed import is there (or reimport)."""
+    hubs, parcels, riders = open_repos(db_path)
+    if not reimport and import_complete(hubs.conn):
+        return hubs, parcels, riders, True
+    hubs.conn.close()
+    csvs = [os.path.join(data_dir, name) for name in ("hubs.csv", "parcels.csv", "riders.csv")]
+    return (*import_csvs(db_path, *csvs), False)
+
+
+def parcel_loader(args):
+    if not args.bulk:
+        return load_parcels
+    return lambda path: load_parcels_bulk(path, strict=args.strict)[0]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(args.log_config)
+    metrics.reset()
+    with profiling(args.profile, args.tracemalloc):
+        run(args)
+    if args.metrics or args.profile or args.tracemalloc:
+        emit_metrics(args.metrics or "-", status_stream(args))
+
+
+def status_stream(args):
+    # Machine formats on stdout must stay clean, so status lines go to stderr
+    return sys.stderr if args.format != "text" and not args.output else sys.stdout
+
+
+def emit_metrics(path: str, stream=None):
+    """Write the metrics summary to path, or to stream (default stdout) for "-"."""
+    summary = json.dumps(metrics.summary(), indent=2)
+    if path == "-":
+        stream = stream or sys.stdout
+        print("\nMetrics:", file=stream)
+        print(summary, file=stream)
+    else:
+        with open(path, "w") as f:
+            f.write(summary + "\n")
+
+
+def run(args):
+    status = status_stream(args)
+    say = functools.partial(print, file=status)
+
+    say("\n=== ⚜️CourierLite Campus Delivery CLI⚜️ ===\n")
+
+    start = time.perf_counter()
+    with metrics.timer("load_all"):
+        if args.db:
+            hubs, parcels, riders, warm = open_database(args.db, args.data_dir, args.reimport)
+        elif args.parcel_shards:
+            hubs, parcels, riders, shard_stats = load_sharded(args.data_dir, args.parcel_shards, args.strict)
+        else:
+            hubs, parcels, riders, warm = load_all(args.data_dir, args.cache_dir, parcel_loader(args))
+    load_ms = (time.perf_counter() - start) * 1000
+
+    say(f"Hubs loaded: {len(hubs)}")
+    say(f"Parcels loaded: {len(parcels)}")
+    say(f"Riders loaded: {len(riders)}")
+    if args.parcel_shards:
+        say(f"Parcel shards: {len(shard_stats)} in {load_ms:.1f} ms")
+        say(format_shard_stats(shard_stats))
+    if args.db:
+        say(f"Database: {args.db} ({'existing' if warm else 'imported from CSV'})")
+    elif args.cache_dir is not None:
+        say(f"Startup: {'warm (snapshot)' if warm else 'cold (CSV)'} in {load_ms:.1f} ms")
+
+    feasibility = None
+    if args.prefilter:
+        with metrics.timer("prefilter"):
+            parcels, feasibility = prefilter(riders, parcels)
+        say(f"\nFeasibility ({feasibility.backend}):")
+        say(format_feasibility(feasibility))
+        say(f"  never fit: {len(feasibility.unassignable)} parcel(s) removed before assignment")
+
+    scenarios = [Scenario.parse(text) for text in args.scenario]
+    if args.scenarios:
+        with open(args.scenarios) as f:
+            scenarios += [Scenario.parse(line.strip()) for line in f
+                          if line.strip() and not line.lstrip().startswith("#")]
+    if scenarios:
+        with metrics.timer("scenarios"):
+            results = run_scenarios(riders, parcels, scenarios)
+        sys.stdout.write(f"\nScenarios:\n{format_results(results)}\n")
+        return
+
+    if args.compare_strategies:
+        reports = [run_strategy(cls(), hubs, riders, parcels)[3] for cls in STRATEGIES.values()]
+        say("\nStrategy comparison:")
+        say(format_reports(reports))
+
+    if args.strategy:
+        assignments, unassigned, rider_load, report = run_strategy(STRATEGIES[args.strategy](), hubs, riders, parcels)
+        say(f"\nStrategy:\n{format_reports([report])}")
+    elif args.journal:
+        assignments, unassigned, rider_load, resumed = assign_parcels_journaled(hubs, riders, parcels, args.journal)
+        _, size = compact_journal(args.journal)
+        say(f"Journal: {resumed} decision(s) replayed from {args.journal}, compacted to {size} bytes")
+    elif args.db and feasibility is None:
+        # Pull one hub's parcels at a time through the indexed queries
+        assignments, unassigned = assign_parcels_by_hub(hubs, riders, parcels)
+        rider_load = None
+    else:
+        assignments, unassigned, rider_load = assign_parcels_with_loads(hubs, riders, parcels)
+    if feasibility is not None:
+        unassigned = set(unassigned) | set(feasibility.unassignable)
+
+    if args.routes:
+        with metrics.timer("routing"):
+            matrix = DistanceMatrix.from_csv(args.routes)
+            plans = plan_routes(riders, assignments, matrix)
+        assignments = {rider_id: plan.parcels for rider_id, plan in plans.items()}
+        say("\nRoutes:")
+        for plan in plans.values():
+            say(f"  {plan.rider_id}: {' -> '.join(plan.stops)}  {plan.length_m:.0f} m  ({plan.seconds * 1000:.2f} ms)")
+        info = matrix.cache_info()
+        say(f"  distance cache: {info.hits} hits, {info.misses} misses")
+
+    with metrics.timer("report"):
+        if args.output:
+            with open_output(args.output) as out:
+                write_report(out, riders, assignments, unassigned, rider_load, args.format, args.summary_only)
+        else:
+            status.flush()
+            write_report(sys.stdout, riders, assignments, unassigned, rider_load, args.format, args.summary_only)
+
 
 if __name__ == "__main__":
     main()
@@ -2,13 +2,17 @@
 
 
 
+import bisect
 import csv
 import logging
-from typing import List, Dict, Set
-from models import Hub, Parcel, Rider
+import math
+import tempfile
+from typing import Dict, Iterable, Iterator, KeysView, List, Optional, Sequence, Set, Tuple, ValuesView
+from models import Hub, Parcel, ParcelTable, Rider
+from dispatch import DispatchQueue
 from exceptions import DataFormatError, DomainRuleError
-
-logging.basicConfig(level=logging.INFO)
+from instrumentation import metrics
+from logsetup import RowWarnings
 
 # --- Repositories (using dict for fast lookup) ---
 
@@ -31,12 +35,68 @@ class HubRepo:
     def ids(self) -> Set[str]:
         return set(self.hubs.keys())
 
+    def __len__(self):
+        return len(self.hubs)
+
 class ParcelRepo:
+    """Parcels by id, plus secondary indexes per priority and per (hub, priority).
+
+    Each index is a list per partition in insertion order. It is built in
+    one pass the first time it is queried and then kept up to date by add();
+    re-adding an existing id drops the indexes until the next query, since
+    its old position is not tracked. Code that writes ``self.parcels``
+    directly (the bulk loaders fill a fresh repo this way) must call
+    invalidate() if the indexes may already exist.
+
+    values(), keys() and the by_* results are live and uncopied; callers
+    must not modify the lists. An empty partition is an empty tuple.
+    """
+
     def __init__(self):
         self.parcels: Dict[str, Parcel] = {}
+        self._by_priority: Optional[Dict[str, List[Parcel]]] = None
+        self._by_hub: Optional[Dict[Tuple[str, str], List[Parcel]]] = None
 
     def add(self, parcel: Parcel):
-        self.parcels[parcel.get_id()] = parcel
+        pid = parcel.get_id()
+        if self._by_priority is None and self._by_hub is None:
+            self.parcels[pid] = parcel
+            return
+        if pid in self.parcels:
+            self.invalidate()
+            self.parcels[pid] = parcel
+            return
+        self.parcels[pid] = parcel
+        if self._by_priority is not None:
+            self._by_priority.setdefault(parcel.priority, []).append(parcel)
+        if self._by_hub is not None:
+            self._by_hub.setdefault((parcel.hub_id, parcel.priority), []).append(parcel)
+
+    def invalidate(self):
+        self._by_priority = self._by_hub = None
+
+    def _priority_index(self) -> Dict[str, List[Parcel]]:
+        if self._by_priority is None:
+            index: Dict[str, List[Parcel]] = {}
+            for parcel in self.parcels.values():
+                group = index.get(parcel.priority)
+                if group is None:
+                    group = index[parcel.priority] = []
+                group.append(parcel)
+            self._by_priority = index
+        return self._by_priority
+
+    def _hub_index(self) -> Dict[Tuple[str, str], List[Parcel]]:
+        if self._by_hub is None:
+            index: Dict[Tuple[str, str], List[Parcel]] = {}
+            for parcel in self.parcels.values():
+                key = (parcel.hub_id, parcel.priority)
+                group = index.get(key)
+                if group is None:
+                    group = index[key] = []
+                group.append(parcel)
+            self._by_hub = index
+        return self._by_hub
 
     def get(self, parcel_id: str):
         return self.parcels.get(parcel_id)
@@ -44,18 +104,67 @@ class ParcelRepo:
     def all(self) -> List[Parcel]:
         return list(self.parcels.values())
 
+    def values(self) -> ValuesView[Parcel]:
+        return self.parcels.values()
+
+    def keys(self) -> KeysView[str]:
+        return self.parcels.keys()
+
+    def by_priority(self, priority: str) -> Sequence[Parcel]:
+        return self._priority_index().get(priority, ())
+
+    def by_hub(self, hub_id: str, priority: str) -> Sequence[Parcel]:
+        return self._hub_index().get((hub_id, priority), ())
+
+    def hub_ids(self) -> List[str]:
+        """Hubs with parcels, in order of first appearance."""
+        return list(dict.fromkeys(hub for hub, _ in self._hub_index()))
+
     def exists(self, parcel_id: str) -> bool:
         return parcel_id in self.parcels
 
     def ids(self) -> Set[str]:
         return set(self.parcels.keys())
 
+    def __len__(self):
+        return len(self.parcels)
+
 class RiderRepo:
+    """Riders by id, plus a per-hub index with each hub's riders in id order.
+
+    Like ParcelRepo, the index is built on first use and then kept up to
+    date by add(); by_hub() returns the indexed list itself, so callers
+    must not modify it.
+    """
+
     def __init__(self):
         self.riders: Dict[str, Rider] = {}
+        self._by_hub: Optional[Dict[str, List[Rider]]] = None
 
     def add(self, rider: Rider):
-        self.riders[rider.get_id()] = rider
+        rid = rider.get_id()
+        if self._by_hub is None:
+            self.riders[rid] = rider
+            return
+        old = self.riders.get(rid)
+        self.riders[rid] = rider
+        if old is not None:
+            self.invalidate()
+            return
+        bisect.insort(self._by_hub.setdefault(rider.home_hub_id, []), rider, key=Rider.get_id)
+
+    def invalidate(self):
+        self._by_hub = None
+
+    def _index(self) -> Dict[str, List[Rider]]:
+        if self._by_hub is None:
+            by_hub: Dict[str, List[Rider]] = {}
+            for rider in self.riders.values():
+                by_hub.setdefault(rider.home_hub_id, []).append(rider)
+            for group in by_hub.values():
+                group.sort(key=lambda r: r.get_id())
+            self._by_hub = by_hub
+        return self._by_hub
 
     def get(self, rider_id: str):
         return self.riders.get(rider_id)
@@ -63,39 +172,67 @@ class RiderRepo:
     def all(self) -> List[Rider]:
         return list(self.riders.values())
 
+    def values(self) -> ValuesView[Rider]:
+        return self.riders.values()
+
+    def keys(self) -> KeysView[str]:
+        return self.riders.keys()
+
+    def by_hub(self, hub_id: str) -> Sequence[Rider]:
+        return self._index().get(hub_id, ())
+
+    def hub_ids(self) -> List[str]:
+        """Home hubs, in order of first appearance."""
+        return list(self._index())
+
     def exists(self, rider_id: str) -> bool:
         return rider_id in self.riders
 
     def ids(self) -> Set[str]:
         return set(self.riders.keys())
 
+    def __len__(self):
+        return len(self.riders)
+
 # --- CSV Loader Functions ---
+# The iter_* generators parse one row at a time; the load_* functions collect
+# them into a repo. Bad rows are skipped either way; the first few per file
+# are logged and the rest summarised in one line (logsetup.RowWarnings).
 
-def load_hubs(path: str) -> HubRepo:
-    repo = HubRepo()
+def iter_hubs(path: str) -> Iterator[Hub]:
+    read = skipped = 0
+    warnings = RowWarnings(path, "hub")
     try:
         with open(path, newline='') as f:
             reader = csv.DictReader(f)
             for row in reader:
+                read += 1
                 try:
                     hub = Hub(
                         hub_id=row['hub_id'],
                         hub_name=row['hub_name'],
                         campus=row['campus']
                     )
-                    repo.add(hub)
                 except Exception as e:
-                    logging.warning(f"Skipping hub row: {row}. Reason: {e}")
+                    skipped += 1
+                    warnings.warn(row, e)
+                    continue
+                yield hub
     except Exception as e:
-        logging.error(f"Failed to open hubs file: {e}")
-    return repo
-
-def load_parcels(path: str) -> ParcelRepo:
-    repo = ParcelRepo()
+        logging.error("Failed to open hubs file: %s", e)
+    finally:
+        warnings.flush()
+        metrics.incr("hubs.rows_read", read)
+        metrics.incr("hubs.rows_skipped", skipped)
+
+def iter_parcels(path: str) -> Iterator[Parcel]:
+    read = skipped = 0
+    warnings = RowWarnings(path, "parcel")
     try:
         with open(path, newline='') as f:
             reader = csv.DictReader(f)
             for row in reader:
+                read += 1
                 try:
                     parcel = Parcel(
                         parcel_id=row['parcel_id'],
@@ -105,19 +242,26 @@ def load_parcels(path: str) -> ParcelRepo:
                         destination=row['destination'],
                         weight_kg=float(row['weight_kg'])
                     )
-                    repo.add(parcel)
                 except Exception as e:
-                    logging.warning(f"Skipping parcel row: {row}. Reason: {e}")
+                    skipped += 1
+                    warnings.warn(row, e)
+                    continue
+                yield parcel
     except Exception as e:
-        logging.error(f"Failed to open parcels file: {e}")
-    return repo
-
-def load_riders(path: str) -> RiderRepo:
-    repo = RiderRepo()
+        logging.error("Failed to open parcels file: %s", e)
+    finally:
+        warnings.flush()
+        metrics.incr("parcels.rows_read", read)
+        metrics.incr("parcels.rows_skipped", skipped)
+
+def iter_riders(path: str) -> Iterator[Rider]:
+    read = skipped = 0
+    warnings = RowWarnings(path, "rider")
     try:
         with open(path, newline='') as f:
             reader = csv.DictReader(f)
             for row in reader:
+                read += 1
                 try:
                     rider = Rider(
                         rider_id=row['rider_id'],
@@ -125,15 +269,264 @@ def load_riders(path: str) -> RiderRepo:
                         max_load_kg=float(row['max_load_kg']),
                         home_hub_id=row['home_hub_id']
                     )
-                    repo.add(rider)
                 except Exception as e:
-                    logging.warning(f"Skipping rider row: {row}. Reason: {e}")
+                    skipped += 1
+                    warnings.warn(row, e)
+                    continue
+                yield rider
     except Exception as e:
-        logging.error(f"Failed to open riders file: {e}")
+        logging.error("Failed to open riders file: %s", e)
+    finally:
+        warnings.flush()
+        metrics.incr("riders.rows_read", read)
+        metrics.incr("riders.rows_skipped", skipped)
+
+def _load(kind: str, rows: Iterator, repo):
+    # Parse and repo construction are timed separately
+    with metrics.timer(f"load_{kind}.parse"):
+        items = list(rows)
+    with metrics.timer(f"load_{kind}.build_repo"):
+        for item in items:
+            repo.add(item)
     return repo
 
+def load_hubs(path: str) -> HubRepo:
+    return _load("hubs", iter_hubs(path), HubRepo())
+
+def load_parcels(path: str) -> ParcelRepo:
+    return _load("parcels", iter_parcels(path), ParcelRepo())
+
+def load_parcel_table(path: str) -> ParcelTable:
+    return _load("parcels", iter_parcels(path), ParcelTable())
+
+def load_riders(path: str) -> RiderRepo:
+    return _load("riders", iter_riders(path), RiderRepo())
+
+# --- Capacity index (segment tree over riders in id order) ---
+class CapacityIndex:
+    """Answers "first rider in id order with room for this weight" in O(log n).
+
+    Leaves hold each rider's remaining capacity and every inner node holds the
+    max of its children, so whole ranges of full riders are skipped at once.
+    The tree is only used to prune; the final check is the same
+    ``load + weight <= max_load_kg`` test the linear loop uses, so results
+    match it exactly even with float rounding.
+    """
+
+    def __init__(self, riders: List[Rider]):
+        self.riders: List[Rider] = sorted(riders, key=lambda r: r.get_id())
+        self.loads: List[float] = [0] * len(self.riders)
+        self.checks = 0   # riders whose load was actually tested (for metrics)
+        self._build()
+
+    def _build(self):
+        n = len(self.riders)
+        self._pos: Dict[str, int] = {r.get_id(): pos for pos, r in enumerate(self.riders)}
+        size = 1
+        while size < n:
+            size *= 2
+        self._size = size
+        self._tree: List[float] = [-math.inf] * (2 * size)
+        for pos in range(n):
+            self._tree[size + pos] = self._leaf_value(pos)
+        for i in range(size - 1, 0, -1):
+            left, right = self._tree[2 * i], self._tree[2 * i + 1]
+            self._tree[i] = left if left >= right else right
+        # Absolute slack for pruning so rounding in max - load never hides a rider
+        limits = [abs(r.max_load_kg) for r in self.riders if math.isfinite(r.max_load_kg)]
+        self._slack = 1e-9 * (1.0 + max(limits, default=0.0))
+
+    def _leaf_value(self, pos: int) -> float:
+        limit = self.riders[pos].max_load_kg
+        remaining = limit - self.loads[pos]
+        if remaining != remaining:  # NaN from inf - inf or a NaN limit
+            remaining = math.inf if limit == math.inf else -math.inf
+        return remaining
+
+    def _update(self, pos: int):
+        tree = self._tree
+        i = self._size + pos
+        tree[i] = self._leaf_value(pos)
+        i //= 2
+        while i:
+            left, right = tree[2 * i], tree[2 * i + 1]
+            tree[i] = left if left >= right else right
+            i //= 2
+
+    def _first_at_least(self, threshold: float, start: int) -> int:
+        """Position of the first rider at or after ``start`` whose remaining
+        capacity is >= threshold, or -1."""
+        if start >= len(self.riders):
+            return -1
+        tree, size = self._tree, self._size
+        i = start + size
+        while True:
+            if tree[i] >= threshold:
+                while i < size:
+                    i = 2 * i if tree[2 * i] >= threshold else 2 * i + 1
+                return i - size
+            # Step to the next subtree on the right
+            while i & 1:
+                i //= 2
+            if i == 0:
+                return -1
+            i += 1
+
+    def place(self, weight: float) -> Optional[Rider]:
+        """Load ``weight`` onto the first rider (by id) it fits, or return None."""
+        threshold = weight - self._slack
+        pos = self._first_at_least(threshold, 0)
+        while pos != -1:
+            self.checks += 1
+            rider = self.riders[pos]
+            if self.loads[pos] + weight <= rider.max_load_kg:
+                self.loads[pos] += weight
+                self._update(pos)
+                return rider
+            pos = self._first_at_least(threshold, pos + 1)
+        return None
+
+    def release(self, rider_id: str, weight: float):
+        pos = self._pos[rider_id]
+        self.loads[pos] -= weight
+        self._update(pos)
+
+    def add_rider(self, rider: Rider):
+        # Keeps id order; O(riders) rebuild, which is fine for fleet changes
+        ids = [r.get_id() for r in self.riders]
+        pos = bisect.bisect_left(ids, rider.get_id())
+        self.riders.insert(pos, rider)
+        self.loads.insert(pos, 0)
+        self._build()
+
+    def load_of(self, rider_id: str) -> float:
+        return self.loads[self._pos[rider_id]]
+
+    def restore(self, loads: Dict[str, float]):
+        # Start from saved loads (journal replay) with one O(riders) rebuild
+        self.loads = [loads.get(r.get_id(), 0) for r in self.riders]
+        self._build()
+
+    def loads_by_rider(self) -> Dict[str, float]:
+        return {r.get_id(): load for r, load in zip(self.riders, self.loads)}
+
+
+def build_hub_indexes(riders: RiderRepo) -> Dict[str, CapacityIndex]:
+    # The repo's per-hub lists are already in id order, so sorting them is linear
+    return {hub_id: CapacityIndex(riders.by_hub(hub_id)) for hub_id in riders.hub_ids()}
+
 # --- Assign parcels to riders ---
-def assign_parcels(hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo):
+def dispatch_order(parcels: ParcelRepo) -> List[Parcel]:
+    # EXPRESS first, then NORMAL; any other priority is ignored
+    if isinstance(parcels, ParcelRepo):
+        return [*parcels.by_priority('EXPRESS'), *parcels.by_priority('NORMAL')]
+    all_parcels = parcels.all()
+    ordered = [p for p in all_parcels if p.priority == 'EXPRESS']
+    ordered += [p for p in all_parcels if p.priority == 'NORMAL']
+    return ordered
+
+def assign_parcels(hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo,
+                   queue: Optional[DispatchQueue] = None):
+    assignments, unassigned, _ = assign_parcels_with_loads(hubs, riders, parcels, queue)
+    return assignments, unassigned
+
+def assign_parcels_with_loads(hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo,
+                              queue: Optional[DispatchQueue] = None):
+    """assign_parcels plus the rider_id => load map it tracked along the way.
+
+    With a DispatchQueue, parcels are placed in its score order (pickup-point
+    bias, age) instead of plain EXPRESS-then-NORMAL.
+    """
+    if isinstance(parcels, ParcelTable) and queue is None:
+        return _assign_table(riders, parcels)
+
+    assignments: Dict[str, List[Parcel]] = {}      # rider_id => list of parcels
+    unassigned: Set[str] = set()                   # unassigned parcel_ids
+
+    with metrics.timer("assign.build_indexes"):
+        indexes = build_hub_indexes(riders)
+    with metrics.timer("assign.order"):
+        if queue is None:
+            ordered = dispatch_order(parcels)
+        else:
+            queue.extend(parcels.values() if isinstance(parcels, ParcelRepo) else parcels.all())
+            ordered = list(queue.drain())
+
+    with metrics.timer("assign.place"):
+        for parcel in ordered:
+            index = indexes.get(parcel.hub_id)
+            rider = index.place(parcel.weight_kg) if index else None
+            if rider is None:
+                unassigned.add(parcel.get_id())
+            else:
+                assignments.setdefault(rider.get_id(), []).append(parcel)
+    _record_assignment(indexes, assignments, unassigned)
+    return assignments, unassigned, _loads(indexes)
+
+def _loads(indexes: Dict[str, CapacityIndex]) -> Dict[str, float]:
+    loads: Dict[str, float] = {}
+    for index in indexes.values():
+        loads.update(index.loads_by_rider())
+    return loads
+
+def _record_assignment(indexes: Dict[str, CapacityIndex], assignments, unassigned):
+    metrics.incr("assign.parcels_placed", sum(len(ps) for ps in assignments.values()))
+    metrics.incr("assign.parcels_unassigned", len(unassigned))
+    metrics.incr("assign.rider_scans", sum(index.checks for index in indexes.values()))
+
+def _assign_table(riders: RiderRepo, table: ParcelTable):
+    # Columnar variant: walks the arrays and only builds Parcel objects for
+    # parcels that end up assigned.
+    assignments: Dict[str, List[Parcel]] = {}
+    unassigned: Set[str] = set()
+
+    indexes = build_hub_indexes(riders)
+    hub_index = [indexes.get(hub_id) for hub_id in table.hub_ids]
+    weights, hub_codes, priority_codes = table.weights, table.hub_codes, table.priority_codes
+
+    for priority in ('EXPRESS', 'NORMAL'):
+        code = table.priority_code(priority)
+        if code is None:
+            continue
+        for row, row_code in enumerate(priority_codes):
+            if row_code != code:
+                continue
+            index = hub_index[hub_codes[row]]
+            rider = index.place(weights[row]) if index else None
+            if rider is None:
+                unassigned.add(table.parcel_ids[row])
+            else:
+                assignments.setdefault(rider.get_id(), []).append(table.parcel(row))
+    _record_assignment(indexes, assignments, unassigned)
+    return assignments, unassigned, _loads(indexes)
+
+def assign_parcels_by_hub(hubs: HubRepo, riders, parcels):
+    """Same policy as assign_parcels, one hub at a time.
+
+    ``riders`` and ``parcels`` must offer hub-partitioned queries
+    (``hub_ids()`` and ``by_hub(...)``): the in-memory repos answer them from
+    their indexes, and with the SQLite repos only one hub's parcels are in
+    memory at once. Each rider's parcel list and the
+    unassigned set match assign_parcels; riders appear hub by hub in the
+    assignments dict.
+    """
+    assignments: Dict[str, List[Parcel]] = {}
+    unassigned: Set[str] = set()
+    for hub_id in parcels.hub_ids():
+        hub_riders = riders.by_hub(hub_id)
+        index = CapacityIndex(hub_riders) if hub_riders else None
+        for priority in ('EXPRESS', 'NORMAL'):
+            for parcel in parcels.by_hub(hub_id, priority):
+                rider = index.place(parcel.weight_kg) if index else None
+                if rider is None:
+                    unassigned.add(parcel.get_id())
+                else:
+                    assignments.setdefault(rider.get_id(), []).append(parcel)
+    return assignments, unassigned
+
+# Reference implementation: linear scan over the hub's riders for every parcel.
+# Kept for tests and benchmarks against the indexed version above.
+def assign_parcels_linear(hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo):
     assignments: Dict[str, List[Parcel]] = {}      # rider_id => list of parcels
     unassigned: Set[str] = set()                   # unassigned parcel_ids
 
@@ -165,6 +558,151 @@ def assign_parcels(hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo):
             unassigned.add(parcel.get_id())
     return assignments, unassigned
 
+# --- Incremental assignment ---
+class AssignmentEngine:
+    """Keeps rider loads and hub indexes alive between batches of parcels.
+
+    A batch is placed EXPRESS-first, exactly like assign_parcels, so one
+    add_parcels call on a fresh engine gives the same result. Parcels that
+    don't fit wait per hub and are retried only when that hub gains capacity
+    (a new rider, or an assigned parcel being removed).
+    """
+
+    def __init__(self, riders: Iterable[Rider] = (), queue: Optional[DispatchQueue] = None):
+        self.queue = queue       # optional score order for new batches
+        self.assignments: Dict[str, List[Parcel]] = {}   # rider_id => list of parcels
+        self.unassigned: Set[str] = set()                # unassigned parcel_ids
+        self._indexes: Dict[str, CapacityIndex] = {}
+        self._parcels: Dict[str, Parcel] = {}
+        self._placed: Dict[str, str] = {}                # parcel_id => rider_id
+        # hub_id => {'EXPRESS': {...}, 'NORMAL': {...}}, dicts keep arrival order
+        self._waiting: Dict[str, Dict[str, Dict[str, Parcel]]] = {}
+        hub_riders: Dict[str, List[Rider]] = {}
+        for rider in riders:
+            hub_riders.setdefault(rider.home_hub_id, []).append(rider)
+        for hub_id, group in hub_riders.items():
+            self._indexes[hub_id] = CapacityIndex(group)
+        self._rider_hub: Dict[str, str] = {r.get_id(): h for h, g in hub_riders.items() for r in g}
+
+    @property
+    def rider_load(self) -> Dict[str, float]:
+        return _loads(self._indexes)
+
+    def has_parcel(self, parcel_id: str) -> bool:
+        return parcel_id in self._parcels
+
+    def _place(self, parcel: Parcel) -> Optional[str]:
+        pid = parcel.get_id()
+        index = self._indexes.get(parcel.hub_id)
+        rider = index.place(parcel.weight_kg) if index else None
+        if rider is None:
+            self.unassigned.add(pid)
+            self._waiting.setdefault(parcel.hub_id, {'EXPRESS': {}, 'NORMAL': {}})[parcel.priority][pid] = parcel
+            return None
+        rid = rider.get_id()
+        self.unassigned.discard(pid)
+        self._placed[pid] = rid
+        self.assignments.setdefault(rid, []).append(parcel)
+        return rid
+
+    def _retry(self, hub_id: str):
+        waiting = self._waiting.get(hub_id)
+        if not waiting:
+            return
+        for priority in ('EXPRESS', 'NORMAL'):
+            queue = waiting[priority]
+            for pid, parcel in list(queue.items()):
+                del queue[pid]
+                self._place(parcel)
+
+    def add_parcels(self, batch: Iterable[Parcel]) -> List[Tuple[Parcel, Optional[str]]]:
+        """Place a batch; returns ``(parcel, rider_id or None)`` per parcel."""
+        batch = list(batch)
+        seen: Set[str] = set()
+        for parcel in batch:
+            pid = parcel.get_id()
+            if pid in self._parcels or pid in seen:
+                raise DomainRuleError(f"Parcel {pid} was already added")
+            seen.add(pid)
+        if self.queue is None:
+            ordered = [p for priority in ('EXPRESS', 'NORMAL') for p in batch if p.priority == priority]
+        else:
+            self.queue.extend(batch)
+            ordered = list(self.queue.drain())
+        decisions = []
+        for parcel in ordered:
+            self._parcels[parcel.get_id()] = parcel
+            decisions.append((parcel, self._place(parcel)))
+        return decisions
+
+    def add_rider(self, rider: Rider):
+        rid = rider.get_id()
+        if rid in self._rider_hub:
+            raise DomainRuleError(f"Rider {rid} is already on the roster")
+        self._rider_hub[rid] = rider.home_hub_id
+        index = self._indexes.get(rider.home_hub_id)
+        if index is None:
+            self._indexes[rider.home_hub_id] = CapacityIndex([rider])
+        else:
+            index.add_rider(rider)
+        self._retry(rider.home_hub_id)
+
+    def remove_parcel(self, parcel_id: str):
+        parcel = self._parcels.pop(parcel_id, None)
+        if parcel is None:
+            raise DomainRuleError(f"Unknown parcel {parcel_id}")
+        rid = self._placed.pop(parcel_id, None)
+        if rid is None:
+            self.unassigned.discard(parcel_id)
+            del self._waiting[parcel.hub_id][parcel.priority][parcel_id]
+            return
+        carried = self.assignments[rid]
+        carried.remove(parcel)
+        if not carried:
+            del self.assignments[rid]
+        self._indexes[parcel.hub_id].release(rid, parcel.weight_kg)
+        self._retry(parcel.hub_id)
+
+# --- Streaming assignment (bounded memory) ---
+def stream_assignments(riders: RiderRepo, parcels_path: str) -> Iterator[Tuple[Parcel, Optional[str]]]:
+    """Assign parcels straight from the CSV without building a ParcelRepo.
+
+    Yields ``(parcel, rider_id)`` as each decision is made, with ``rider_id``
+    None for unassigned parcels. EXPRESS parcels are placed during the first
+    read; NORMAL rows are spilled to a temporary file and placed afterwards,
+    so only the riders and one parcel are held in memory at a time.
+    Parcel ids are assumed unique (ParcelRepo would keep the last duplicate).
+    """
+    indexes = build_hub_indexes(riders)
+
+    def place(parcel: Parcel) -> Optional[str]:
+        index = indexes.get(parcel.hub_id)
+        rider = index.place(parcel.weight_kg) if index else None
+        return rider.get_id() if rider else None
+
+    with tempfile.TemporaryFile('w+', newline='') as spill:
+        writer = csv.writer(spill)
+        for parcel in iter_parcels(parcels_path):
+            if parcel.priority == 'EXPRESS':
+                yield parcel, place(parcel)
+            elif parcel.priority == 'NORMAL':
+                writer.writerow(parcel.to_row())
+        spill.seek(0)
+        for pid, recipient, priority, hub_id, destination, weight in csv.reader(spill):
+            parcel = Parcel(pid, recipient, priority, hub_id, destination, float(weight))
+            yield parcel, place(parcel)
+
+def collect_assignments(decisions: Iterator[Tuple[Parcel, Optional[str]]]):
+    """Fold a stream of decisions into the (assignments, unassigned) pair."""
+    assignments: Dict[str, List[Parcel]] = {}
+    unassigned: Set[str] = set()
+    for parcel, rider_id in decisions:
+        if rider_id is None:
+            unassigned.add(parcel.get_id())
+        else:
+            assignments.setdefault(rider_id, []).append(parcel)
+    return assignments, unassigned
+
 # --- Example iterator for a rider's load ---
 def rider_load_iterator(rider: Rider, parcels: List[Parcel]):
     total = 0
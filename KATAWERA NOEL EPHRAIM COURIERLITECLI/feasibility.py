@@ -0,0 +1,222 @@
+# feasibility.py
+# Capacity checks that need no assignment run. For every hub this gives the
+# total dispatchable weight against the total rider capacity, the largest
+# single rider, and the parcels that can never be placed: those heavier than
+# the hub's largest max_load_kg, and every parcel at a hub with no riders.
+# Removing those parcels before assign_parcels cannot change where any other
+# parcel goes, because a parcel that never fits never changes a rider's load.
+# That only holds for non-negative weights (a negative parcel could make room
+# for a heavier one), so a dispatchable parcel with a negative weight raises
+# DomainRuleError instead of being silently misjudged.
+#
+# With NumPy installed, the work is a few bincount/maximum.at passes over
+# weight and hub-code arrays; a ParcelTable's weight column is used without
+# copying. Without it, a plain loop computes the same numbers.
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from models import ParcelTable
+from engine import ParcelRepo, RiderRepo
+from exceptions import DomainRuleError
+
+try:
+    import numpy as np
+except ImportError:   # optional dependency
+    np = None
+
+DISPATCHED = ('EXPRESS', 'NORMAL')   # other priorities are never dispatched
+_NEGATIVE = "Feasibility checks need non-negative parcel weights"
+
+
+class HubFeasibility:
+    def __init__(self, hub_id: str, riders: int, capacity_kg: float, largest_kg: float,
+                 parcels: int, demand_kg: float, unassignable: int, unassignable_kg: float):
+        self.hub_id = hub_id
+        self.riders = riders
+        self.capacity_kg = capacity_kg          # sum of max_load_kg
+        self.largest_kg = largest_kg            # biggest single max_load_kg (0 with no riders)
+        self.parcels = parcels                  # dispatchable parcels
+        self.demand_kg = demand_kg
+        self.unassignable = unassignable        # parcels no rider here can ever carry
+        self.unassignable_kg = unassignable_kg
+
+    def utilisation(self) -> float:
+        """Demand over capacity; above 1.0 means some parcels must stay unassigned."""
+        if self.capacity_kg:
+            return self.demand_kg / self.capacity_kg
+        return math.inf if self.demand_kg else 0.0
+
+    def overloaded(self) -> bool:
+        return self.demand_kg - self.unassignable_kg > self.capacity_kg
+
+    def as_dict(self) -> dict:
+        return dict(vars(self), utilisation=self.utilisation(), overloaded=self.overloaded())
+
+
+class FeasibilityReport:
+    def __init__(self, hubs: Dict[str, HubFeasibility], unassignable: List[str], backend: str):
+        self.hubs = hubs
+        self.unassignable = unassignable        # parcel ids, in repo order
+        self.backend = backend                  # "numpy" or "python"
+
+    def overloaded(self) -> List[str]:
+        return [hub_id for hub_id, hub in self.hubs.items() if hub.overloaded()]
+
+
+def _columns(parcels):
+    """(hub_ids, hub code per parcel, weight per parcel, dispatchable flag per parcel)."""
+    if isinstance(parcels, ParcelTable):
+        dispatched = {parcels.priority_code(p) for p in DISPATCHED}
+        return (list(parcels.hub_ids), parcels.hub_codes, parcels.weights,
+                [code in dispatched for code in parcels.priority_codes])
+    hub_ids: List[str] = []
+    hub_code: Dict[str, int] = {}
+    codes, weights, valid = [], [], []
+    for parcel in parcels.all():
+        code = hub_code.get(parcel.hub_id)
+        if code is None:
+            code = hub_code[parcel.hub_id] = len(hub_ids)
+            hub_ids.append(parcel.hub_id)
+        codes.append(code)
+        weights.append(parcel.weight_kg)
+        valid.append(parcel.priority in DISPATCHED)
+    return hub_ids, codes, weights, valid
+
+
+def _rider_columns(riders: RiderRepo, hub_ids: List[str]):
+    # Riders go into the parcels' hub-code space; hubs with riders but no parcels are appended
+    hub_code = {hub_id: code for code, hub_id in enumerate(hub_ids)}
+    codes, limits = [], []
+    for rider in riders.all():
+        code = hub_code.get(rider.home_hub_id)
+        if code is None:
+            code = hub_code[rider.home_hub_id] = len(hub_ids)
+            hub_ids.append(rider.home_hub_id)
+        codes.append(code)
+        limits.append(rider.max_load_kg)
+    return codes, limits
+
+
+def _analyse_numpy(hub_ids, p_codes, weights, valid, r_codes, limits):
+    n_hubs = len(hub_ids)
+    if isinstance(weights, (list, tuple)):
+        weights = np.asarray(weights, dtype=np.float64)
+        p_codes = np.asarray(p_codes, dtype=np.intp)
+    else:
+        # array.array columns of a ParcelTable: the weights are viewed in place;
+        # the uint32 hub codes are widened to intp for indexing, which copies them
+        weights = np.asarray(memoryview(weights))
+        p_codes = np.asarray(memoryview(p_codes)).astype(np.intp)
+    valid = np.asarray(valid, dtype=bool)
+    r_codes = np.asarray(r_codes, dtype=np.intp)
+    limits = np.asarray(limits, dtype=np.float64)
+
+    riders = np.bincount(r_codes, minlength=n_hubs)
+    capacity = np.bincount(r_codes, weights=limits, minlength=n_hubs)
+    largest = np.full(n_hubs, -np.inf)
+    np.maximum.at(largest, r_codes, limits)
+
+    codes = p_codes[valid]
+    demand_weights = weights[valid]
+    if demand_weights.size and demand_weights.min() < 0:
+        raise DomainRuleError(_NEGATIVE)
+    never = demand_weights > largest[codes]          # -inf at hubs without riders, so always true
+    counts = np.bincount(codes, minlength=n_hubs)
+    demand = np.bincount(codes, weights=demand_weights, minlength=n_hubs)
+    never_counts = np.bincount(codes[never], minlength=n_hubs)
+    never_kg = np.bincount(codes[never], weights=demand_weights[never], minlength=n_hubs)
+    rows = np.flatnonzero(valid)[never]
+    hubs = zip(riders.tolist(), capacity.tolist(), largest.tolist(), counts.tolist(),
+               demand.tolist(), never_counts.tolist(), never_kg.tolist())
+    return hubs, rows.tolist()
+
+
+def _analyse_python(hub_ids, p_codes, weights, valid, r_codes, limits):
+    n_hubs = len(hub_ids)
+    riders, capacity, largest = [0] * n_hubs, [0.0] * n_hubs, [-math.inf] * n_hubs
+    for code, limit in zip(r_codes, limits):
+        riders[code] += 1
+        capacity[code] += limit
+        if limit > largest[code]:
+            largest[code] = limit
+    counts, demand = [0] * n_hubs, [0.0] * n_hubs
+    never_counts, never_kg = [0] * n_hubs, [0.0] * n_hubs
+    rows = []
+    for row, (code, weight, ok) in enumerate(zip(p_codes, weights, valid)):
+        if not ok:
+            continue
+        if weight < 0:
+            raise DomainRuleError(_NEGATIVE)
+        counts[code] += 1
+        demand[code] += weight
+        if weight > largest[code]:
+            never_counts[code] += 1
+            never_kg[code] += weight
+            rows.append(row)
+    return zip(riders, capacity, largest, counts, demand, never_counts, never_kg), rows
+
+
+def analyse(riders: RiderRepo, parcels, use_numpy: Optional[bool] = None) -> Tuple[FeasibilityReport, List[int]]:
+    """FeasibilityReport plus the row numbers (in parcels.all() order) of the unassignable parcels.
+
+    ``use_numpy`` defaults to whether NumPy is installed; both backends give
+    the same answers.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is None:
+        raise ImportError("use_numpy=True needs NumPy installed")
+    hub_ids, p_codes, weights, valid = _columns(parcels)
+    r_codes, limits = _rider_columns(riders, hub_ids)
+    backend = _analyse_numpy if use_numpy else _analyse_python
+    per_hub, rows = backend(hub_ids, p_codes, weights, valid, r_codes, limits)
+
+    hubs: Dict[str, HubFeasibility] = {}
+    for hub_id, (n_riders, capacity, largest, count, demand, never, never_kg) in zip(hub_ids, per_hub):
+        if n_riders or count:
+            hubs[hub_id] = HubFeasibility(hub_id, int(n_riders), capacity, max(largest, 0.0),
+                                          int(count), demand, int(never), never_kg)
+    if isinstance(parcels, ParcelTable):
+        ids = [parcels.parcel_ids[row] for row in rows]
+    else:
+        all_ids = [p.get_id() for p in parcels.all()]
+        ids = [all_ids[row] for row in rows]
+    return FeasibilityReport(hubs, ids, "numpy" if use_numpy else "python"), rows
+
+
+def prefilter(riders: RiderRepo, parcels, use_numpy: Optional[bool] = None):
+    """(parcels without the unassignable ones, FeasibilityReport).
+
+    ``assign_parcels(hubs, riders, kept)`` then gives the same assignments as
+    the full input, and its unassigned set plus ``report.unassignable`` is
+    the full unassigned set. A ParcelTable stays a ParcelTable; anything else
+    becomes a ParcelRepo in the same order. When nothing is dropped, the input
+    is returned as is.
+    """
+    report, rows = analyse(riders, parcels, use_numpy)
+    if not rows and isinstance(parcels, (ParcelRepo, ParcelTable)):
+        return parcels, report
+    drop = set(rows)
+    if isinstance(parcels, ParcelTable):
+        return parcels.take(row for row in range(len(parcels)) if row not in drop), report
+    kept = ParcelRepo()
+    if isinstance(parcels, ParcelRepo):
+        dropped = set(report.unassignable)
+        kept.parcels = {key: parcel for key, parcel in parcels.parcels.items() if key not in dropped}
+        return kept, report
+    for row, parcel in enumerate(parcels.all()):
+        if row not in drop:
+            kept.add(parcel)
+    return kept, report
+
+
+def format_feasibility(report: FeasibilityReport) -> str:
+    lines = [f"  {'hub':12s} {'riders':>6s} {'capacity':>10s} {'largest':>8s} {'parcels':>8s} "
+             f"{'demand':>10s} {'util':>7s} {'never fit':>9s}"]
+    for hub_id, hub in sorted(report.hubs.items()):
+        util = hub.utilisation()
+        flag = "  overloaded" if hub.overloaded() else ""
+        lines.append(f"  {hub_id:12s} {hub.riders:6d} {hub.capacity_kg:10.1f} {hub.largest_kg:8.1f} {hub.parcels:8d} "
+                     f"{hub.demand_kg:10.1f} {util:7.1%} {hub.unassignable:9d}{flag}")
+    return "\n".join(lines)
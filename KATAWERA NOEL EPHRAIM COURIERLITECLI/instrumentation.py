@@ -0,0 +1,89 @@
+# instrumentation.py
+# Lightweight timers and counters for the hot paths, plus optional cProfile /
+# tracemalloc hooks. engine.py records into the shared `metrics` object and
+# the CLI prints metrics.summary() as JSON at the end of a run.
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class Metrics:
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.extra: Dict[str, object] = {}
+
+    def incr(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name: str, seconds: float):
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+        self.calls.clear()
+        self.extra.clear()
+
+    def summary(self) -> dict:
+        counters = dict(self.counters)
+        decided = counters.get("assign.parcels_placed", 0) + counters.get("assign.parcels_unassigned", 0)
+        if decided:
+            counters["assign.rider_scans_per_parcel"] = round(counters.get("assign.rider_scans", 0) / decided, 3)
+        return {
+            "timers": {name: {"seconds": round(seconds, 6), "calls": self.calls[name]}
+                       for name, seconds in self.timers.items()},
+            "counters": counters,
+            **self.extra,
+        }
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def profiling(profile_path: Optional[str] = None, trace_memory: bool = False, top: int = 15):
+    """Run the block under cProfile and/or tracemalloc; results go to metrics.extra.
+
+    With ``profile_path`` the raw stats are dumped there (open with pstats or
+    snakeviz) and the top functions by cumulative time are kept as text.
+    """
+    profiler = cProfile.Profile() if profile_path else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            metrics.extra["memory"] = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": [str(stat) for stat in snapshot.statistics("lineno")[:top]],
+            }
+        if profiler:
+            profiler.dump_stats(profile_path)
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            metrics.extra["profile"] = {"path": profile_path, "top": out.getvalue().strip().splitlines()}
@@ -0,0 +1,252 @@
+# journal.py
+# Write-ahead journal for resumable assignment runs. Every placement decision
+# (parcel_id, rider_id or None, the rider's load after it) is appended to the
+# journal in batches; each batch is one framed, checksummed record followed
+# by a single fsync, so a crash loses at most the batch in flight.
+#
+# Assignment is deterministic for a given input, so a restarted run only has
+# to check that the journal belongs to the same input (a key over riders and
+# the dispatch order), restore rider loads and the first k decisions, and
+# place the rest. A torn record at the end (crash mid-write) is dropped; a
+# file cut off inside its header holds no decisions and counts as no journal.
+#
+# compact_journal() rewrites a journal as one checkpoint record: the number
+# of decisions, each one's rider as a code into a rider list, and the final
+# loads. Parcel ids are left out since the key already pins the dispatch
+# order, so the checkpoint is small and replays in a single read.
+#
+# Layout: MAGIC, <I> key length, pickled key, then records of
+# <II> (payload length, crc32) + pickled ("batch", [...]) or ("checkpoint", {...}).
+
+import hashlib
+import os
+from array import array
+from operator import attrgetter
+import pickle
+import struct
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from engine import HubRepo, ParcelRepo, RiderRepo, build_hub_indexes, dispatch_order
+from exceptions import DataFormatError, DomainRuleError
+from instrumentation import metrics
+from models import Parcel
+
+MAGIC = b"CLJRNL1\n"
+_HEADER = struct.Struct("<I")    # length of the pickled key that follows MAGIC
+_RECORD = struct.Struct("<II")   # payload length, crc32 of the payload
+
+Decision = Tuple[str, Optional[str], Optional[float]]   # parcel_id, rider_id, load after
+
+
+def run_key(riders: RiderRepo, ordered: List[Parcel]) -> str:
+    """Digest of everything placement depends on: the riders and the parcels in dispatch order."""
+    digest = hashlib.sha1()
+    for rider in sorted(riders.all(), key=lambda r: r.get_id()):
+        digest.update(f"{rider.get_id()}\0{rider.max_load_kg!r}\0{rider.home_hub_id}\n".encode())
+    # Column at a time: one join per field instead of a formatted line per parcel
+    digest.update(b"--\n")
+    digest.update("\0".join(map(str, map(attrgetter("id"), ordered))).encode())
+    digest.update(b"--\n")
+    digest.update("\0".join(map(attrgetter("hub_id"), ordered)).encode())
+    digest.update(array("d", map(attrgetter("weight_kg"), ordered)).tobytes())
+    return digest.hexdigest()
+
+
+class JournalState:
+    """What a journal file holds: its key, the decisions so far and the latest load per rider."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.checkpointed = 0     # leading decisions covered by a checkpoint
+        self.parcel_ids: List[str] = []              # ids of the decisions after those
+        self.rider_ids: List[Optional[str]] = []     # one per decision
+        self.loads: Dict[str, float] = {}
+        self.records = 0
+        self.valid_bytes = 0      # end of the last complete record
+        self.torn_bytes = 0       # trailing bytes of an incomplete record
+
+    def __len__(self):
+        return len(self.rider_ids)
+
+
+def _frame(record) -> bytes:
+    payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+    return _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_journal(path: str) -> Optional[JournalState]:
+    """Replay a journal file; None if it does not exist or was cut off inside its header."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    head = len(MAGIC) + _HEADER.size
+    if data[:len(MAGIC)] != MAGIC[:len(data)]:
+        raise DataFormatError(f"{path} is not an assignment journal")
+    if len(data) < head:
+        return None
+    (key_len,) = _HEADER.unpack_from(data, len(MAGIC))
+    pos = head
+    if len(data) < pos + key_len:
+        return None
+    try:
+        key = pickle.loads(data[pos:pos + key_len])
+    except (pickle.UnpicklingError, EOFError, ValueError) as e:
+        raise DataFormatError(f"{path}: unreadable journal key ({e})") from e
+    state = JournalState(key)
+    pos += key_len
+    state.valid_bytes = pos
+
+    view = memoryview(data)
+    try:
+        while pos + _RECORD.size <= len(data):
+            length, crc = _RECORD.unpack_from(data, pos)
+            payload = view[pos + _RECORD.size:pos + _RECORD.size + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            kind, body = pickle.loads(payload)
+            if kind == "batch":
+                for parcel_id, rider_id, load in body:
+                    state.parcel_ids.append(parcel_id)
+                    state.rider_ids.append(rider_id)
+                    if rider_id is not None:
+                        state.loads[rider_id] = load
+            elif kind == "checkpoint":
+                riders = body["riders"]
+                state.checkpointed = len(body["codes"])
+                state.parcel_ids = []
+                state.rider_ids = [riders[code] if code >= 0 else None for code in body["codes"]]
+                state.loads = dict(body["loads"])
+            else:
+                raise DataFormatError(f"{path}: unknown journal record {kind!r}")
+            pos += _RECORD.size + length
+            state.records += 1
+            state.valid_bytes = pos
+    finally:
+        view.release()
+    state.torn_bytes = len(data) - state.valid_bytes
+    return state
+
+
+class JournalWriter:
+    """Appends batches of decisions, one record and one fsync per batch."""
+
+    def __init__(self, path: str, key: str, state: Optional[JournalState] = None, fsync: bool = True):
+        self.fsync = fsync
+        self.commits = 0
+        if state is None:
+            key_bytes = pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+            self._file = open(path, "wb")
+            self._file.write(MAGIC + _HEADER.pack(len(key_bytes)) + key_bytes)
+            self._sync()
+        else:
+            self._file = open(path, "r+b")
+            self._file.truncate(state.valid_bytes)   # drop a torn record
+            self._file.seek(state.valid_bytes)
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def commit(self, decisions: List[Decision]):
+        if not decisions:
+            return
+        self._file.write(_frame(("batch", decisions)))
+        self._sync()
+        self.commits += 1
+
+    def close(self):
+        self._file.close()
+
+
+def compact_journal(path: str) -> Tuple[int, int]:
+    """Rewrite path as a single checkpoint record. Returns (bytes before, bytes after)."""
+    state = read_journal(path)
+    if state is None:
+        raise DataFormatError(f"No journal at {path}")
+    before = os.path.getsize(path)
+    key_bytes = pickle.dumps(state.key, protocol=pickle.HIGHEST_PROTOCOL)
+    riders = sorted({rid for rid in state.rider_ids if rid is not None})
+    code_of = {rid: code for code, rid in enumerate(riders)}
+    codes = array("i", [code_of[rid] if rid is not None else -1 for rid in state.rider_ids])
+    checkpoint = {"riders": riders, "codes": codes, "loads": state.loads}
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + _HEADER.pack(len(key_bytes)) + key_bytes)
+        f.write(_frame(("checkpoint", checkpoint)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)   # a crash leaves either the old or the new journal
+    return before, os.path.getsize(path)
+
+
+def assign_parcels_journaled(hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo, journal_path: str,
+                             batch_size: int = 4096, fsync: bool = True):
+    """assign_parcels_with_loads that journals every decision and resumes from journal_path.
+
+    Returns (assignments, unassigned, rider_load, resumed) where resumed is the
+    number of decisions replayed instead of recomputed. Raises DomainRuleError
+    if the journal was written for different riders or parcels.
+    """
+    with metrics.timer("assign.build_indexes"):
+        indexes = build_hub_indexes(riders)
+    with metrics.timer("assign.order"):
+        ordered = dispatch_order(parcels)
+        key = run_key(riders, ordered)
+
+    assignments: Dict[str, List[Parcel]] = {}
+    unassigned = set()
+    with metrics.timer("journal.replay"):
+        state = read_journal(journal_path)
+        resumed = 0
+        if state is not None:
+            if state.key != key:
+                raise DomainRuleError(f"Journal {journal_path} was written for different riders or parcels; "
+                                      f"remove it to start over")
+            resumed = len(state)
+            if resumed > len(ordered) or any(parcel.get_id() != pid for parcel, pid
+                                             in zip(ordered[state.checkpointed:], state.parcel_ids)):
+                raise DataFormatError(f"Journal {journal_path} does not follow the dispatch order")
+            for index in indexes.values():
+                index.restore(state.loads)
+            for parcel, rider_id in zip(ordered, state.rider_ids):
+                if rider_id is None:
+                    unassigned.add(parcel.get_id())
+                else:
+                    assignments.setdefault(rider_id, []).append(parcel)
+    metrics.incr("journal.replayed", resumed)
+
+    writer = JournalWriter(journal_path, key, state, fsync)
+    batch: List[Decision] = []
+    try:
+        with metrics.timer("assign.place"):
+            for parcel in ordered[resumed:]:
+                index = indexes.get(parcel.hub_id)
+                rider = index.place(parcel.weight_kg) if index else None
+                pid = parcel.get_id()
+                if rider is None:
+                    unassigned.add(pid)
+                    batch.append((pid, None, None))
+                else:
+                    rid = rider.get_id()
+                    assignments.setdefault(rid, []).append(parcel)
+                    batch.append((pid, rid, index.load_of(rid)))
+                if len(batch) >= batch_size:
+                    writer.commit(batch)
+                    batch = []
+    finally:
+        # Also on KeyboardInterrupt: whatever was placed is committed
+        try:
+            writer.commit(batch)
+        finally:
+            writer.close()
+        metrics.incr("journal.commits", writer.commits)
+    metrics.incr("assign.parcels_placed", sum(len(ps) for ps in assignments.values()))
+    metrics.incr("assign.parcels_unassigned", len(unassigned))
+    loads: Dict[str, float] = {}
+    for index in indexes.values():
+        loads.update(index.loads_by_rider())
+    return assignments, unassigned, loads, resumed
@@ -0,0 +1,126 @@
+# logsetup.py
+# Logging for the CLI and the ingestion service. The handlers from
+# logging.conf (console + courierlite.log) run on a QueueListener thread;
+# loaders only put records on a queue, so a slow disk or terminal never sits
+# on the parsing hot path. Library modules never configure logging.
+#
+# Per-row problems (a bad CSV row) go through RowWarnings: the first few are
+# logged as they happen, the rest are counted by reason and reported in one
+# summary line when the file is done.
+#
+# Code that forks worker processes wraps the pool in listener_paused(): a
+# child must not inherit the writer thread mid-write (its locks would stay
+# held forever), and records a child puts on the parent's queue are never
+# written. While paused, the handlers sit on root again and every process
+# writes to them directly.
+
+import atexit
+import contextlib
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+from typing import Dict, List, Optional
+
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logging.conf")
+
+# Bad rows logged one by one per file before RowWarnings only counts them
+ROW_WARNING_LIMIT = 5
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handlers: List[logging.Handler] = []
+
+
+def setup_logging(config_path: Optional[str] = CONFIG, level: Optional[int] = None) -> logging.handlers.QueueListener:
+    """Configure the root logger from config_path and move its handlers behind a queue.
+
+    Falls back to INFO on stderr when the file is missing. Calling it again is
+    a no-op until stop_logging().
+    """
+    if _listener is not None:
+        return _listener
+    if config_path and os.path.exists(config_path):
+        logging.config.fileConfig(config_path, disable_existing_loggers=False)
+    else:
+        logging.basicConfig(level=logging.INFO)
+    root = logging.getLogger()
+    if level is not None:
+        root.setLevel(level)
+    atexit.register(stop_logging)
+    return _start_listener()
+
+
+def _start_listener() -> logging.handlers.QueueListener:
+    global _listener, _handlers
+    root = logging.getLogger()
+    _handlers = list(root.handlers)
+    for handler in _handlers:
+        root.removeHandler(handler)
+    records = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    _listener = logging.handlers.QueueListener(records, *_handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Write out everything still queued, stop the writer thread and put the handlers back on root."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    for handler in _handlers:
+        handler.flush()
+        root.addHandler(handler)
+
+
+@contextlib.contextmanager
+def listener_paused():
+    """Stop the QueueListener for the duration of the block (e.g. while forking), then restart it."""
+    if _listener is None:
+        yield
+        return
+    stop_logging()
+    try:
+        yield
+    finally:
+        _start_listener()
+
+
+class RowWarnings:
+    """Rate-limited 'Skipping <what> row' warnings for one source file."""
+
+    def __init__(self, source: str, what: str, limit: Optional[int] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.source = source
+        self.what = what
+        self.limit = ROW_WARNING_LIMIT if limit is None else limit
+        self.logger = logger or logging.getLogger()
+        self.total = 0
+        self.reasons: Dict[str, int] = {}
+
+    def warn(self, row, error: Exception):
+        self.total += 1
+        reason = type(error).__name__
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        if self.total <= self.limit:
+            self.logger.warning("Skipping %s row: %s. Reason: %s", self.what, row, error)
+
+    @property
+    def suppressed(self) -> int:
+        return max(self.total - self.limit, 0)
+
+    def flush(self):
+        """One summary line for the rows that were counted but not logged."""
+        if not self.suppressed:
+            return
+        reasons = ", ".join(f"{reason} x{count}" for reason, count
+                            in sorted(self.reasons.items(), key=lambda item: -item[1]))
+        self.logger.warning("%s: %d %s row(s) skipped, %d not shown individually (%s)",
+                            self.source, self.total, self.what, self.suppressed, reasons)
@@ -1,20 +1,33 @@
 # models.py
 
 
-from typing import Tuple
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
 
 # A mixin for anything that has an ID
 class HasID:
+    __slots__ = ()
+
     def get_id(self):
         return str(self.id)
 
 # A mixin to print objects as a row/tuple
 class RowPrintable:
+    __slots__ = ()
+
     def to_row(self) :
-        return tuple(vars(self).values())
+        if hasattr(self, '__dict__'):
+            return tuple(vars(self).values())
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+# Hub, Parcel and Rider use __slots__ (no per-object __dict__) because there
+# can be millions of them; slot order matches __init__ so to_row is unchanged.
 
 # The hub class
 class Hub(HasID, RowPrintable):
+    __slots__ = ('id', 'hub_name', 'campus')
+
     def __init__(self, hub_id, hub_name, campus):
         self.id = hub_id  # Unique hub ID
         self.hub_name = hub_name
@@ -25,6 +38,8 @@ class Hub(HasID, RowPrintable):
 
 # The parcel class
 class Parcel(HasID, RowPrintable):
+    __slots__ = ('id', 'recipient', 'priority', 'hub_id', 'destination', 'weight_kg')
+
     def __init__(self, parcel_id, recipient, priority, hub_id, destination, weight_kg):
         self.id = parcel_id  # Unique parcel ID
         self.recipient = recipient
@@ -37,6 +52,8 @@ class Parcel(HasID, RowPrintable):
 
 # The rider class
 class Rider(HasID, RowPrintable):
+    __slots__ = ('id', 'name', 'max_load_kg', 'home_hub_id')
+
     def __init__(self, rider_id, name, max_load_kg, home_hub_id):
         self.id = rider_id
         self.name = name
@@ -45,6 +62,108 @@ class Rider(HasID, RowPrintable):
     def __repr__(self):
         return f"Rider({self.id}, {self.name}, {self.max_load_kg}, {self.home_hub_id})"
 
+# --- Columnar parcel storage ---
+class ParcelTable:
+    """Parcels stored as parallel columns instead of one object per parcel.
+
+    Weights live in a float array, hub ids and priorities are interned to
+    small integer codes, and repeated destinations share one string.
+    Supports the same get/all/exists/ids interface as ParcelRepo, and
+    assign_parcels reads the columns directly.
+    """
+
+    def __init__(self):
+        self.parcel_ids: List[str] = []
+        self.recipients: List[str] = []
+        self.destinations: List[str] = []
+        self.weights = array('d')
+        self.hub_codes = array('I')
+        self.priority_codes = array('B')
+        self.hub_ids: List[str] = []        # code -> hub_id
+        self.priorities: List[str] = []     # code -> priority
+        self._hub_code: Dict[str, int] = {}
+        self._priority_code: Dict[str, int] = {}
+        self._row: Dict[str, int] = {}
+
+    def _intern(self, value: str, codes: Dict[str, int], names: List[str]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def append(self, parcel_id, recipient, priority, hub_id, destination, weight_kg):
+        hub = self._intern(hub_id, self._hub_code, self.hub_ids)
+        prio = self._intern(priority.upper(), self._priority_code, self.priorities)
+        destination = sys.intern(destination)
+        row = self._row.get(parcel_id)
+        if row is not None:
+            # Same as ParcelRepo: a duplicate id replaces the earlier parcel in place
+            self.recipients[row] = recipient
+            self.destinations[row] = destination
+            self.weights[row] = weight_kg
+            self.hub_codes[row] = hub
+            self.priority_codes[row] = prio
+            return
+        self._row[parcel_id] = len(self.parcel_ids)
+        self.parcel_ids.append(parcel_id)
+        self.recipients.append(recipient)
+        self.destinations.append(destination)
+        self.weights.append(weight_kg)
+        self.hub_codes.append(hub)
+        self.priority_codes.append(prio)
+
+    def add(self, parcel: Parcel):
+        self.append(parcel.get_id(), parcel.recipient, parcel.priority, parcel.hub_id,
+                    parcel.destination, parcel.weight_kg)
+
+    def parcel(self, row: int) -> Parcel:
+        return Parcel(self.parcel_ids[row], self.recipients[row],
+                      self.priorities[self.priority_codes[row]],
+                      self.hub_ids[self.hub_codes[row]], self.destinations[row],
+                      self.weights[row])
+
+    def priority_code(self, priority: str) -> Optional[int]:
+        return self._priority_code.get(priority)
+
+    def get(self, parcel_id: str) -> Optional[Parcel]:
+        row = self._row.get(parcel_id)
+        return None if row is None else self.parcel(row)
+
+    def all(self) -> List[Parcel]:
+        return [self.parcel(row) for row in range(len(self.parcel_ids))]
+
+    def exists(self, parcel_id: str) -> bool:
+        return parcel_id in self._row
+
+    def ids(self):
+        return set(self.parcel_ids)
+
+    def __len__(self):
+        return len(self.parcel_ids)
+
+    def take(self, rows) -> "ParcelTable":
+        """A new table with only these rows, in this order. Hub and priority codes are unchanged."""
+        table = ParcelTable()
+        table.hub_ids, table._hub_code = list(self.hub_ids), dict(self._hub_code)
+        table.priorities, table._priority_code = list(self.priorities), dict(self._priority_code)
+        for row in rows:
+            table._row[self.parcel_ids[row]] = len(table.parcel_ids)
+            table.parcel_ids.append(self.parcel_ids[row])
+            table.recipients.append(self.recipients[row])
+            table.destinations.append(self.destinations[row])
+            table.weights.append(self.weights[row])
+            table.hub_codes.append(self.hub_codes[row])
+            table.priority_codes.append(self.priority_codes[row])
+        return table
+
+    @classmethod
+    def from_parcels(cls, parcels) -> "ParcelTable":
+        table = cls()
+        for parcel in parcels:
+            table.add(parcel)
+        return table
+
 # --- Bonus: Pickup points, personalizable! ---
 class PickupPoint(HasID, RowPrintable):
     def __init__(self, pickup_id, label, hub_id, base_priority_bias):
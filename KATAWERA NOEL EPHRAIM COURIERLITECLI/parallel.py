@@ -0,0 +1,73 @@
+# parallel.py
+# Per-hub assignment in a process pool. Riders only serve their home hub, so
+# each hub's first-fit run is independent and can go to its own worker.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from models import Parcel, Rider
+from engine import CapacityIndex, HubRepo, ParcelRepo, RiderRepo, dispatch_order
+from logsetup import listener_paused
+
+# A hub job is the hub's riders as (rider_id, max_load_kg) and its parcels as
+# (position in dispatch order, weight_kg). Plain tuples keep pickling cheap.
+HubJob = Tuple[List[Tuple[str, float]], List[Tuple[int, float]]]
+
+
+def _assign_hub(job: HubJob) -> List[Tuple[int, Optional[str]]]:
+    rider_rows, work = job
+    index = CapacityIndex([Rider(rid, '', limit, '') for rid, limit in rider_rows])
+    decisions = []
+    for seq, weight in work:
+        rider = index.place(weight)
+        decisions.append((seq, rider.get_id() if rider else None))
+    return decisions
+
+
+def _merge(decided: List[Optional[str]], results):
+    for decisions in results:
+        for seq, rider_id in decisions:
+            decided[seq] = rider_id
+
+
+def assign_parcels_parallel(hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo,
+                            workers: Optional[int] = None):
+    """Same result as assign_parcels, with hubs spread over ``workers`` processes.
+
+    Each hub sees its parcels in the global EXPRESS-then-NORMAL order, and the
+    merge walks that order again, so assignments (including dict and list
+    order) and unassigned are identical to the serial path for any worker
+    count. ``workers=1`` runs in-process without a pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    ordered = dispatch_order(parcels)
+
+    hub_riders: Dict[str, List[Tuple[str, float]]] = {
+        hub_id: [(rider.get_id(), rider.max_load_kg) for rider in riders.by_hub(hub_id)]
+        for hub_id in riders.hub_ids()}
+
+    work: Dict[str, List[Tuple[int, float]]] = {}
+    for seq, parcel in enumerate(ordered):
+        if parcel.hub_id in hub_riders:
+            work.setdefault(parcel.hub_id, []).append((seq, parcel.weight_kg))
+
+    # Largest hubs first so one big hub doesn't start last
+    jobs = [(hub_riders[hub_id], items) for hub_id, items in
+            sorted(work.items(), key=lambda item: len(item[1]), reverse=True)]
+
+    decided: List[Optional[str]] = [None] * len(ordered)
+    if workers == 1 or len(jobs) <= 1:
+        _merge(decided, map(_assign_hub, jobs))
+    else:
+        with listener_paused(), ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            _merge(decided, pool.map(_assign_hub, jobs))
+
+    assignments: Dict[str, List[Parcel]] = {}
+    unassigned: Set[str] = set()
+    for parcel, rider_id in zip(ordered, decided):
+        if rider_id is None:
+            unassigned.add(parcel.get_id())
+        else:
+            assignments.setdefault(rider_id, []).append(parcel)
+    return assignments, unassigned
@@ -0,0 +1,97 @@
+# report.py
+# Assignment report writers. Each rider's block is rendered into one string
+# and written in a single call to a buffered stream, and rider totals come
+# from the loads the engine already tracked instead of being re-summed.
+#
+# Formats:
+#   text   the classic CLI report (summary_only drops the per-parcel lines)
+#   jsonl  one JSON object per rider, then one for the unassigned parcels
+#   csv    one row per parcel (or per rider with summary_only)
+
+import csv
+import json
+from typing import Dict, List, Optional, Set, TextIO
+
+from models import Parcel
+from engine import RiderRepo, rider_load_iterator
+
+FORMATS = ("text", "jsonl", "csv")
+
+
+def _load(rider_id: str, carried: List[Parcel], rider_load: Optional[Dict[str, float]]) -> float:
+    if rider_load is not None and rider_id in rider_load:
+        return rider_load[rider_id]
+    return sum(p.weight_kg for p in carried)
+
+
+def write_text(out: TextIO, riders: RiderRepo, assignments, unassigned, rider_load=None, summary_only=False):
+    out.write("\nParcel assignments per rider:\n")
+    for rider_id, carried in assignments.items():
+        rider = riders.get(rider_id)
+        total_load = _load(rider_id, carried, rider_load)
+        if summary_only:
+            out.write(f"Rider {rider_id} ({rider.name}): {len(carried)} parcels, {total_load} kg\n")
+            continue
+        lines = [
+            f"\nRider {rider_id} ({rider.name})\n",
+            f"  Parcels: {[p.get_id() for p in carried]}\n",
+            f"  Total load: {total_load} kg\n",
+            f"  First 3 destinations: {[p.destination for p in carried[:3]]}\n",
+            "  Step-by-step rider load:\n",
+        ]
+        lines.extend(f"    Parcel: {info}\n" for info in rider_load_iterator(rider, carried))
+        out.write("".join(lines))
+    if summary_only:
+        placed = sum(len(ps) for ps in assignments.values())
+        out.write(f"\nRiders used: {len(assignments)}  Parcels assigned: {placed}  Unassigned: {len(unassigned)}\n")
+    else:
+        out.write(f"\nUnassigned parcels (couldn't fit): {sorted(unassigned)}\n")
+
+
+def write_jsonl(out: TextIO, riders: RiderRepo, assignments, unassigned, rider_load=None, summary_only=False):
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    lines = []
+    for rider_id, carried in assignments.items():
+        record = {
+            "rider_id": rider_id,
+            "name": riders.get(rider_id).name,
+            "parcel_count": len(carried),
+            "load_kg": _load(rider_id, carried, rider_load),
+        }
+        if not summary_only:
+            record["parcels"] = [{"parcel_id": p.get_id(), "weight_kg": p.weight_kg,
+                                  "destination": p.destination} for p in carried]
+        lines.append(dumps(record))
+        if len(lines) >= 1000:
+            out.write("\n".join(lines) + "\n")
+            lines.clear()
+    lines.append(dumps({"unassigned": sorted(unassigned)} if not summary_only
+                       else {"unassigned_count": len(unassigned)}))
+    out.write("\n".join(lines) + "\n")
+
+
+def write_csv(out: TextIO, riders: RiderRepo, assignments, unassigned, rider_load=None, summary_only=False):
+    writer = csv.writer(out)
+    if summary_only:
+        writer.writerow(["rider_id", "name", "parcel_count", "load_kg"])
+        writer.writerows((rider_id, riders.get(rider_id).name, len(carried), _load(rider_id, carried, rider_load))
+                         for rider_id, carried in assignments.items())
+        return
+    writer.writerow(["rider_id", "name", "parcel_id", "weight_kg", "cumulative_kg", "destination"])
+    for rider_id, carried in assignments.items():
+        rider = riders.get(rider_id)
+        writer.writerows((rider_id, rider.name, parcel_id, weight, total, parcel.destination)
+                         for (parcel_id, weight, total), parcel in zip(rider_load_iterator(rider, carried), carried))
+    writer.writerows(("", "", parcel_id, "", "", "") for parcel_id in sorted(unassigned))
+
+
+WRITERS = {"text": write_text, "jsonl": write_jsonl, "csv": write_csv}
+
+
+def write_report(out: TextIO, riders: RiderRepo, assignments: Dict[str, List[Parcel]], unassigned: Set[str],
+                 rider_load: Optional[Dict[str, float]] = None, fmt: str = "text", summary_only: bool = False):
+    WRITERS[fmt](out, riders, assignments, unassigned, rider_load, summary_only)
+
+
+def open_output(path: str, buffer_size: int = 1 << 20) -> TextIO:
+    return open(path, "w", buffering=buffer_size, newline="")
@@ -0,0 +1,140 @@
+# routing.py
+# Orders each rider's parcels into a short delivery route.
+#
+# The campus map is a CSV of walkable legs (from,to,distance_m), treated as
+# undirected. A parcel's stop is the longest map location its destination
+# starts with as whole words ("Kagami Block Room 110" -> "Kagami Block"),
+# and every rider starts at their hub. Distances between stops are shortest
+# paths over the map, cached in an LRU because the same hostel blocks come
+# up again and again. Routes are built nearest-neighbour first and then improved with
+# 2-opt.
+
+import csv
+import heapq
+import time
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from models import Parcel, Rider
+
+
+class DistanceMatrix:
+    def __init__(self, legs: Dict[Tuple[str, str], float], unknown_distance: float = 10000.0,
+                 cache_size: int = 65536):
+        self.graph: Dict[str, Dict[str, float]] = {}
+        for (a, b), meters in legs.items():
+            for x, y in ((a, b), (b, a)):
+                current = self.graph.setdefault(x, {}).get(y)
+                if current is None or meters < current:
+                    self.graph[x][y] = meters
+        self.unknown_distance = unknown_distance
+        # Longest names first so "Kagami Block Annex" wins over "Kagami Block"
+        self._names = sorted(self.graph, key=len, reverse=True)
+        self.distance = lru_cache(maxsize=cache_size)(self._distance)
+        self.locate = lru_cache(maxsize=cache_size)(self._locate)
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> "DistanceMatrix":
+        legs: Dict[Tuple[str, str], float] = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                legs[(row['from'].strip(), row['to'].strip())] = float(row['distance_m'])
+        return cls(legs, **kwargs)
+
+    def _locate(self, destination: str) -> str:
+        for name in self._names:
+            # Whole words only: "Kagami Blockhouse" is not at "Kagami Block"
+            if destination == name or destination.startswith(name + " "):
+                return name
+        return destination
+
+    def _distance(self, a: str, b: str) -> float:
+        if a == b:
+            return 0.0
+        if a not in self.graph or b not in self.graph:
+            return self.unknown_distance
+        # Dijkstra from a, stopping as soon as b is settled
+        best = {a: 0.0}
+        heap = [(0.0, a)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if node == b:
+                return dist
+            if dist > best[node]:
+                continue
+            for nxt, meters in self.graph[node].items():
+                candidate = dist + meters
+                if candidate < best.get(nxt, float('inf')):
+                    best[nxt] = candidate
+                    heapq.heappush(heap, (candidate, nxt))
+        return self.unknown_distance
+
+    def cache_info(self):
+        return self.distance.cache_info()
+
+
+def route_length(start: str, stops: List[str], matrix: DistanceMatrix) -> float:
+    total, here = 0.0, start
+    for stop in stops:
+        total += matrix.distance(here, stop)
+        here = stop
+    return total
+
+
+def nearest_neighbour(start: str, stops: List[str], matrix: DistanceMatrix) -> List[str]:
+    remaining = list(stops)
+    route, here = [], start
+    while remaining:
+        best = min(range(len(remaining)), key=lambda i: matrix.distance(here, remaining[i]))
+        here = remaining.pop(best)
+        route.append(here)
+    return route
+
+
+def two_opt(start: str, route: List[str], matrix: DistanceMatrix, max_passes: int = 50) -> List[str]:
+    # Open path from a fixed start: reversing route[i..j] swaps edges
+    # (prev, route[i]) + (route[j], next) for (prev, route[j]) + (route[i], next)
+    d = matrix.distance
+    route = list(route)
+    n = len(route)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 1):
+            prev = start if i == 0 else route[i - 1]
+            for j in range(i + 1, n):
+                nxt = route[j + 1] if j + 1 < n else None
+                before = d(prev, route[i]) + (d(route[j], nxt) if nxt is not None else 0.0)
+                after = d(prev, route[j]) + (d(route[i], nxt) if nxt is not None else 0.0)
+                if after < before - 1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+        if not improved:
+            break
+    return route
+
+
+class RoutePlan:
+    def __init__(self, rider_id: str, parcels: List[Parcel], stops: List[str], length_m: float, seconds: float):
+        self.rider_id = rider_id
+        self.parcels = parcels      # in delivery order
+        self.stops = stops          # distinct locations visited, in order
+        self.length_m = length_m
+        self.seconds = seconds
+
+
+def plan_route(rider: Rider, parcels: List[Parcel], matrix: DistanceMatrix) -> RoutePlan:
+    start_time = time.perf_counter()
+    start = matrix.locate(rider.home_hub_id)
+    # Parcels for the same block share one stop
+    by_stop: Dict[str, List[Parcel]] = {}
+    for parcel in parcels:
+        by_stop.setdefault(matrix.locate(parcel.destination), []).append(parcel)
+    stops = two_opt(start, nearest_neighbour(start, list(by_stop), matrix), matrix)
+    ordered = [parcel for stop in stops for parcel in by_stop[stop]]
+    return RoutePlan(rider.get_id(), ordered, stops, route_length(start, stops, matrix),
+                     time.perf_counter() - start_time)
+
+
+def plan_routes(riders, assignments: Dict[str, List[Parcel]], matrix: DistanceMatrix) -> Dict[str, RoutePlan]:
+    return {rider_id: plan_route(riders.get(rider_id), carried, matrix)
+            for rider_id, carried in assignments.items()}
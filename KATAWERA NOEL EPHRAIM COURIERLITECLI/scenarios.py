@@ -0,0 +1,162 @@
+# scenarios.py
+# What-if runs over one loaded data set: "two more riders at H1", "R02 drops
+# to 6 kg", "without R03". Parcels are loaded once and turned into a
+# ParcelTable (a few flat arrays). Each scenario applies its rider changes to
+# a copy of the roster and runs the usual assignment against the shared
+# table.
+#
+# Scenarios run in a process pool. Where the OS can fork, the table is put in
+# a module global before the pool starts, so workers inherit it copy-on-write
+# and each job only ships its rider list. gc.freeze() keeps the collector
+# from touching (and so copying) those pages. Elsewhere, the table is pickled
+# once per worker through the pool initializer. The log listener thread is
+# paused while the forked pool runs (logsetup.listener_paused).
+#
+# Scenario text is "name=change,change,...", with changes:
+#     add:HUB:KG[:COUNT]   COUNT new riders (default 1) with KG capacity at HUB
+#     limit:RIDER:KG       set RIDER's max_load_kg
+#     remove:RIDER         take RIDER off the roster
+
+import gc
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from models import ParcelTable, Rider
+from engine import RiderRepo, assign_parcels_with_loads
+from exceptions import DataFormatError, DomainRuleError
+from logsetup import listener_paused
+
+# The parcels every scenario runs against, set before the workers start
+_shared_parcels: Optional[ParcelTable] = None
+
+RiderRow = Tuple[str, str, float, str]   # (rider_id, name, max_load_kg, home_hub_id)
+
+
+class Scenario:
+    def __init__(self, name: str, changes: Sequence[Tuple] = ()):
+        self.name = name
+        self.changes = list(changes)   # ("add", hub_id, kg, count) | ("limit", rider_id, kg) | ("remove", rider_id)
+
+    @classmethod
+    def parse(cls, text: str) -> "Scenario":
+        name, sep, body = text.partition("=")
+        if not sep or not name.strip():
+            raise DataFormatError(f"Scenario must look like name=change,...: {text!r}")
+        changes = []
+        for item in filter(None, (part.strip() for part in body.split(","))):
+            kind, *fields = item.split(":")
+            try:
+                if kind == "add" and len(fields) in (2, 3):
+                    changes.append(("add", fields[0], float(fields[1]), int(fields[2]) if len(fields) == 3 else 1))
+                elif kind == "limit" and len(fields) == 2:
+                    changes.append(("limit", fields[0], float(fields[1])))
+                elif kind == "remove" and len(fields) == 1:
+                    changes.append(("remove", fields[0]))
+                else:
+                    raise ValueError(item)
+            except ValueError:
+                raise DataFormatError(f"Scenario {name.strip()!r}: can't read change {item!r}") from None
+        return cls(name.strip(), changes)
+
+    def apply(self, riders: RiderRepo) -> List[RiderRow]:
+        """The roster after this scenario's changes, as plain rows."""
+        roster = {rider.get_id(): [rider.get_id(), rider.name, rider.max_load_kg, rider.home_hub_id]
+                  for rider in riders.all()}
+        added = 0
+        for change in self.changes:
+            kind = change[0]
+            if kind == "add":
+                _, hub_id, kg, count = change
+                for _ in range(count):
+                    added += 1
+                    rider_id = f"{hub_id}-new{added}"
+                    roster[rider_id] = [rider_id, f"{self.name} #{added}", kg, hub_id]
+            elif change[1] not in roster:
+                raise DomainRuleError(f"Scenario {self.name!r}: unknown rider {change[1]}")
+            elif kind == "limit":
+                roster[change[1]][2] = change[2]
+            else:
+                del roster[change[1]]
+        return [tuple(row) for row in roster.values()]
+
+
+class ScenarioResult:
+    def __init__(self, name: str, riders: int, capacity_kg: float, placed: int, unassigned: int,
+                 load_kg: float, seconds: float):
+        self.name = name
+        self.riders = riders
+        self.capacity_kg = capacity_kg
+        self.placed = placed
+        self.unassigned = unassigned
+        self.load_kg = load_kg
+        self.seconds = seconds
+
+    def utilisation(self) -> float:
+        return self.load_kg / self.capacity_kg if self.capacity_kg else 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self), utilisation=self.utilisation())
+
+
+def _init_worker(parcels: ParcelTable):
+    global _shared_parcels
+    _shared_parcels = parcels
+
+
+def _run(job: Tuple[str, List[RiderRow]]) -> ScenarioResult:
+    name, rows = job
+    riders = RiderRepo()
+    for row in rows:
+        riders.add(Rider(*row))
+    start = time.perf_counter()
+    assignments, unassigned, rider_load = assign_parcels_with_loads(None, riders, _shared_parcels)
+    seconds = time.perf_counter() - start
+    return ScenarioResult(name, len(rows), sum(row[2] for row in rows),
+                          sum(len(ps) for ps in assignments.values()), len(unassigned),
+                          sum(rider_load.values()), seconds)
+
+
+def run_scenarios(riders: RiderRepo, parcels, scenarios: Sequence[Scenario],
+                  workers: Optional[int] = None, baseline: bool = True) -> List[ScenarioResult]:
+    """One ScenarioResult per scenario, in order, led by the unchanged roster when ``baseline``.
+
+    ``parcels`` may be a ParcelRepo or a ParcelTable; either way it is shared,
+    never copied per scenario. Rider changes are checked before anything runs.
+    ``workers=1`` runs in-process.
+    """
+    global _shared_parcels
+    table = parcels if isinstance(parcels, ParcelTable) else ParcelTable.from_parcels(parcels.all())
+    scenarios = ([Scenario("baseline")] if baseline else []) + list(scenarios)
+    jobs = [(scenario.name, scenario.apply(riders)) for scenario in scenarios]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    previous = _shared_parcels
+    _shared_parcels = table
+    try:
+        if workers <= 1:
+            return list(map(_run, jobs))
+        if "fork" in multiprocessing.get_all_start_methods():
+            with listener_paused():
+                gc.freeze()   # long-lived objects leave the GC's lists, so children don't dirty their pages
+                try:
+                    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                        return list(pool.map(_run, jobs))
+                finally:
+                    gc.unfreeze()
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(table,)) as pool:
+            return list(pool.map(_run, jobs))
+    finally:
+        _shared_parcels = previous
+
+
+def format_results(results: List[ScenarioResult]) -> str:
+    base = results[0].unassigned if results else 0
+    lines = [f"{'scenario':24s} {'riders':>6s} {'capacity':>9s} {'placed':>8s} {'unassigned':>10s} "
+             f"{'change':>7s} {'util':>6s} {'time (s)':>9s}"]
+    for r in results:
+        lines.append(f"{r.name:24s} {r.riders:6d} {r.capacity_kg:9.1f} {r.placed:8d} {r.unassigned:10d} "
+                     f"{r.unassigned - base:+7d} {r.utilisation():6.1%} {r.seconds:9.4f}")
+    return "\n".join(lines)
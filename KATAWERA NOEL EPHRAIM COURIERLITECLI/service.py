@@ -0,0 +1,227 @@
+# service.py
+# Long-running ingestion service around AssignmentEngine.
+#
+# Hub scanners drop parcel CSVs (same columns as data/parcels.csv) into an
+# inbox directory. The service polls the inbox, parses new files in a thread
+# pool a chunk at a time, pushes parcels through a bounded asyncio.Queue and
+# assigns them in batches. When assignment falls behind, the queue fills and
+# parsing waits (backpressure), so memory stays bounded by the queue size.
+# Finished files are moved to <inbox>/processed/. A file that fails (a parse
+# or move error) is logged, counted in the status and retried on a later poll,
+# at most once every retry_after seconds; its parcels are not added twice.
+#
+# Producers should write to a temporary name and rename to *.csv when done;
+# only *.csv files are picked up.
+#
+# A localhost HTTP endpoint reports queue depth and throughput:
+#   python service.py --inbox spool --riders data/riders.csv --port 8765
+#   curl http://127.0.0.1:8765/status
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set
+
+from models import Parcel
+from engine import AssignmentEngine, iter_parcels, load_riders
+from logsetup import setup_logging
+
+
+class IngestService:
+    def __init__(self, engine: AssignmentEngine, inbox: str, queue_size: int = 10000,
+                 parse_workers: int = 4, chunk_size: int = 1000, batch_size: int = 500,
+                 poll_interval: float = 0.5, status_port: Optional[int] = None, retry_after: float = 30.0):
+        self.engine = engine
+        self.inbox = inbox
+        self.processed_dir = os.path.join(inbox, "processed")
+        self.queue_size = queue_size
+        self.parse_workers = parse_workers
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.status_port = status_port
+        self.retry_after = retry_after
+        self.started = time.monotonic()
+        self.files_done = 0
+        self.files_failed = 0
+        self.parsed = 0
+        self.assigned = 0
+        self.duplicates = 0
+        self.parcels_failed = 0
+        self._in_progress: Set[str] = set()
+        self._failed: Dict[str, float] = {}    # path => time of its last failure
+        self._queue: Optional[asyncio.Queue] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    # --- status ---
+    def status(self) -> dict:
+        uptime = time.monotonic() - self.started
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "files_in_progress": len(self._in_progress),
+            "files_done": self.files_done,
+            "files_failed": self.files_failed,
+            "parcels_parsed": self.parsed,
+            "parcels_processed": self.assigned,
+            "parcels_duplicate": self.duplicates,
+            "parcels_failed": self.parcels_failed,
+            "parcels_unassigned": len(self.engine.unassigned),
+            "uptime_s": round(uptime, 3),
+            "throughput_per_s": round(self.assigned / uptime, 1) if uptime else 0.0,
+        }
+
+    async def _serve_status(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        body = json.dumps(self.status()).encode()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body)
+        await writer.drain()
+        writer.close()
+
+    # --- pipeline ---
+    def _new_files(self) -> List[str]:
+        try:
+            names = sorted(os.listdir(self.inbox))
+        except FileNotFoundError:
+            return []
+        now = time.monotonic()
+        paths = [os.path.join(self.inbox, n) for n in names if n.endswith(".csv")]
+        return [path for path in paths if path not in self._in_progress
+                and now - self._failed.get(path, -math.inf) >= self.retry_after]
+
+    async def _ingest_file(self, path: str, pool: ThreadPoolExecutor, slots: asyncio.Semaphore):
+        loop = asyncio.get_running_loop()
+        try:
+            async with slots:
+                parcels: Iterator[Parcel] = iter_parcels(path)
+                try:
+                    while True:
+                        # Parse off the event loop; waiting on put() is the backpressure
+                        chunk = await loop.run_in_executor(pool, lambda: list(islice(parcels, self.chunk_size)))
+                        if not chunk:
+                            break
+                        self.parsed += len(chunk)
+                        for parcel in chunk:
+                            await self._queue.put(parcel)
+                finally:
+                    parcels.close()
+            os.makedirs(self.processed_dir, exist_ok=True)
+            os.replace(path, os.path.join(self.processed_dir, os.path.basename(path)))
+        except Exception as e:
+            self.files_failed += 1
+            self._failed[path] = time.monotonic()
+            logging.error("Failed to ingest %s: %s", path, e)
+        else:
+            self._failed.pop(path, None)
+            self.files_done += 1
+        finally:
+            self._in_progress.discard(path)
+
+    async def _assign_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            fresh = {}
+            for parcel in batch:
+                if not self.engine.has_parcel(parcel.get_id()):
+                    fresh.setdefault(parcel.get_id(), parcel)
+            try:
+                if len(fresh) < len(batch):
+                    self.duplicates += len(batch) - len(fresh)
+                    logging.warning("Dropped %d duplicate parcel id(s)", len(batch) - len(fresh))
+                self.engine.add_parcels(fresh.values())
+                self.assigned += len(fresh)
+            except Exception:
+                # One bad batch must not stop the assigner; join() would wait forever
+                self.parcels_failed += len(fresh)
+                logging.exception("Failed to assign a batch of %d parcel(s)", len(fresh))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _drain(self, assigner: asyncio.Task):
+        # Wait for the queue to empty, unless the assigner dies first: then raise its error
+        joined = asyncio.ensure_future(self._queue.join())
+        done, _ = await asyncio.wait({joined, assigner}, return_when=asyncio.FIRST_COMPLETED)
+        if joined not in done:
+            joined.cancel()
+            assigner.result()
+            raise RuntimeError("Assigner stopped before the queue was drained")
+
+    async def run(self, once: bool = False):
+        """Serve until stop(); with once=True, drain the current inbox and return."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = asyncio.Event()
+        server = None
+        if self.status_port is not None:
+            server = await asyncio.start_server(self._serve_status, "127.0.0.1", self.status_port)
+            self.status_port = server.sockets[0].getsockname()[1]   # resolves port 0
+        slots = asyncio.Semaphore(self.parse_workers)
+        assigner = asyncio.create_task(self._assign_loop())
+        ingesting: Set[asyncio.Task] = set()
+        try:
+            with ThreadPoolExecutor(max_workers=self.parse_workers) as pool:
+                while True:
+                    for path in self._new_files():
+                        self._in_progress.add(path)
+                        task = asyncio.create_task(self._ingest_file(path, pool, slots))
+                        ingesting.add(task)
+                        task.add_done_callback(ingesting.discard)
+                    if once:
+                        if ingesting:
+                            await asyncio.gather(*ingesting)
+                        await self._drain(assigner)
+                        break
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+                if ingesting:
+                    await asyncio.gather(*ingesting)
+                await self._drain(assigner)
+        finally:
+            assigner.cancel()
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CourierLite parcel ingestion service")
+    parser.add_argument("--inbox", default="spool", help="directory the hub scanners drop parcel CSVs into")
+    parser.add_argument("--riders", default="data/riders.csv")
+    parser.add_argument("--port", type=int, default=8765, help="localhost status port")
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=4, help="parser threads")
+    parser.add_argument("--once", action="store_true", help="process the current inbox and exit")
+    args = parser.parse_args()
+    setup_logging()
+
+    engine = AssignmentEngine(load_riders(args.riders).all())
+    service = IngestService(engine, args.inbox, queue_size=args.queue_size,
+                            parse_workers=args.workers, status_port=args.port)
+    try:
+        asyncio.run(service.run(once=args.once))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(service.status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# shards.py
+# Parcels exported as one file per hub (or any other split). Each shard is
+# parsed by load_parcels_bulk in its own worker process and the results are
+# merged into one ParcelRepo in shard order. Duplicate parcel_ids follow
+# load_parcels, within a shard and across shards alike: the last copy wins
+# and keeps the position of the first. Every repeat is counted against the
+# shard it came from.
+
+import contextlib
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple, Union
+
+from models import Parcel
+from engine import ParcelRepo
+from bulk import load_parcels_bulk
+from exceptions import DataFormatError
+from instrumentation import metrics
+from logsetup import listener_paused
+
+# (parcel_id, recipient, priority, hub_id, destination, weight_kg): plain tuples pickle far cheaper than objects
+ParcelRow = Tuple[str, str, str, str, str, float]
+
+
+class ShardStats:
+    """Per-shard counts and parse time (measured inside the worker)."""
+
+    def __init__(self, path: str, rows: int = 0, loaded: int = 0, rejected: int = 0, seconds: float = 0.0):
+        self.path = path
+        self.rows = rows            # rows read
+        self.loaded = loaded        # parcels parsed from this shard
+        self.rejected = rejected    # bad rows (see bulk.RejectReport)
+        self.duplicates = 0         # rows whose parcel_id was already loaded, here or from an earlier shard
+        self.seconds = seconds
+
+    def __repr__(self):
+        return (f"ShardStats({self.path}, rows={self.rows}, loaded={self.loaded}, rejected={self.rejected}, "
+                f"duplicates={self.duplicates}, {self.seconds * 1000:.1f} ms)")
+
+
+def expand_shards(shards: Union[str, Iterable[str]]) -> List[str]:
+    """A glob pattern (sorted matches) or an explicit list of paths, kept in order."""
+    if isinstance(shards, str):
+        paths = sorted(glob.glob(shards))
+        if not paths:
+            raise DataFormatError(f"No parcel shards match {shards}")
+        return paths
+    return list(shards)
+
+
+def _read_shard(job: Tuple[str, int, bool, bool]):
+    path, chunk_size, strict, as_rows = job
+    start = time.perf_counter()
+    repo, report = load_parcels_bulk(path, chunk_size, strict)
+    parcels = list(repo.parcels.values())
+    if as_rows:
+        parcels = [(p.id, p.recipient, p.priority, p.hub_id, p.destination, p.weight_kg) for p in parcels]
+    stats = ShardStats(path, report.read, len(parcels), report.total, time.perf_counter() - start)
+    # Rows that parsed but did not add a parcel repeated an id earlier in the shard
+    stats.duplicates = report.read - report.total - len(parcels)
+    if strict and stats.duplicates:
+        raise DataFormatError(f"{path}: {stats.duplicates} duplicate parcel_id(s)")
+    return parcels, stats
+
+
+def load_parcel_shards(shards: Union[str, Iterable[str]], workers: Optional[int] = None,
+                       chunk_size: int = 65536, strict: bool = False) -> Tuple[ParcelRepo, List[ShardStats]]:
+    """Load every shard into one ParcelRepo, parsing up to ``workers`` shards at once.
+
+    The result does not depend on the worker count: shards are merged in the
+    order given (sorted for a glob), and it matches load_parcels on the
+    shards concatenated, so the last copy of a duplicated parcel_id wins.
+    With ``strict=True`` a rejected row or any duplicate raises
+    DataFormatError. ``workers=1`` runs in-process.
+    """
+    paths = expand_shards(shards)
+    workers = workers or os.cpu_count() or 1
+    pooled = workers > 1 and len(paths) > 1
+    # Workers send rows back as tuples; in-process the Parcels are used as they are
+    jobs = [(path, chunk_size, strict, pooled) for path in paths]
+
+    repo = ParcelRepo()
+    parcels = repo.parcels
+    stats: List[ShardStats] = []
+    # Forked workers log bad rows themselves, straight to the handlers
+    with metrics.timer("load_parcels.shards"), listener_paused() if pooled else contextlib.nullcontext():
+        if pooled:
+            pool = ProcessPoolExecutor(max_workers=min(workers, len(jobs)))
+            results = pool.map(_read_shard, jobs)
+        else:
+            results = map(_read_shard, jobs)
+        try:
+            for items, shard in results:
+                for item in items:
+                    parcel = Parcel(*item) if pooled else item
+                    key = parcel.get_id()
+                    if key in parcels:
+                        shard.duplicates += 1
+                        if strict:
+                            raise DataFormatError(f"{shard.path}: parcel {key} already loaded from an earlier shard")
+                    parcels[key] = parcel
+                stats.append(shard)
+        finally:
+            if pooled:
+                pool.shutdown(cancel_futures=True)
+
+    # Worker processes have their own metrics; in-process runs were counted by load_parcels_bulk
+    if pooled:
+        metrics.incr("parcels.rows_read", sum(s.rows for s in stats))
+        metrics.incr("parcels.rows_skipped", sum(s.rejected for s in stats))
+    duplicates = sum(s.duplicates for s in stats)
+    metrics.incr("parcels.shards", len(stats))
+    metrics.incr("parcels.duplicates", duplicates)
+    if duplicates:
+        worst = max(stats, key=lambda s: s.duplicates)
+        logging.warning("%d duplicate parcel_id(s) in %d shards replaced earlier copies (most from %s: %d)",
+                        duplicates, len(stats), worst.path, worst.duplicates)
+    return repo, stats
+
+
+def format_shard_stats(stats: List[ShardStats]) -> str:
+    lines = [f"  {'shard':<32} {'rows':>9} {'loaded':>9} {'rejected':>9} {'dupes':>7} {'ms':>9}"]
+    for s in stats:
+        lines.append(f"  {os.path.basename(s.path):<32} {s.rows:>9} {s.loaded:>9} {s.rejected:>9} "
+                     f"{s.duplicates:>7} {s.seconds * 1000:>9.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,97 @@
+# snapshot.py
+# Binary snapshot cache for the CSV repositories. The first load parses the
+# CSV as usual and writes the rows to <cache_dir>/<hash>.snap; later loads
+# memory-map that file and rebuild the repo without touching csv/float().
+# A snapshot is keyed by the source path, size and mtime, so editing the CSV
+# makes it stale and it is rebuilt on the next load.
+
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+from typing import Callable, Optional, Tuple
+
+from models import Hub, Parcel, Rider
+from engine import HubRepo, ParcelRepo, RiderRepo, load_hubs, load_parcels, load_riders
+
+MAGIC = b"CLSNAP1\n"
+_HEADER = struct.Struct("<I")   # length of the pickled key that follows MAGIC
+
+SourceKey = Tuple[str, int, int]
+
+
+def source_key(path: str) -> SourceKey:
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def snapshot_path(cache_dir: str, path: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{digest}.snap")
+
+
+def write_snapshot(snap_path: str, key: SourceKey, rows: list):
+    key_bytes = pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp = snap_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(len(key_bytes)))
+        f.write(key_bytes)
+        pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, snap_path)  # readers never see a half-written file
+
+
+def read_snapshot(snap_path: str, key: SourceKey) -> Optional[list]:
+    """Rows stored in the snapshot, or None if it is missing, corrupt or stale."""
+    try:
+        with open(snap_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            if m[:len(MAGIC)] != MAGIC:
+                return None
+            start = len(MAGIC) + _HEADER.size
+            (key_len,) = _HEADER.unpack_from(m, len(MAGIC))
+            if pickle.loads(m[start:start + key_len]) != key:
+                return None
+            view = memoryview(m)
+            try:
+                return pickle.loads(view[start + key_len:])
+            finally:
+                view.release()
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, struct.error):
+        return None
+
+
+def cached_load(path: str, cache_dir: str, loader: Callable, repo_cls, model_cls):
+    """Load ``path`` through the snapshot cache. Returns (repo, from_snapshot)."""
+    try:
+        key = source_key(path)
+    except OSError:
+        return loader(path), False  # let the loader report the missing file
+    snap = snapshot_path(cache_dir, path)
+    rows = read_snapshot(snap, key)
+    if rows is not None:
+        repo = repo_cls()
+        for row in rows:
+            repo.add(model_cls(*row))
+        return repo, True
+
+    repo = loader(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_snapshot(snap, key, [item.to_row() for item in repo.all()])
+    except OSError as e:
+        logging.warning("Could not write snapshot %s: %s", snap, e)
+    return repo, False
+
+
+def load_hubs_cached(path: str, cache_dir: str):
+    return cached_load(path, cache_dir, load_hubs, HubRepo, Hub)
+
+
+def load_parcels_cached(path: str, cache_dir: str, loader: Callable = load_parcels):
+    return cached_load(path, cache_dir, loader, ParcelRepo, Parcel)
+
+
+def load_riders_cached(path: str, cache_dir: str):
+    return cached_load(path, cache_dir, load_riders, RiderRepo, Rider)
@@ -0,0 +1,188 @@
+# sqlite_repo.py
+# SQLite-backed versions of HubRepo, ParcelRepo and RiderRepo. They keep the
+# same add/get/all/values/exists/ids interface, add bulk inserts (executemany in one
+# transaction) and indexed per-hub queries, so assign_parcels_by_hub can pull
+# one hub's work set at a time instead of the whole parcel table.
+#
+# Insertion order is kept in an integer `seq` column: all() and by_hub()
+# return items in the order they were first added, like the dict repos, and
+# re-adding an id updates the row in place.
+#
+# import_csvs() writes an `import_complete` row to the meta table only after
+# all three CSVs are in, so a database left behind by a failed or interrupted
+# import is recognised (import_complete() is False) and imported again.
+
+import os
+import sqlite3
+from typing import Iterable, List, Optional, Set
+
+from exceptions import DataFormatError
+from models import Hub, Parcel, Rider
+from engine import iter_hubs, iter_parcels, iter_riders
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS hubs (
+    seq INTEGER PRIMARY KEY,
+    hub_id TEXT NOT NULL UNIQUE,
+    hub_name TEXT,
+    campus TEXT
+);
+CREATE TABLE IF NOT EXISTS parcels (
+    seq INTEGER PRIMARY KEY,
+    parcel_id TEXT NOT NULL UNIQUE,
+    recipient TEXT,
+    priority TEXT,
+    hub_id TEXT,
+    destination TEXT,
+    weight_kg REAL
+);
+CREATE TABLE IF NOT EXISTS riders (
+    seq INTEGER PRIMARY KEY,
+    rider_id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    max_load_kg REAL,
+    home_hub_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_parcels_hub_priority ON parcels (hub_id, priority, seq);
+CREATE INDEX IF NOT EXISTS idx_parcels_priority ON parcels (priority, seq);
+CREATE INDEX IF NOT EXISTS idx_riders_home_hub ON riders (home_hub_id, rider_id);
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class _SqliteRepo:
+    table = ""
+    key = ""
+    columns = ()
+    model = None
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        cols = ", ".join(self.columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in self.columns[1:])
+        self._select = f"SELECT {cols} FROM {self.table}"
+        self._upsert = (f"INSERT INTO {self.table} ({cols}) VALUES ({', '.join('?' * len(self.columns))}) "
+                        f"ON CONFLICT({self.key}) DO UPDATE SET {updates}")
+
+    def _rows(self, sql: str, params=()) -> List:
+        return [self.model(*row) for row in self.conn.execute(sql, params)]
+
+    def add(self, item):
+        with self.conn:
+            self.conn.execute(self._upsert, item.to_row())
+
+    def add_many(self, items: Iterable, batch_size: int = 10000) -> int:
+        """Insert items in batches inside a single transaction; returns the count."""
+        count = 0
+        batch = []
+        with self.conn:
+            for item in items:
+                batch.append(item.to_row())
+                if len(batch) >= batch_size:
+                    self.conn.executemany(self._upsert, batch)
+                    count += len(batch)
+                    batch.clear()
+            if batch:
+                self.conn.executemany(self._upsert, batch)
+                count += len(batch)
+        return count
+
+    def get(self, item_id: str):
+        rows = self._rows(f"{self._select} WHERE {self.key} = ?", (item_id,))
+        return rows[0] if rows else None
+
+    def all(self) -> List:
+        return self._rows(f"{self._select} ORDER BY seq")
+
+    def values(self) -> List:
+        # Same as all(): rows are read fresh either way, there is no live view to hand out
+        return self.all()
+
+    def exists(self, item_id: str) -> bool:
+        return self.conn.execute(f"SELECT 1 FROM {self.table} WHERE {self.key} = ?", (item_id,)).fetchone() is not None
+
+    def ids(self) -> Set[str]:
+        return {row[0] for row in self.conn.execute(f"SELECT {self.key} FROM {self.table}")}
+
+    def count(self) -> int:
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+
+class SqliteHubRepo(_SqliteRepo):
+    table, key, model = "hubs", "hub_id", Hub
+    columns = ("hub_id", "hub_name", "campus")
+
+
+class SqliteParcelRepo(_SqliteRepo):
+    table, key, model = "parcels", "parcel_id", Parcel
+    columns = ("parcel_id", "recipient", "priority", "hub_id", "destination", "weight_kg")
+
+    def by_hub(self, hub_id: str, priority: Optional[str] = None) -> List[Parcel]:
+        if priority is None:
+            return self._rows(f"{self._select} WHERE hub_id = ? ORDER BY seq", (hub_id,))
+        return self._rows(f"{self._select} WHERE hub_id = ? AND priority = ? ORDER BY seq", (hub_id, priority))
+
+    def by_priority(self, priority: str) -> List[Parcel]:
+        return self._rows(f"{self._select} WHERE priority = ? ORDER BY seq", (priority,))
+
+    def hub_ids(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT hub_id FROM parcels ORDER BY hub_id")]
+
+
+class SqliteRiderRepo(_SqliteRepo):
+    table, key, model = "riders", "rider_id", Rider
+    columns = ("rider_id", "name", "max_load_kg", "home_hub_id")
+
+    def by_hub(self, hub_id: str) -> List[Rider]:
+        # Already in id order, which is the order assignment wants
+        return self._rows(f"{self._select} WHERE home_hub_id = ? ORDER BY rider_id", (hub_id,))
+
+    def hub_ids(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT home_hub_id FROM riders ORDER BY home_hub_id")]
+
+
+def open_repos(path: str):
+    conn = connect(path)
+    return SqliteHubRepo(conn), SqliteParcelRepo(conn), SqliteRiderRepo(conn)
+
+
+def import_csvs(path: str, hubs_csv: str, parcels_csv: str, riders_csv: str):
+    """Load the three CSVs into the database at ``path``; returns the repos.
+
+    Anything already in the database is replaced. Raises DataFormatError if a
+    CSV is missing, before touching the database.
+    """
+    for csv_path in (hubs_csv, parcels_csv, riders_csv):
+        if not os.path.isfile(csv_path):
+            raise DataFormatError(f"Cannot import {path}: {csv_path} not found")
+    hubs, parcels, riders = open_repos(path)
+    conn = hubs.conn
+    with conn:
+        conn.execute("DELETE FROM meta WHERE key = 'import_complete'")
+        for table in ("hubs", "parcels", "riders"):
+            conn.execute(f"DELETE FROM {table}")
+    hubs.add_many(iter_hubs(hubs_csv))
+    parcels.add_many(iter_parcels(parcels_csv))
+    riders.add_many(iter_riders(riders_csv))
+    with conn:
+        conn.execute("INSERT INTO meta (key, value) VALUES ('import_complete', datetime('now'))")
+    return hubs, parcels, riders
+
+
+def import_complete(conn: sqlite3.Connection) -> bool:
+    """True once import_csvs has finished loading into this database."""
+    return conn.execute("SELECT 1 FROM meta WHERE key = 'import_complete'").fetchone() is not None
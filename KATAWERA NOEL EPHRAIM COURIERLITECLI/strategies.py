@@ -0,0 +1,169 @@
+# strategies.py
+# Pluggable bin-packing policies for parcel assignment. Every strategy keeps
+# the house rules (riders only serve their home hub, EXPRESS before NORMAL,
+# nobody goes over max_load_kg) and differs only in which rider gets a parcel:
+#
+#   first-fit            lowest rider id with room (the assign_parcels policy)
+#   best-fit-decreasing  heaviest parcels first, into the rider left with the
+#                        least spare capacity
+#   worst-fit            into the rider with the most spare capacity
+#
+# run_strategy() returns the assignment plus a StrategyReport with runtime,
+# parcels placed and capacity utilisation per hub.
+
+import bisect
+import heapq
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Set
+
+from models import Parcel, Rider
+from engine import HubRepo, ParcelRepo, RiderRepo, assign_parcels_with_loads, dispatch_order
+
+
+class AssignmentStrategy(ABC):
+    name = ""
+
+    @abstractmethod
+    def assign(self, hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo):
+        """Return (assignments, unassigned, rider_load)."""
+
+
+class FirstFit(AssignmentStrategy):
+    name = "first-fit"
+
+    def assign(self, hubs, riders, parcels):
+        return assign_parcels_with_loads(hubs, riders, parcels)
+
+
+class _PerHubStrategy(AssignmentStrategy):
+    # Shared driver: split the dispatch order by hub and let the subclass
+    # pick a rider for each parcel from that hub's riders.
+
+    def order(self, parcels: List[Parcel]) -> List[Parcel]:
+        return parcels
+
+    @abstractmethod
+    def assign_hub(self, riders: Sequence[Rider], parcels: List[Parcel], loads: Dict[str, float]):
+        """Yield (parcel, rider or None) for each parcel, updating loads."""
+
+    def assign(self, hubs, riders, parcels):
+        hub_parcels: Dict[str, List[Parcel]] = {}
+        for parcel in dispatch_order(parcels):
+            hub_parcels.setdefault(parcel.hub_id, []).append(parcel)
+
+        loads: Dict[str, float] = {r.get_id(): 0 for r in riders.values()}
+        assignments: Dict[str, List[Parcel]] = {}
+        unassigned: Set[str] = set()
+        for hub_id, work in hub_parcels.items():
+            # by_hub() is already in id order
+            for parcel, rider in self.assign_hub(riders.by_hub(hub_id), self.order(work), loads):
+                if rider is None:
+                    unassigned.add(parcel.get_id())
+                else:
+                    assignments.setdefault(rider.get_id(), []).append(parcel)
+        return assignments, unassigned, loads
+
+
+class BestFitDecreasing(_PerHubStrategy):
+    name = "best-fit-decreasing"
+
+    def order(self, parcels):
+        # EXPRESS still goes first; heaviest first within each class
+        rank = {'EXPRESS': 0, 'NORMAL': 1}
+        return sorted(parcels, key=lambda p: (rank[p.priority], -p.weight_kg))
+
+    def assign_hub(self, riders, parcels, loads):
+        # Sorted list of (spare capacity, rider position); bisect finds the
+        # tightest rider that still fits
+        spare = sorted((r.max_load_kg - loads[r.get_id()], pos) for pos, r in enumerate(riders))
+        for parcel in parcels:
+            weight = parcel.weight_kg
+            i = bisect.bisect_left(spare, (weight - 1e-9, -1))
+            chosen = None
+            while i < len(spare):
+                _, pos = spare[i]
+                rider = riders[pos]
+                if loads[rider.get_id()] + weight <= rider.max_load_kg:
+                    chosen = rider
+                    break
+                i += 1
+            if chosen is None:
+                yield parcel, None
+                continue
+            del spare[i]
+            loads[chosen.get_id()] += weight
+            bisect.insort(spare, (chosen.max_load_kg - loads[chosen.get_id()], pos))
+            yield parcel, chosen
+
+
+class WorstFit(_PerHubStrategy):
+    name = "worst-fit"
+
+    def assign_hub(self, riders, parcels, loads):
+        # Max-heap on spare capacity (negated), ties broken by rider position
+        heap = [(-(r.max_load_kg - loads[r.get_id()]), pos) for pos, r in enumerate(riders)]
+        heapq.heapify(heap)
+        for parcel in parcels:
+            if not heap:
+                yield parcel, None
+                continue
+            _, pos = heap[0]
+            rider = riders[pos]
+            rid = rider.get_id()
+            if loads[rid] + parcel.weight_kg > rider.max_load_kg:
+                yield parcel, None   # the emptiest rider can't take it, nobody can
+                continue
+            loads[rid] += parcel.weight_kg
+            heapq.heapreplace(heap, (-(rider.max_load_kg - loads[rid]), pos))
+            yield parcel, rider
+
+
+STRATEGIES = {cls.name: cls for cls in (FirstFit, BestFitDecreasing, WorstFit)}
+
+
+class StrategyReport:
+    def __init__(self, strategy: str, seconds: float, placed: int, unassigned: int,
+                 hubs: Dict[str, Dict[str, float]]):
+        self.strategy = strategy
+        self.seconds = seconds
+        self.placed = placed
+        self.unassigned = unassigned
+        self.hubs = hubs    # hub_id => {"capacity_kg", "load_kg", "utilisation"}
+
+    def utilisation(self) -> float:
+        capacity = sum(h["capacity_kg"] for h in self.hubs.values())
+        return sum(h["load_kg"] for h in self.hubs.values()) / capacity if capacity else 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self), utilisation=self.utilisation())
+
+
+def hub_utilisation(riders: RiderRepo, rider_load: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+    hubs: Dict[str, Dict[str, float]] = {}
+    for rider in riders.values():
+        stats = hubs.setdefault(rider.home_hub_id, {"capacity_kg": 0.0, "load_kg": 0.0})
+        stats["capacity_kg"] += rider.max_load_kg
+        stats["load_kg"] += rider_load.get(rider.get_id(), 0)
+    for stats in hubs.values():
+        stats["utilisation"] = stats["load_kg"] / stats["capacity_kg"] if stats["capacity_kg"] else 0.0
+    return hubs
+
+
+def run_strategy(strategy: AssignmentStrategy, hubs: HubRepo, riders: RiderRepo, parcels: ParcelRepo):
+    """Run one strategy; returns (assignments, unassigned, rider_load, StrategyReport)."""
+    start = time.perf_counter()
+    assignments, unassigned, rider_load = strategy.assign(hubs, riders, parcels)
+    seconds = time.perf_counter() - start
+    placed = sum(len(ps) for ps in assignments.values())
+    report = StrategyReport(strategy.name, seconds, placed, len(unassigned), hub_utilisation(riders, rider_load))
+    return assignments, unassigned, rider_load, report
+
+
+def format_reports(reports: List[StrategyReport]) -> str:
+    lines = [f"{'strategy':22s} {'time (s)':>9s} {'placed':>8s} {'unassigned':>10s} {'util':>6s}"]
+    for r in reports:
+        lines.append(f"{r.strategy:22s} {r.seconds:9.4f} {r.placed:8d} {r.unassigned:10d} {r.utilisation():6.1%}")
+        for hub_id, stats in sorted(r.hubs.items()):
+            lines.append(f"  {hub_id:20s} {stats['load_kg']:9.1f} / {stats['capacity_kg']:.1f} kg  {stats['utilisation']:6.1%}")
+    return "\n".join(lines)
@@ -1,6 +1,36 @@
 import unittest
-from models import Hub, Parcel, Rider
-from engine import HubRepo, ParcelRepo, RiderRepo, assign_parcels
+from bulk import load_parcels_bulk
+from exceptions import DataFormatError, DomainRuleError
+from feasibility import analyse, np, prefilter
+from models import DavyJonesLocker, HuecoMundo, Hub, Parcel, ParcelTable, Rider
+from dispatch import DispatchQueue
+from benchmarks.generate import DataSpec, parcel_rows
+from instrumentation import metrics
+from journal import MAGIC, assign_parcels_journaled, compact_journal, read_journal
+from logsetup import RowWarnings, setup_logging, stop_logging
+from parallel import assign_parcels_parallel
+from report import write_report
+from routing import DistanceMatrix, nearest_neighbour, plan_route, route_length, two_opt
+from scenarios import Scenario, run_scenarios
+from service import IngestService
+from shards import load_parcel_shards
+from snapshot import load_riders_cached
+from sqlite_repo import import_complete, import_csvs, open_repos
+from strategies import STRATEGIES, AssignmentStrategy, BestFitDecreasing, FirstFit, WorstFit, run_strategy
+import asyncio
+import contextlib
+import gc
+import cli
+import io
+import json
+import logging
+import os
+import random
+import tempfile
+from engine import (AssignmentEngine, HubRepo, ParcelRepo, RiderRepo, assign_parcels, assign_parcels_linear,
+                    assign_parcels_with_loads,
+                    dispatch_order,
+                    assign_parcels_by_hub, collect_assignments, load_parcels, stream_assignments)
 
 class TestCourierLite(unittest.TestCase):
 
@@ -47,5 +77,630 @@ class TestCourierLite(unittest.TestCase):
         # The heavy parcel exceeds rider1 capacity; should be unassigned
         self.assertIn("P1003", unassigned)
 
+    def test_indexed_matches_linear(self):
+        rng = random.Random(7)
+        riders = RiderRepo()
+        parcels = ParcelRepo()
+        for i in range(40):
+            riders.add(Rider(f"R{rng.randrange(100):02d}", "x", round(rng.uniform(1, 12), 1), rng.choice("AB")))
+        for i in range(600):
+            parcels.add(Parcel(f"P{i}", "x", rng.choice(["EXPRESS", "NORMAL", "normal", "SLOW"]),
+                               rng.choice("ABC"), "d", round(rng.uniform(0.1, 4.0), 2)))
+        expected = assign_parcels_linear(self.hubs, riders, parcels)
+        actual = assign_parcels(self.hubs, riders, parcels)
+        self.assertEqual(actual, expected)
+        self.assertEqual(list(actual[0]), list(expected[0]))
+
+    def test_stream_matches_repo_assignment(self):
+        rows = ["parcel_id,recipient,priority,hub_id,destination,weight_kg"]
+        for i in range(50):
+            priority = "EXPRESS" if i % 3 == 0 else "normal"
+            rows.append(f'P{i},R{i},{priority},H{1 + i % 2},"Block {i}, Room 1",{0.5 + (i % 7) * 0.7}')
+        rows.append("PBAD,x,NORMAL,H1,d,heavy")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "parcels.csv")
+            with open(path, "w", newline="") as f:
+                f.write("\n".join(rows) + "\n")
+            expected = assign_parcels(self.hubs, self.riders, load_parcels(path))
+            actual = collect_assignments(stream_assignments(self.riders, path))
+        self.assertEqual({r: [p.get_id() for p in ps] for r, ps in actual[0].items()},
+                         {r: [p.get_id() for p in ps] for r, ps in expected[0].items()})
+        self.assertEqual(actual[1], expected[1])
+
+    def test_slots_models_to_row(self):
+        self.assertFalse(hasattr(self.parcel1, "__dict__"))
+        self.assertEqual(self.parcel1.to_row(),
+                         ("P1001", "Kurosaki", "EXPRESS", "H1", "Kawagai Hostel Room 101", 2.5))
+        self.assertEqual(self.rider2.to_row(), ("R02", "Tetsuya", 8.5, "H2"))
+
+    def test_parcel_table_assignment(self):
+        table = ParcelTable.from_parcels(self.parcels.all())
+        table.add(Parcel("P1001", "Kurosaki", "express", "H1", "Kawagai Hostel Room 101", 9.0))
+        self.parcels.add(Parcel("P1001", "Kurosaki", "express", "H1", "Kawagai Hostel Room 101", 9.0))
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.get("P1001").weight_kg, 9.0)
+        expected = assign_parcels(self.hubs, self.riders, self.parcels)
+        actual = assign_parcels(self.hubs, self.riders, table)
+        self.assertEqual({r: [p.to_row() for p in ps] for r, ps in actual[0].items()},
+                         {r: [p.to_row() for p in ps] for r, ps in expected[0].items()})
+        self.assertEqual(actual[1], expected[1])
+
+    def test_parallel_matches_serial(self):
+        for i in range(30):
+            self.riders.add(Rider(f"R{30 - i:02d}X", "x", 3.0 + i % 4, f"H{i % 3 + 1}"))
+            self.parcels.add(Parcel(f"Q{i}", "x", "NORMAL" if i % 2 else "EXPRESS", f"H{i % 4 + 1}", "d", 1.0 + i % 3))
+        serial = assign_parcels(self.hubs, self.riders, self.parcels)
+        for workers in (1, 2):
+            result = assign_parcels_parallel(self.hubs, self.riders, self.parcels, workers=workers)
+            self.assertEqual(result, serial)
+            self.assertEqual(list(result[0]), list(serial[0]))
+
+    def test_incremental_engine(self):
+        engine = AssignmentEngine(self.riders.all())
+        engine.add_parcels(self.parcels.all())
+        self.assertEqual((engine.assignments, engine.unassigned),
+                         assign_parcels(self.hubs, self.riders, self.parcels))
+
+        engine.add_parcels([Parcel("P2001", "x", "NORMAL", "H2", "d", 8.0),
+                            Parcel("P2002", "x", "EXPRESS", "H3", "d", 1.0)])
+        self.assertEqual(engine.unassigned, {"P2001", "P2002"})
+        self.assertRaises(DomainRuleError, engine.add_parcels, [self.parcel1])
+        # A repeat inside one batch is rejected before anything is placed
+        load = engine.rider_load["R01"]
+        self.assertRaises(DomainRuleError, engine.add_parcels,
+                          [Parcel("D1", "x", "NORMAL", "H1", "d", 3.0), Parcel("D1", "x", "NORMAL", "H1", "d", 4.0)])
+        self.assertFalse(engine.has_parcel("D1"))
+        self.assertEqual(engine.rider_load["R01"], load)
+
+        # Freeing capacity at H2 lets the waiting parcel in
+        engine.remove_parcel("P1002")
+        self.assertEqual([p.get_id() for p in engine.assignments["R02"]], ["P2001"])
+        self.assertEqual(engine.rider_load["R02"], 8.0)
+
+        # A new hub rider picks up the parcel waiting there
+        engine.add_rider(Rider("R09", "Kenji", 5.0, "H3"))
+        self.assertEqual(engine.unassigned, set())
+        self.assertEqual([p.get_id() for p in engine.assignments["R09"]], ["P2002"])
+
+    def test_snapshot_cache_roundtrip_and_staleness(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "riders.csv")
+            cache = os.path.join(tmp, "cache")
+            with open(path, "w") as f:
+                f.write("rider_id,name,max_load_kg,home_hub_id\nR01,Hirokoshi,10.0,H1\n")
+            cold, hit = load_riders_cached(path, cache)
+            self.assertFalse(hit)
+            warm, hit = load_riders_cached(path, cache)
+            self.assertTrue(hit)
+            self.assertEqual([r.to_row() for r in warm.all()], [r.to_row() for r in cold.all()])
+
+            with open(path, "a") as f:
+                f.write("R02,Tetsuya,8.5,H2\n")
+            fresh, hit = load_riders_cached(path, cache)
+            self.assertFalse(hit)
+            self.assertEqual(fresh.ids(), {"R01", "R02"})
+
+    def test_generator_is_seeded(self):
+        spec = DataSpec(hubs=3, parcels=200, hub_skew=1.5, weights="pareto", express_ratio=0.5, seed=3)
+        rows = list(parcel_rows(spec))
+        self.assertEqual(rows, list(parcel_rows(spec)))
+        self.assertEqual(len(rows), 200)
+        per_hub = [sum(1 for r in rows if r[3] == h) for h in ("H1", "H2", "H3")]
+        self.assertGreater(per_hub[0], per_hub[2])
+
+    def test_metrics_counters(self):
+        metrics.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "parcels.csv")
+            with open(path, "w") as f:
+                f.write("parcel_id,recipient,priority,hub_id,destination,weight_kg\n"
+                        "P1,a,EXPRESS,H1,d,1.0\nP2,b,NORMAL,H1,d,oops\nP3,c,NORMAL,H2,d,20\n")
+            parcels = load_parcels(path)
+        assign_parcels(self.hubs, self.riders, parcels)
+        summary = metrics.summary()
+        self.assertEqual(summary["counters"]["parcels.rows_read"], 3)
+        self.assertEqual(summary["counters"]["parcels.rows_skipped"], 1)
+        self.assertEqual(summary["counters"]["assign.parcels_placed"], 1)
+        self.assertEqual(summary["counters"]["assign.parcels_unassigned"], 1)
+        self.assertIn("load_parcels.parse", summary["timers"])
+        self.assertIn("assign.place", summary["timers"])
+
+    def test_bulk_loader_matches_row_loader(self):
+        content = ("parcel_id,recipient,priority,hub_id,destination,weight_kg\n"
+                   "P1,a,express,H1,\"Block A, Room 1\",1.5\n"
+                   "P2,b,NORMAL,H1,d,heavy\n"
+                   "\n"
+                   "P3,c,NORMAL,H2,d\n"
+                   "P4,d\n"
+                   "P5,e,NORMAL,H2,d,2,extra\n"
+                   "P1,f,NORMAL,H2,d,3.25\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "parcels.csv")
+            with open(path, "w", newline="") as f:
+                f.write(content)
+            expected = load_parcels(path)
+            repo, report = load_parcels_bulk(path, chunk_size=2)
+            self.assertEqual([p.to_row() for p in repo.all()], [p.to_row() for p in expected.all()])
+            self.assertEqual(report.total, 3)
+            self.assertEqual(report.reasons, {"bad weight_kg": 1, "missing weight_kg": 2})
+            with self.assertRaises(DataFormatError):
+                load_parcels_bulk(path, strict=True)
+            self.assertTrue(gc.isenabled())
+
+            # A caller that turned the collector off keeps it off
+            gc.disable()
+            try:
+                load_parcels_bulk(path)
+                self.assertFalse(gc.isenabled())
+            finally:
+                gc.enable()
+
+    def test_strategies(self):
+        riders = RiderRepo()
+        riders.add(Rider("R01", "a", 5.0, "H1"))
+        riders.add(Rider("R02", "b", 7.0, "H1"))
+        parcels = ParcelRepo()
+        for pid, weight in (("P1", 2.0), ("P2", 5.0), ("P3", 5.0)):
+            parcels.add(Parcel(pid, "x", "NORMAL", "H1", "d", weight))
+
+        first = run_strategy(FirstFit(), self.hubs, riders, parcels)
+        self.assertEqual(first[:2], assign_parcels(self.hubs, riders, parcels))
+        self.assertEqual(first[1], {"P3"})
+        for strategy in (BestFitDecreasing(), WorstFit()):
+            assignments, unassigned, loads, report = run_strategy(strategy, self.hubs, riders, parcels)
+            self.assertEqual(unassigned, set(), strategy.name)
+            self.assertEqual(report.placed, 3)
+            self.assertAlmostEqual(report.hubs["H1"]["utilisation"], 1.0)
+        best = run_strategy(BestFitDecreasing(), self.hubs, riders, parcels)[0]
+        self.assertEqual([p.get_id() for p in best["R01"]], ["P2"])
+
+        for strategy in STRATEGIES.values():
+            assignments, _, loads, _ = run_strategy(strategy(), self.hubs, self.riders, self.parcels)
+            for rider_id, carried in assignments.items():
+                self.assertLessEqual(sum(p.weight_kg for p in carried), self.riders.get(rider_id).max_load_kg)
+                self.assertAlmostEqual(loads[rider_id], sum(p.weight_kg for p in carried))
+        with self.assertRaises(TypeError):
+            AssignmentStrategy()
+
+    def test_report_formats(self):
+        assignments, unassigned = assign_parcels(self.hubs, self.riders, self.parcels)
+        loads = {"R01": 5.5, "R02": 1.2}
+
+        out = io.StringIO()
+        write_report(out, self.riders, assignments, unassigned, loads, "jsonl")
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(records[0]["rider_id"], "R01")
+        self.assertEqual([p["parcel_id"] for p in records[0]["parcels"]], ["P1001", "P1003"])
+        self.assertEqual(records[-1], {"unassigned": []})
+
+        out = io.StringIO()
+        write_report(out, self.riders, assignments, unassigned, loads, "csv", summary_only=True)
+        self.assertEqual(out.getvalue().splitlines(),
+                         ["rider_id,name,parcel_count,load_kg", "R01,Hirokoshi,2,5.5", "R02,Tetsuya,1,1.2"])
+
+        out = io.StringIO()
+        write_report(out, self.riders, assignments, unassigned, loads, "text")
+        self.assertIn("  Total load: 5.5 kg\n", out.getvalue())
+        self.assertIn("    Parcel: ('P1003', 3.0, 5.5)\n", out.getvalue())
+
+    def test_sqlite_repos(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            hubs, parcels, riders = open_repos(os.path.join(tmp, "courier.db"))
+            hubs.add_many(self.hubs.all())
+            riders.add_many(self.riders.all())
+            self.assertEqual(parcels.add_many(self.parcels.all(), batch_size=2), 3)
+            parcels.add(Parcel("P1001", "Kurosaki", "EXPRESS", "H1", "Kawagai Hostel Room 101", 9.0))
+
+            self.assertEqual([p.get_id() for p in parcels.all()], ["P1001", "P1002", "P1003"])
+            self.assertEqual(parcels.get("P1001").weight_kg, 9.0)
+            self.assertEqual([p.get_id() for p in parcels.by_hub("H1", "EXPRESS")], ["P1001", "P1003"])
+            self.assertEqual([p.get_id() for p in parcels.by_priority("NORMAL")], ["P1002"])
+            self.assertEqual([r.get_id() for r in riders.by_hub("H2")], ["R02"])
+            self.assertTrue(hubs.exists("H2"))
+
+            self.parcels.add(Parcel("P1001", "Kurosaki", "EXPRESS", "H1", "Kawagai Hostel Room 101", 9.0))
+            expected = assign_parcels(self.hubs, self.riders, self.parcels)
+            actual = assign_parcels_by_hub(hubs, riders, parcels)
+            self.assertEqual({r: [p.get_id() for p in ps] for r, ps in actual[0].items()},
+                             {r: [p.get_id() for p in ps] for r, ps in expected[0].items()})
+            self.assertEqual(actual[1], expected[1])
+            parcels.conn.close()
+
+    def test_compare_strategies_on_sqlite(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            args = cli.parse_args(["--db", os.path.join(tmp, "courier.db"), "--compare-strategies",
+                                   "--output", os.path.join(tmp, "report.txt")])
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                cli.run(args)
+            for name in STRATEGIES:
+                self.assertIn(name, out.getvalue())
+
+    def test_machine_format_stdout_stays_clean(self):
+        args = cli.parse_args(["--format", "jsonl", "--metrics"])
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            cli.run(args)
+            cli.emit_metrics(args.metrics, cli.status_stream(args))
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertTrue(rows)
+        self.assertIn("Metrics:", err.getvalue())
+
+    def test_sqlite_import_marker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "courier.db")
+            csvs = [os.path.join(tmp, name) for name in ("hubs.csv", "parcels.csv", "riders.csv")]
+            with open(csvs[0], "w") as f:
+                f.write("hub_id,hub_name,campus\nH1,Main Hub,North Campus\n")
+            with open(csvs[1], "w") as f:
+                f.write("parcel_id,recipient,priority,hub_id,destination,weight_kg\n"
+                        "P1001,Kurosaki,EXPRESS,H1,Kawagai Hostel Room 101,2.5\n")
+
+            # riders.csv is missing: nothing is imported or marked complete
+            with self.assertRaises(DataFormatError):
+                import_csvs(db, *csvs)
+            hubs, _, _ = open_repos(db)
+            self.assertFalse(import_complete(hubs.conn))
+            hubs.conn.close()
+
+            with open(csvs[2], "w") as f:
+                f.write("rider_id,name,max_load_kg,home_hub_id\nR01,Hirokoshi,10.0,H1\n")
+            hubs, parcels, riders = import_csvs(db, *csvs)
+            self.assertTrue(import_complete(hubs.conn))
+            hubs.conn.close()
+            hubs, parcels, riders = import_csvs(db, *csvs)   # re-import replaces, no duplicates
+            self.assertEqual((len(hubs), len(parcels), len(riders)), (1, 1, 1))
+            hubs.conn.close()
+
+    def test_ingest_service(self):
+        header = "parcel_id,recipient,priority,hub_id,destination,weight_kg\n"
+        with tempfile.TemporaryDirectory() as inbox:
+            with open(os.path.join(inbox, "h1.csv"), "w") as f:
+                f.write(header + "P1001,Kurosaki,EXPRESS,H1,Kawagai Hostel Room 101,2.5\n"
+                                 "P1003,Ryuguji,EXPRESS,H1,Kagami Block Room 110,3.0\n")
+            with open(os.path.join(inbox, "h2.csv"), "w") as f:
+                f.write(header + "P1002,Saboten,NORMAL,H2,Shiketsu Hostel Room 202,1.2\n"
+                                 "P1001,Kurosaki,EXPRESS,H1,Kawagai Hostel Room 101,2.5\n")
+            engine = AssignmentEngine(self.riders.all())
+            service = IngestService(engine, inbox, queue_size=1, chunk_size=1, poll_interval=0.01, status_port=0)
+
+            async def scenario():
+                task = asyncio.create_task(service.run())
+                while service.files_done < 2:
+                    await asyncio.sleep(0.01)
+                reader, writer = await asyncio.open_connection("127.0.0.1", service.status_port)
+                writer.write(b"GET /status HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                response = await reader.read()
+                writer.close()
+                service.stop()
+                await task
+                return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+            status = asyncio.run(scenario())
+            self.assertEqual(status["files_done"], 2)
+            self.assertEqual(status["parcels_duplicate"], 1)
+            self.assertEqual(sorted(os.listdir(os.path.join(inbox, "processed"))), ["h1.csv", "h2.csv"])
+        self.assertEqual({r: sorted(p.get_id() for p in ps) for r, ps in engine.assignments.items()},
+                         {"R01": ["P1001", "P1003"], "R02": ["P1002"]})
+
+    def test_ingest_service_failures(self):
+        header = "parcel_id,recipient,priority,hub_id,destination,weight_kg\n"
+        with tempfile.TemporaryDirectory() as inbox:
+            with open(os.path.join(inbox, "h1.csv"), "w") as f:
+                f.write(header + "P1001,Kurosaki,EXPRESS,H1,Kawagai Hostel Room 101,2.5\n")
+            # processed/ is a file, so the move fails: counted, logged, not stuck in progress
+            with open(os.path.join(inbox, "processed"), "w"):
+                pass
+            engine = AssignmentEngine(self.riders.all())
+            service = IngestService(engine, inbox, poll_interval=0.01)
+            with self.assertLogs(level="ERROR"):
+                asyncio.run(service.run(once=True))
+            status = service.status()
+            self.assertEqual((status["files_failed"], status["files_done"], status["files_in_progress"]), (1, 0, 0))
+            self.assertEqual(service._new_files(), [])   # waits retry_after before trying again
+
+            # A batch the engine rejects is logged and the run still finishes
+            os.remove(os.path.join(inbox, "processed"))
+            with open(os.path.join(inbox, "h1.csv"), "w") as f:
+                f.write(header + "P2001,Saboten,NORMAL,H2,Shiketsu Hostel Room 202,1.2\n")
+            service = IngestService(engine, inbox, poll_interval=0.01)
+            engine.add_parcels = lambda batch: (_ for _ in ()).throw(DomainRuleError("boom"))
+            with self.assertLogs(level="ERROR"):
+                asyncio.run(asyncio.wait_for(service.run(once=True), 5))
+            self.assertEqual((service.files_done, service.parcels_failed), (1, 1))
+
+    def test_routing(self):
+        # Grid blocks with Manhattan distances: greedy A, C, B, D (24); 2-opt untangles it to 21
+        pos = {"H1": (0, 0), "A": (4, 1), "B": (-3, 3), "C": (4, -3), "D": (-2, 4)}
+        legs = {(a, b): abs(pos[a][0] - pos[b][0]) + abs(pos[a][1] - pos[b][1])
+                for a in pos for b in pos if a < b}
+        matrix = DistanceMatrix(legs)
+        greedy = nearest_neighbour("H1", ["A", "B", "C", "D"], matrix)
+        self.assertEqual(greedy, ["A", "C", "B", "D"])
+        self.assertEqual(route_length("H1", greedy, matrix), 24)
+        improved = two_opt("H1", greedy, matrix)
+        self.assertEqual(route_length("H1", improved, matrix), 21)
+
+        matrix = DistanceMatrix.from_csv("data/distances.csv")
+        self.assertEqual(matrix.distance("Shiketsu Hostel", "Kagami Block"), 1620)   # via H2
+        parcels = [Parcel("P1", "x", "NORMAL", "H1", "Kagami Block Room 1", 1.0),
+                   Parcel("P2", "x", "NORMAL", "H1", "Kawagai Hostel Room 5", 1.0),
+                   Parcel("P3", "x", "NORMAL", "H1", "Kagami Block Room 9", 1.0)]
+        plan = plan_route(self.rider1, parcels, matrix)
+        self.assertEqual(plan.stops, ["Kawagai Hostel", "Kagami Block"])
+        self.assertEqual([p.get_id() for p in plan.parcels], ["P2", "P1", "P3"])
+        self.assertEqual(plan.length_m, 750)
+        self.assertGreater(matrix.cache_info().hits, 0)
+        self.assertEqual(matrix.locate("Kagami Block"), "Kagami Block")
+        self.assertEqual(matrix.locate("Kagami Blockhouse Room 2"), "Kagami Blockhouse Room 2")
+
+    def test_dispatch_queue(self):
+        queue = DispatchQueue()
+        queue.extend(self.parcels.all())
+        self.assertEqual(list(queue.drain()), dispatch_order(self.parcels))
+
+        # A locker at H2 (+1) doesn't outrank EXPRESS, but does beat NORMAL at other hubs
+        queue = DispatchQueue([DavyJonesLocker("PK1", "H2"), HuecoMundo("PK2", "H1")])
+        queue.push(Parcel("N1", "x", "NORMAL", "H1", "d", 1.0))
+        queue.push(Parcel("N2", "x", "NORMAL", "H2", "d", 1.0))
+        queue.push(Parcel("E1", "x", "EXPRESS", "H1", "d", 1.0))
+        queue.push(Parcel("S1", "x", "SLOW", "H1", "d", 1.0))
+        self.assertEqual(len(queue), 3)
+        self.assertEqual([p.get_id() for p in queue.drain()], ["E1", "N2", "N1"])
+
+        # With ageing, a NORMAL parcel that waited long enough overtakes a new EXPRESS
+        queue = DispatchQueue(age_rate=1.0)
+        queue.push(Parcel("OLD", "x", "NORMAL", "H1", "d", 1.0), arrived_at=0)
+        queue.push(Parcel("NEW", "x", "EXPRESS", "H1", "d", 1.0), arrived_at=20)
+        self.assertEqual(queue.pop().get_id(), "OLD")
+
+        # assign_parcels follows the queue order: with class_gap=0 it is plain arrival order
+        parcels = ParcelRepo()
+        parcels.add(Parcel("N1", "x", "NORMAL", "H1", "d", 6.0))
+        parcels.add(Parcel("E1", "x", "EXPRESS", "H1", "d", 6.0))
+        queue = DispatchQueue(class_gap=0.0)
+        assignments, unassigned = assign_parcels(self.hubs, self.riders, parcels, queue)
+        self.assertEqual([p.get_id() for p in assignments["R01"]], ["N1"])
+        self.assertEqual(unassigned, {"E1"})
+
+    def test_load_parcel_shards(self):
+        header = "parcel_id,recipient,priority,hub_id,destination,weight_kg\n"
+        shards = {
+            "parcels_a.csv": "P1,x,express,H1,d,1.0\nP2,x,NORMAL,H1,d,2.0\nP2,w,NORMAL,H1,d,2.5\n",
+            "parcels_b.csv": "P3,x,NORMAL,H2,d,3.0\nP1,y,NORMAL,H2,d,9.0\nP4,x,NORMAL,H2,d,bad\n",
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, body in shards.items():
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write(header + body)
+            with open(os.path.join(tmp, "all.csv"), "w") as f:
+                f.write(header + "".join(shards.values()))
+            combined = load_parcels(os.path.join(tmp, "all.csv"))
+            pattern = os.path.join(tmp, "parcels_*.csv")
+            serial, stats = load_parcel_shards(pattern, workers=1)
+            pooled, _ = load_parcel_shards(pattern, workers=2)
+            with self.assertRaises(DataFormatError):
+                load_parcel_shards(pattern, workers=1, strict=True)
+            with self.assertRaises(DataFormatError):
+                load_parcel_shards(os.path.join(tmp, "missing_*.csv"))
+
+        self.assertEqual(list(serial.parcels), ["P1", "P2", "P3"])
+        # Last copy wins, within a shard and across shards, as with load_parcels
+        self.assertEqual((serial.get("P1").recipient, serial.get("P2").recipient), ("y", "w"))
+        self.assertEqual([p.to_row() for p in serial.all()], [p.to_row() for p in combined.all()])
+        self.assertEqual([p.to_row() for p in pooled.all()], [p.to_row() for p in serial.all()])
+        self.assertEqual([(s.rows, s.loaded, s.rejected, s.duplicates) for s in stats], [(3, 2, 0, 1), (3, 2, 1, 1)])
+
+    def feasibility_fixture(self):
+        riders = RiderRepo()
+        for rider in (Rider("R1", "a", 5.0, "H1"), Rider("R2", "b", 3.0, "H1"), Rider("R3", "c", 4.0, "H2")):
+            riders.add(rider)
+        parcels = ParcelRepo()
+        for parcel in (Parcel("P1", "x", "EXPRESS", "H1", "d", 6.0),     # heavier than any H1 rider
+                       Parcel("P2", "x", "NORMAL", "H1", "d", 5.0),
+                       Parcel("P3", "x", "NORMAL", "H2", "d", 4.5),      # heavier than R3
+                       Parcel("P4", "x", "NORMAL", "H9", "d", 1.0),      # hub without riders
+                       Parcel("P5", "x", "SLOW", "H1", "d", 99.0),       # never dispatched at all
+                       Parcel("P6", "x", "EXPRESS", "H2", "d", 2.0),
+                       Parcel("P7", "x", "NORMAL", "H2", "d", 3.0)):    # H2 can carry 4 of these 5 kg
+            parcels.add(parcel)
+        return riders, parcels
+
+    def test_feasibility_prefilter(self):
+        riders, parcels = self.feasibility_fixture()
+        report, _ = analyse(riders, parcels, use_numpy=False)
+        self.assertEqual(report.unassignable, ["P1", "P3", "P4"])
+        h1 = report.hubs["H1"]
+        self.assertEqual((h1.riders, h1.capacity_kg, h1.largest_kg, h1.parcels, h1.demand_kg, h1.unassignable),
+                         (2, 8.0, 5.0, 2, 11.0, 1))
+        self.assertEqual(report.hubs["H9"].largest_kg, 0.0)
+        self.assertEqual(report.overloaded(), ["H2"])
+
+        # Dropping the never-fit parcels changes nothing else about the assignment
+        ids = lambda assignments: {r: [p.get_id() for p in ps] for r, ps in assignments.items()}
+        full = assign_parcels(self.hubs, riders, parcels)
+        for source in (parcels, ParcelTable.from_parcels(parcels.all())):
+            kept, report = prefilter(riders, source, use_numpy=False)
+            self.assertEqual(type(kept), type(source))
+            assignments, unassigned = assign_parcels(self.hubs, riders, kept)
+            self.assertEqual(ids(assignments), ids(full[0]))
+            self.assertEqual(unassigned | set(report.unassignable), full[1])
+
+        # A negative weight would break the never-fits shortcut; one that is never dispatched doesn't matter
+        parcels.add(Parcel("P8", "x", "SLOW", "H1", "d", -1.0))
+        analyse(riders, parcels, use_numpy=False)
+        parcels.add(Parcel("P9", "x", "NORMAL", "H1", "d", -1.0))
+        for use_numpy in (False, True) if np is not None else (False,):
+            with self.assertRaises(DomainRuleError):
+                prefilter(riders, parcels, use_numpy=use_numpy)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_feasibility_numpy_matches_python(self):
+        riders, parcels = self.feasibility_fixture()
+        for source in (parcels, ParcelTable.from_parcels(parcels.all())):
+            vector, _ = analyse(riders, source, use_numpy=True)
+            plain, _ = analyse(riders, source, use_numpy=False)
+            self.assertEqual(vector.unassignable, plain.unassignable)
+            self.assertEqual({k: h.as_dict() for k, h in vector.hubs.items()},
+                             {k: h.as_dict() for k, h in plain.hubs.items()})
+
+    def test_scenarios(self):
+        scenarios = [Scenario.parse("R01 at 3 kg=limit:R01:3"),
+                     Scenario.parse("no R02, two at H2=remove:R02, add:H2:1:2")]
+        self.assertEqual(scenarios[1].changes, [("remove", "R02"), ("add", "H2", 1.0, 2)])
+        self.assertEqual(scenarios[1].apply(self.riders),
+                         [("R01", "Hirokoshi", 10.0, "H1"), ("H2-new1", "no R02, two at H2 #1", 1.0, "H2"),
+                          ("H2-new2", "no R02, two at H2 #2", 1.0, "H2")])
+        with self.assertRaises(DataFormatError):
+            Scenario.parse("bad=add:H1")
+        with self.assertRaises(DomainRuleError):
+            run_scenarios(self.riders, self.parcels, [Scenario.parse("x=remove:R99")])
+
+        serial = run_scenarios(self.riders, self.parcels, scenarios, workers=1)
+        pooled = run_scenarios(self.riders, self.parcels, scenarios, workers=2)
+        summary = lambda results: [(r.name, r.riders, r.capacity_kg, r.placed, r.unassigned, r.load_kg)
+                                   for r in results]
+        self.assertEqual(summary(serial), summary(pooled))
+        self.assertEqual([(r.placed, r.unassigned) for r in serial], [(3, 0), (2, 1), (2, 1)])
+        # Baseline matches a plain run, and the shared parcels were not touched
+        _, unassigned = assign_parcels(self.hubs, self.riders, self.parcels)
+        self.assertEqual(serial[0].unassigned, len(unassigned))
+        self.assertEqual(len(self.parcels.all()), 3)
+
+    def test_row_warnings_and_queued_logging(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "parcels.csv")
+            with open(path, "w") as f:
+                f.write("parcel_id,recipient,priority,hub_id,destination,weight_kg\n")
+                f.write("P1,Ann,NORMAL,H1,Block A,1.0\n")
+                for i in range(8):
+                    f.write(f"B{i},Bob,NORMAL,H1,Block A,n/a\n")
+            with self.assertLogs(level="WARNING") as logs:
+                self.assertEqual(len(load_parcels(path).all()), 1)
+            self.assertEqual(len(logs.records), 6)
+            self.assertTrue(logs.output[0].startswith("WARNING:root:Skipping parcel row: {'parcel_id': 'B0'"))
+            self.assertIn("8 parcel row(s) skipped, 3 not shown individually (ValueError x8)", logs.output[-1])
+            self.assertEqual(RowWarnings("x", "hub", limit=2).suppressed, 0)
+
+            # logging.conf-style file: records go through the queue to the file handler
+            log_path = os.path.join(tmp, "out.log")
+            conf = os.path.join(tmp, "logging.conf")
+            with open(conf, "w") as f:
+                f.write("[loggers]\nkeys=root\n[handlers]\nkeys=file\n[formatters]\nkeys=plain\n"
+                        "[logger_root]\nlevel=INFO\nhandlers=file\n"
+                        f"[handler_file]\nclass=FileHandler\nformatter=plain\nargs=({log_path!r},)\n"
+                        "[formatter_plain]\nformat=%(levelname)s %(message)s\n")
+            root = logging.getLogger()
+            saved = list(root.handlers), root.level
+            try:
+                setup_logging(conf)
+                self.assertEqual([type(h).__name__ for h in root.handlers], ["QueueHandler"])
+                logging.info("queued %s", "record")
+
+                # Forked workers log straight to the handlers while the listener is paused
+                shards = []
+                for n in range(2):
+                    shards.append(os.path.join(tmp, f"shard{n}.csv"))
+                    with open(shards[-1], "w") as f:
+                        f.write(f"parcel_id,recipient,priority,hub_id,destination,weight_kg\nS{n},a,NORMAL,H1,d,x\n")
+                load_parcel_shards(shards, workers=2)
+                results = run_scenarios(self.riders, self.parcels, [Scenario.parse("y=remove:R02")], workers=2)
+                self.assertEqual(len(results), 2)
+                self.assertEqual([type(h).__name__ for h in root.handlers], ["QueueHandler"])
+                stop_logging()
+                with open(log_path) as f:
+                    lines = f.read().splitlines()
+                self.assertEqual(lines[0], "INFO queued record")
+                self.assertEqual(sum("row(s) rejected" in line for line in lines), 2)
+            finally:
+                for handler in list(root.handlers):
+                    root.removeHandler(handler)
+                    handler.close()
+                for handler in saved[0]:
+                    root.addHandler(handler)
+                root.setLevel(saved[1])
+
+    def test_journaled_assignment_resumes(self):
+        for i in range(40):
+            self.parcels.add(Parcel(f"Q{i:03d}", "Ann", "NORMAL" if i % 3 else "EXPRESS", f"H{i % 2 + 1}", "Block A",
+                                    0.1 + i % 7 * 0.3))
+        expected = assign_parcels_with_loads(self.hubs, self.riders, self.parcels)
+        summary = lambda result: ({rid: [p.get_id() for p in ps] for rid, ps in result[0].items()},
+                                  result[1], result[2])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "assign.journal")
+            first = assign_parcels_journaled(self.hubs, self.riders, self.parcels, path, batch_size=4, fsync=False)
+            self.assertEqual(summary(first), summary(expected))
+            self.assertEqual(first[3], 0)
+
+            # Crash mid-record: the torn batch is dropped and the run picks up after the last full one
+            with open(path, "r+b") as f:
+                f.truncate(os.path.getsize(path) * 2 // 3)
+            state = read_journal(path)
+            self.assertGreater(state.torn_bytes, 0)
+            self.assertEqual(len(state) % 4, 0)
+            resumed = assign_parcels_journaled(self.hubs, self.riders, self.parcels, path, batch_size=4)
+            self.assertEqual(resumed[3], len(state))
+            self.assertEqual(summary(resumed), summary(expected))
+
+            before, after = compact_journal(path)
+            self.assertLess(after, before)
+            replayed = assign_parcels_journaled(self.hubs, self.riders, self.parcels, path)
+            self.assertEqual(replayed[3], 43)
+            self.assertEqual(summary(replayed), summary(expected))
+
+            # Crash before the header was synced: no journal yet, the run starts over
+            torn = os.path.join(tmp, "header.journal")
+            assign_parcels_journaled(self.hubs, self.riders, self.parcels, torn, fsync=False)
+            with open(torn, "rb") as f:
+                data = f.read()
+            header = len(MAGIC) + 4 + int.from_bytes(data[len(MAGIC):len(MAGIC) + 4], "little")
+            for cut in (0, 3, len(MAGIC) + 2, header - 1):
+                with open(torn, "wb") as f:
+                    f.write(data[:cut])
+                self.assertIsNone(read_journal(torn), cut)
+                restarted = assign_parcels_journaled(self.hubs, self.riders, self.parcels, torn, fsync=False)
+                self.assertEqual(restarted[3], 0)
+                self.assertEqual(summary(restarted), summary(expected))
+            with open(torn, "wb") as f:
+                f.write(b"not a journal")
+            with self.assertRaises(DataFormatError):
+                read_journal(torn)
+
+            self.riders.add(Rider("R03", "Extra", 5.0, "H1"))
+            with self.assertRaises(DomainRuleError):
+                assign_parcels_journaled(self.hubs, self.riders, self.parcels, path)
+
+    def test_repo_secondary_indexes(self):
+        ids = lambda items: [item.get_id() for item in items]
+        self.assertEqual(ids(self.parcels.by_hub("H1", "EXPRESS")), ["P1001", "P1003"])
+        self.assertEqual(ids(self.parcels.by_priority("NORMAL")), ["P1002"])
+        self.assertEqual(self.parcels.by_hub("H9", "NORMAL"), ())
+        self.assertEqual(self.riders.by_hub("H9"), ())
+        self.assertEqual(self.parcels.hub_ids(), ["H1", "H2"])
+
+        # Kept up to date after the first query; re-adding an id keeps its original position
+        self.parcels.add(Parcel("P0999", "Ann", "NORMAL", "H1", "Block A", 1.0))
+        self.parcels.add(Parcel("P1001", "Kurosaki", "NORMAL", "H1", "Kawagai Hostel Room 101", 2.5))
+        self.assertEqual(ids(self.parcels.by_priority("NORMAL")), ["P1001", "P1002", "P0999"])
+        self.assertEqual(ids(self.parcels.by_hub("H1", "NORMAL")), ["P1001", "P0999"])
+        self.assertEqual(ids(dispatch_order(self.parcels)), ["P1003", "P1001", "P1002", "P0999"])
+        self.assertEqual(len(self.parcels), 4)
+        self.assertIn("P0999", self.parcels.keys())
+        self.parcels.add(Parcel("P0998", "Bo", "EXPRESS", "H1", "Block B", 1.0))
+        self.assertEqual(ids(self.parcels.by_hub("H1", "EXPRESS")), ["P1003", "P0998"])
+
+        self.assertEqual(ids(self.riders.by_hub("H1")), ["R01"])
+        self.riders.add(Rider("R00", "Early", 1.0, "H1"))
+        self.riders.add(Rider("R05", "Late", 1.0, "H1"))
+        self.assertEqual(ids(self.riders.by_hub("H1")), ["R00", "R01", "R05"])
+        self.assertEqual(self.riders.hub_ids(), ["H1", "H2"])
+
+        by_hub, unassigned = assign_parcels_by_hub(self.hubs, self.riders, self.parcels)
+        expected, expected_unassigned = assign_parcels_linear(self.hubs, self.riders, self.parcels)
+        self.assertEqual({rid: ids(ps) for rid, ps in by_hub.items()},
+                         {rid: ids(ps) for rid, ps in expected.items()})
+        self.assertEqual(unassigned, expected_unassigned)
+
 if __name__ == "__main__":
     unittest.main()
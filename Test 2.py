@@ -1,12 +1,17 @@
+import heapq
 import logging
-from typing import List, Dict, Tuple, Set
+from collections import deque
+from itertools import islice
+from typing import List, Dict, Tuple, Set, Iterator, Iterable, Optional, Deque
 
 
 
 # Mixins for logging
 class LoggerMixin:
-    def log(self, com):
-        logging.info(com)
+    # Arguments are %-formatted only if INFO is enabled, so a quiet run pays
+    # for one level check per event, not for building the message
+    def log(self, msg, *args):
+        logging.info(msg, *args)
 
 # Custom exception
 class DeliveryError(Exception):
@@ -26,39 +31,202 @@ class Deliveries(LoggerMixin):
         self.destination = destination  # e.g., ("Hostel A", "Room 101")
 
 
+# Dispatch: which courier carries which order
+class Dispatcher(LoggerMixin):
+    """Hands orders to the courier with the fewest open orders.
+
+    A min-heap holds (workload, courier_id). Entries are never changed in
+    place: every workload change pushes a fresh entry and stale ones are
+    dropped when they reach the top, so a change costs O(log n).
+    """
+
+    def __init__(self, batch_size: int = 5):
+        self.batch_size = batch_size                       # orders to one building handed out together
+        self.workload: Dict[int, int] = {}                 # courier_id -> open orders
+        self.queues: Dict[int, Dict[int, Deliveries]] = {} # courier_id -> open orders in hand-out order
+        self.assigned: Dict[int, int] = {}                 # order_id -> courier_id
+        self._heap: List[Tuple[int, int]] = []
+
+    def add_courier(self, courier_id: int):
+        if courier_id not in self.workload:
+            self.queues[courier_id] = {}
+            self._set(courier_id, 0)
+
+    def _set(self, courier_id: int, load: int):
+        self.workload[courier_id] = load
+        heapq.heappush(self._heap, (load, courier_id))
+        if len(self._heap) > 4 * len(self.workload) + 64:
+            # Mostly stale entries by now: start again from the live workloads
+            self._heap = [(load, cid) for cid, load in self.workload.items()]
+            heapq.heapify(self._heap)
+
+    def least_loaded(self) -> int:
+        heap = self._heap
+        while heap:
+            load, courier_id = heap[0]
+            if self.workload[courier_id] == load:
+                return courier_id
+            heapq.heappop(heap)
+        raise DeliveryError("No couriers to dispatch to!")
+
+    def assign(self, orders: List[Deliveries], courier_id: int):
+        queue = self.queues[courier_id]
+        for delivery in orders:
+            queue[delivery.order_id] = delivery
+            self.assigned[delivery.order_id] = courier_id
+        self._set(courier_id, self.workload[courier_id] + len(orders))
+
+    def release(self, order_id: int) -> Optional[int]:
+        """Take an order off its courier's queue; returns that courier (None if it wasn't assigned)."""
+        courier_id = self.assigned.pop(order_id, None)
+        if courier_id is not None:
+            del self.queues[courier_id][order_id]
+            self._set(courier_id, self.workload[courier_id] - 1)
+        return courier_id
+
+    def dispatch(self, orders: Iterable[Deliveries]) -> int:
+        # Same building together: each batch goes to whoever is least loaded at that moment
+        buildings: Dict[str, List[Deliveries]] = {}
+        for delivery in orders:
+            buildings.setdefault(delivery.destination[0], []).append(delivery)
+        count = 0
+        for group in buildings.values():
+            for start in range(0, len(group), self.batch_size):
+                batch = group[start:start + self.batch_size]
+                self.assign(batch, self.least_loaded())
+                count += len(batch)
+        return count
+
+    def queue_lengths(self) -> Dict[int, int]:
+        return {courier_id: len(queue) for courier_id, queue in self.queues.items()}
+
+
 class DeliveryEngine(LoggerMixin):
-    def __init__(self):
+    def __init__(self, auto_dispatch: bool = False):
         self.couriers: Dict[int, Courier] = {}          # Dict of objects
-        self.deliveries: List[Deliveries] = []            # List of objects
+        self.deliveries: List[Deliveries] = []            # List of objects (full history)
         self.completed: Set[int] = set()                # Set for completed IDs
+        self.orders: Dict[int, Deliveries] = {}         # order_id -> delivery, for O(1) lookups
+        self.pending: Dict[int, Deliveries] = {}        # open orders by ID
+        self._arrivals: Deque[int] = deque()            # order IDs oldest first; completed ones are dropped lazily
+        self.dispatcher = Dispatcher()
+        self._waiting: Deque[int] = deque()             # order IDs not yet handed to a courier, oldest first
+        self.auto_dispatch = auto_dispatch              # hand the next waiting order out whenever one completes
 
     def add_courier(self, courier: Courier):
         self.couriers[courier.courier_id] = courier
-        self.log(f"Courier added: {courier.name}")
+        self.dispatcher.add_courier(courier.courier_id)
+        self.log("Courier added: %s", courier.name)
 
     def add_delivery(self, delivery: Deliveries):
+        if delivery.order_id in self.orders:
+            raise DeliveryError(f"Order {delivery.order_id} already exists!")
         self.deliveries.append(delivery)
-        self.log(f"Delivery added: {delivery.item} to {delivery.destination}")
+        self.orders[delivery.order_id] = delivery
+        self.pending[delivery.order_id] = delivery
+        self._arrivals.append(delivery.order_id)
+        self._waiting.append(delivery.order_id)
+        self.log("Delivery added: %s to %s", delivery.item, delivery.destination)
 
-    # Generator example to list pending deliveries
-    def pending_deliveries(self):
-        for delivery in self.deliveries:
-            if delivery.order_id not in self.completed:
-                yield delivery
+    # Generator example to list pending deliveries (oldest first), one page at a time.
+    # The page at offset k is found by walking the k open orders before it, so
+    # paging forward is O(offset + limit) per page, which is fine for a screen
+    # at a time; deep jumps would want an indexed structure instead.
+    def pending_deliveries(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Deliveries]:
+        stop = None if limit is None else offset + limit
+        pending = self.pending
+        open_orders = (pending[oid] for oid in self._arrivals if oid in pending)
+        # Take the page before yielding, so orders can be completed while it is being walked
+        yield from list(islice(open_orders, offset, stop))
 
     def complete_delivery(self, order_id):
         if order_id in self.completed:
             raise DeliveryError("Order already completed!")
+        if order_id not in self.orders:
+            raise DeliveryError(f"Order {order_id} not found!")
+        del self.pending[order_id]
         self.completed.add(order_id)
-        self.log(f"Order {order_id} completed!")
+        arrivals = self._arrivals
+        while arrivals and arrivals[0] not in self.pending:
+            arrivals.popleft()
+        if len(arrivals) > 2 * len(self.pending):
+            # More completed IDs than open ones left in the queue: rebuild it (amortised O(1))
+            self._arrivals = deque(oid for oid in arrivals if oid in self.pending)
+        if self.dispatcher.release(order_id) is not None and self.auto_dispatch and self.couriers:
+            self.dispatch_pending(limit=1)
+        self.log("Order %s completed!", order_id)
+
+    def outstanding(self) -> int:
+        return len(self.pending)
+
+    def _take_waiting(self, limit: Optional[int]) -> List[Deliveries]:
+        # Oldest waiting orders first; IDs completed or assigned meanwhile are skipped for good
+        waiting, pending, assigned = self._waiting, self.pending, self.dispatcher.assigned
+        taken: List[Deliveries] = []
+        while waiting and (limit is None or len(taken) < limit):
+            order_id = waiting.popleft()
+            if order_id in pending and order_id not in assigned:
+                taken.append(pending[order_id])
+        return taken
+
+    def dispatch_pending(self, limit: Optional[int] = None) -> int:
+        """Hand waiting orders (oldest first, up to limit) to the least-loaded couriers; returns how many."""
+        if not self.couriers:
+            raise DeliveryError("No couriers to dispatch to!")
+        count = self.dispatcher.dispatch(self._take_waiting(limit))
+        if count:
+            self.log("Dispatched %d order(s)", count)
+        return count
+
+    def reassign(self, order_id, courier_id=None) -> int:
+        """Move an open order to courier_id (default: whoever is least loaded once it is released)."""
+        if order_id not in self.pending:
+            raise DeliveryError(f"Order {order_id} is not open!")
+        if courier_id is not None and courier_id not in self.couriers:
+            raise DeliveryError(f"Courier {courier_id} not found!")
+        self.dispatcher.release(order_id)
+        target = self.dispatcher.least_loaded() if courier_id is None else courier_id
+        self.dispatcher.assign([self.pending[order_id]], target)
+        self.log("Order %s reassigned to courier %s", order_id, target)
+        return target
 
+    def courier_of(self, order_id) -> Optional[int]:
+        return self.dispatcher.assigned.get(order_id)
 
-    def incomplete_deliveries(self):
-        return [d for d in self.deliveries if d.order_id not in self.completed]    
+    def courier_queue_lengths(self) -> Dict[int, int]:
+        return self.dispatcher.queue_lengths()
+
+    def waiting(self) -> int:
+        return len(self.pending) - len(self.dispatcher.assigned)
+
+    def incomplete_deliveries(self, offset: int = 0, limit: Optional[int] = None) -> List[Deliveries]:
+        return list(self.pending_deliveries(offset, limit))
+
+
+PAGE_SIZE = 20
+
+
+def print_pages(engine: DeliveryEngine, empty_message: str = ""):
+    # Show PAGE_SIZE orders at a time; only the page on screen is ever built
+    offset = 0
+    while True:
+        page = engine.incomplete_deliveries(offset, PAGE_SIZE)
+        for d in page:
+            courier_id = engine.courier_of(d.order_id)
+            carrier = "" if courier_id is None else f" (courier {courier_id})"
+            print(f"Order {d.order_id}: {d.item} to {d.destination}{carrier}")
+        if not page and offset == 0 and empty_message:
+            print(empty_message)
+        offset += len(page)
+        if len(page) < PAGE_SIZE or offset >= engine.outstanding():
+            break
+        more = input(f"-- {offset} of {engine.outstanding()} shown, Enter for more, q to stop -- ")
+        if more.strip().lower() == "q":
+            break
 
 
 def simple_cli():
-    engine = DeliveryEngine()
+    engine = DeliveryEngine(auto_dispatch=True)
     
     # Sample data using dict, list, tuple, set
     engine.add_courier(Courier(1, "Toshinori Yagi"))
@@ -70,20 +238,32 @@ def simple_cli():
     
     print("\n*⚜️===Welcome to Santorini Campus Delivery CLI!===⚜️*")
     while True:
-        print("\nOptions: [delivery_list] [courier] [complete] [incomplete] [exit]")
+        print("\nOptions: [delivery_list] [courier] [dispatch] [queues] [complete] [incomplete] [exit]")
         choice = input("What do you want to do? ").strip().lower()
         
         if choice == "delivery_list":
-            print("\nPending deliveries:")
-            # Iterator/generator usage
-            for d in engine.pending_deliveries():
-                print(f"Order {d.order_id}: {d.item} to {d.destination}")
+            print(f"\nPending deliveries ({engine.outstanding()}):")
+            # Iterator/generator usage, paged
+            print_pages(engine)
 
         elif choice == "courier":
             print("\nCouriers:")
             for cid, courier in engine.couriers.items():
                 print(f"Courier {cid}: {courier.name}")        
 
+        elif choice == "dispatch":
+            try:
+                count = engine.dispatch_pending()
+                print(f"{count} order(s) handed out.")
+            except DeliveryError as e:
+                print(f"Error: {e}")
+
+        elif choice == "queues":
+            print("\nCourier queues:")
+            for cid, length in engine.courier_queue_lengths().items():
+                print(f"Courier {cid} ({engine.couriers[cid].name}): {length} open order(s)")
+            print(f"Waiting for a courier: {engine.waiting()}")
+
         elif choice == "complete":
             try:
                 oid = int(input("Enter order ID to complete: "))
@@ -96,11 +276,7 @@ def simple_cli():
 
         elif choice == "incomplete":
             print("\nIncomplete deliveries:")
-            incompletes = engine.incomplete_deliveries()
-            for d in incompletes:
-                print(f"Order {d.order_id}: {d.item} to {d.destination}")
-            if not incompletes:
-                print("All deliveries are complete!")        
+            print_pages(engine, "All deliveries are complete!")
 
         elif choice == "exit":
             print("Jaane 😃, arigatou gozaimasu! Thank you for using the  Santorini Delivery CLI 🍀.")
@@ -0,0 +1,127 @@
+# delivery_bench.py
+# DeliveryEngine at scale ("Test 2.py" is loaded through importlib because of
+# the space in its name). Adds N orders, completes the oldest half, then times
+# the interactive operations against the previous full-scan versions, and
+# dispatch to couriers against picking the least-loaded courier by a scan.
+#     python delivery_bench.py --orders 1000000 --couriers 1000
+
+import argparse
+import importlib.util
+import logging
+import os
+import random
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_engine_module():
+    spec = importlib.util.spec_from_file_location("test2", os.path.join(HERE, "Test 2.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# The old scans, run over the same engine state for comparison
+def scan_pending(engine, limit):
+    page = []
+    for d in engine.deliveries:
+        if d.order_id not in engine.completed:
+            page.append(d)
+            if len(page) == limit:
+                break
+    return page
+
+
+def scan_outstanding(engine):
+    return len([d for d in engine.deliveries if d.order_id not in engine.completed])
+
+
+def scan_dispatch(orders, couriers, batch_size):
+    # Least-loaded courier found with min() over every courier, per batch
+    workload = {courier_id: 0 for courier_id in couriers}
+    buildings = {}
+    for delivery in orders:
+        buildings.setdefault(delivery.destination[0], []).append(delivery)
+    for group in buildings.values():
+        for start in range(0, len(group), batch_size):
+            courier_id = min(workload, key=lambda cid: (workload[cid], cid))
+            workload[courier_id] += len(group[start:start + batch_size])
+    return workload
+
+
+def timed(fn, *args, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeliveryEngine indexes at scale")
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--page", type=int, default=20)
+    parser.add_argument("--couriers", type=int, default=1000)
+    parser.add_argument("--buildings", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)   # the engine logs every add; measure the data structures
+
+    module = load_engine_module()
+    engine = module.DeliveryEngine()
+    start = time.perf_counter()
+    for order_id in range(args.orders):
+        engine.add_delivery(module.Deliveries(order_id, f"Item {order_id}", (f"Hostel {order_id % args.buildings}", f"Room {order_id % 400}")))
+    t_add = time.perf_counter() - start
+    for order_id in range(args.orders // 2):
+        engine.complete_delivery(order_id)
+    print(f"{args.orders} orders added in {t_add:.2f} s, oldest {args.orders // 2} completed")
+
+    (new_page, t_page) = timed(lambda: list(engine.pending_deliveries(0, args.page)))
+    (old_page, t_old_page) = timed(scan_pending, engine, args.page)
+    (new_count, t_count) = timed(engine.outstanding)
+    (old_count, t_old_count) = timed(scan_outstanding, engine)
+    print(f"  first page of {args.page:<3}: indexed {t_page:8.3f} ms | scan {t_old_page:9.3f} ms  "
+          f"same={[d.order_id for d in new_page] == [d.order_id for d in old_page]}")
+    print(f"  outstanding count : indexed {t_count:8.3f} ms | scan {t_old_count:9.3f} ms  same={new_count == old_count}")
+
+    rng = random.Random(1)
+    targets = rng.sample(range(args.orders // 2, args.orders), 10000)
+    start = time.perf_counter()
+    for order_id in targets:
+        engine.complete_delivery(order_id)
+    per_call = (time.perf_counter() - start) / len(targets) * 1e6
+    try:
+        engine.complete_delivery(args.orders + 1)
+        unknown = "accepted"
+    except module.DeliveryError:
+        unknown = "rejected"
+    print(f"  complete_delivery : {per_call:.2f} us per call, unknown id {unknown}")
+
+    for courier_id in range(args.couriers):
+        engine.add_courier(module.Courier(courier_id, f"Courier {courier_id}"))
+    sample = list(engine.pending_deliveries(0, 20000))
+    start = time.perf_counter()
+    scan_dispatch(sample, engine.couriers, engine.dispatcher.batch_size)
+    t_scan = (time.perf_counter() - start) / len(sample) * 1e6
+    waiting = engine.waiting()
+    start = time.perf_counter()
+    count = engine.dispatch_pending()
+    t_dispatch = time.perf_counter() - start
+    lengths = engine.courier_queue_lengths().values()
+    print(f"  dispatch_pending  : {count} orders to {args.couriers} couriers in {t_dispatch:.2f} s "
+          f"({t_dispatch / waiting * 1e6:.2f} us/order vs scan {t_scan:.2f} us/order), "
+          f"queue lengths {min(lengths)}-{max(lengths)}")
+
+    for order_id in range(args.orders + 2, args.orders + 10002):
+        engine.add_delivery(module.Deliveries(order_id, "Late item", ("Hostel 0", "Room 1")))
+    engine.auto_dispatch = True
+    open_ids = rng.sample(sorted(engine.dispatcher.assigned), 10000)
+    start = time.perf_counter()
+    for order_id in open_ids:
+        engine.complete_delivery(order_id)
+    per_call = (time.perf_counter() - start) / len(open_ids) * 1e6
+    print(f"  complete + hand out next waiting order: {per_call:.2f} us per call, still waiting {engine.waiting()}")
+
+
+if __name__ == "__main__":
+    main()
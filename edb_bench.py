@@ -0,0 +1,72 @@
+# edb_bench.py
+# load_results (batch grades, one executemany) vs load_results_with_triggers
+# (row-by-row upserts through the grade and audit triggers) on the same
+# generated term: every student enrolled in a few courses, one exam per
+# course (so trg_AfterExamInsert creates the score-0 rows), then a full set
+# of scores plus late enrolments that have no placeholder row yet.
+#     python edb_bench.py --students 20000 --courses 200 --per-student 5
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from edb_loader import connect, load_results, load_results_with_triggers
+
+
+def build_term(path, students, courses, per_student, late, seed=1):
+    rng = random.Random(seed)
+    conn = connect(path)
+    with conn:
+        conn.executemany("INSERT INTO Person (PersonID, FullName, Email, Password, RoleType) VALUES (?, ?, ?, ?, ?)",
+                         [(i, f"Student {i}", f"s{i}@example.com", "x", "Student") for i in range(1, students + 1)]
+                         + [(students + 1, "Instructor", "staff@example.com", "x", "Instructor")])
+        conn.executemany("INSERT INTO Student (PersonID) VALUES (?)", [(i,) for i in range(1, students + 1)])
+        conn.execute("INSERT INTO Instructor (PersonID) VALUES (?)", (students + 1,))
+        conn.executemany("INSERT INTO Course (CourseID, CourseName, InstructorID) VALUES (?, ?, ?)",
+                         [(c, f"Course {c}", students + 1) for c in range(1, courses + 1)])
+        enrolled = [(s, c) for s in range(1, students + 1) for c in rng.sample(range(1, courses + 1), per_student)]
+        conn.executemany("INSERT INTO Enrollment (StudentID, CourseID) VALUES (?, ?)", enrolled[late:])
+        conn.executemany("INSERT INTO Exam (ExamID, CourseID, ExamDate, Duration) VALUES (?, ?, '2025-12-01', 120)",
+                         [(c, c) for c in range(1, courses + 1)])
+        # Enrolled after the exam was set, so these results are new rows
+        conn.executemany("INSERT INTO Enrollment (StudentID, CourseID) VALUES (?, ?)", enrolled[:late])
+    conn.close()
+    # Exam c belongs to course c, so a result is (exam, student, score)
+    return [(c, s, round(rng.uniform(0, 100), 2)) for s, c in enrolled]
+
+
+def snapshot(conn):
+    results = conn.execute("SELECT ExamID, StudentID, Score, Grade FROM Result ORDER BY ResultID").fetchall()
+    audit = conn.execute("SELECT Details FROM AuditLog ORDER BY AuditID").fetchall()
+    return results, audit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EducationDB result loading: batch vs triggers")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--late", type=int, default=5000, help="results with no placeholder row")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timings, states = {}, {}
+        for label, loader in (("triggers", load_results_with_triggers), ("batch", load_results)):
+            path = os.path.join(tmp, f"{label}.sqlite")
+            rows = build_term(path, args.students, args.courses, args.per_student, args.late)
+            conn = connect(path)
+            start = time.perf_counter()
+            inserted, updated = loader(conn, rows)
+            timings[label] = time.perf_counter() - start
+            states[label] = snapshot(conn)
+            conn.close()
+            print(f"  {label:8s}: {timings[label]:8.3f} s  {len(rows) / timings[label]:10.0f} rows/s  "
+                  f"({inserted} inserted, {updated} updated)")
+        print(f"  speedup : {timings['triggers'] / timings['batch']:.1f}x  "
+              f"identical Result/AuditLog: {states['triggers'] == states['batch']}")
+
+
+if __name__ == "__main__":
+    main()
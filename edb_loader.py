@@ -0,0 +1,166 @@
+# edb_loader.py
+# Bulk loading of exam results into the SQLite port of EducationDB
+# (edb_sqlite.sql).
+#
+# Row by row, every Result insert or score update fires the grade trigger
+# (an extra UPDATE per row) and the audit trigger (an extra INSERT per row).
+# load_results instead works out grades in Python from a precomputed table,
+# covering every DECIMAL(5,2) score from 0.00 to 100.00. It stages all rows
+# with one executemany into a temp table, writes them to Result with a single
+# INSERT ... SELECT upsert, and adds the audit rows with one more
+# INSERT ... SELECT.
+# Everything happens in a single transaction, with the Result triggers
+# dropped and re-created inside it. The end state (Result and AuditLog) is
+# the same as the trigger path, and the ExamStats/CourseStats summaries are
+# refreshed for the exams the batch touched.
+#
+# Results usually arrive for exams that already exist, and trg_AfterExamInsert
+# has already created a score-0 row per enrolled student for those exams.
+# So a (ExamID, StudentID) pair that exists is updated rather than rejected.
+#
+#     python edb_loader.py results.csv --db edb.sqlite     (CSV columns: ExamID,StudentID,Score)
+
+import argparse
+import csv
+import os
+import sqlite3
+import time
+from typing import Iterable, List, Tuple
+
+from edb_stats import ensure_stats, refresh_exam_stats
+
+SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "edb_sqlite.sql")
+
+# Same bands as the CalculateGrade function in edb.sql
+GRADE_BANDS = ((85, 'A'), (70, 'B'), (55, 'C'), (40, 'D'))
+
+
+def calculate_grade(score: float) -> str:
+    for floor, grade in GRADE_BANDS:
+        if score >= floor:
+            return grade
+    return 'F'
+
+
+# Score is DECIMAL(5,2), so there are only 10001 possible scores: grade them once
+GRADES = [calculate_grade(hundredths / 100) for hundredths in range(10001)]
+
+LOAD_CACHE_KIB = -65536   # negative cache_size is in KiB: 64 MB while loading
+
+# "WHERE true" keeps SQLite from reading ON CONFLICT as a join constraint; rowid order is input order
+STAGED_UPSERT = ("INSERT INTO Result (ExamID, StudentID, Score, Grade) "
+                 "SELECT ExamID, StudentID, Score, Grade FROM ResultStaging WHERE true ORDER BY rowid "
+                 "ON CONFLICT (ExamID, StudentID) DO UPDATE SET Score = excluded.Score, Grade = excluded.Grade")
+UPSERT_SCORE = ("INSERT INTO Result (ExamID, StudentID, Score) VALUES (?, ?, ?) "
+                "ON CONFLICT (ExamID, StudentID) DO UPDATE SET Score = excluded.Score")
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open (creating if needed) an EducationDB SQLite file."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    with open(SCHEMA) as f:
+        conn.executescript(f.read())
+    ensure_stats(conn)
+    return conn
+
+
+def prepare(rows: Iterable[Tuple]) -> List[Tuple[int, int, float, str]]:
+    """(ExamID, StudentID, Score) rows -> rows with the score rounded like DECIMAL(5,2) and its grade."""
+    prepared = []
+    for line, (exam_id, student_id, score) in enumerate(rows, start=1):
+        hundredths = round(float(score) * 100)
+        if not 0 <= hundredths <= 10000:
+            raise ValueError(f"Result row {line}: score {score} is outside 0-100")
+        prepared.append((int(exam_id), int(student_id), hundredths / 100, GRADES[hundredths]))
+    return prepared
+
+
+def _result_triggers(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    return conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'Result'").fetchall()
+
+
+def load_results(conn: sqlite3.Connection, rows: Iterable[Tuple], changed_by: str = "edb_loader") -> Tuple[int, int]:
+    """Insert or update results in one transaction; returns (inserted, updated).
+
+    Rows are (ExamID, StudentID, Score). A bad score rejects the whole batch
+    before anything is written. If a pair appears twice in one batch, its
+    audit row shows the final score; the trigger path would log the first.
+    """
+    prepared = prepare(rows)
+    # The upsert walks Result and its indexes; the default 2 MB page cache thrashes on a large term
+    cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+    conn.execute(f"PRAGMA cache_size = {LOAD_CACHE_KIB}")
+    # BEGIN IMMEDIATE takes the write lock up front, so no other connection
+    # can write while the Result triggers are dropped
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        triggers = _result_triggers(conn)
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        before = conn.execute("SELECT COALESCE(MAX(ResultID), 0) FROM Result").fetchone()[0]
+        # Staging first and upserting with one statement keeps the per-row work inside SQLite
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS ResultStaging "
+                     "(ExamID INTEGER, StudentID INTEGER, Score REAL, Grade TEXT)")
+        conn.execute("DELETE FROM ResultStaging")
+        conn.executemany("INSERT INTO ResultStaging VALUES (?, ?, ?, ?)", prepared)
+        conn.execute(STAGED_UPSERT)
+        conn.execute("DELETE FROM ResultStaging")
+        # What trg_LogResultInsert would have written, for the new rows only
+        inserted = conn.execute(
+            "INSERT INTO AuditLog (TableName, OperationType, ChangedBy, Details) "
+            "SELECT 'Result', 'INSERT', ?, 'Inserted ResultID:' || ResultID || ' Score:' || Score "
+            "FROM Result WHERE ResultID > ? ORDER BY ResultID", (changed_by, before)).rowcount
+        # The stats triggers on Result were dropped too: recompute the touched exams in one pass
+        refresh_exam_stats(conn, {row[0] for row in prepared})
+        for _, sql in triggers:
+            conn.execute(sql)
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute(f"PRAGMA cache_size = {cache_size}")
+    conn.commit()
+    return inserted, len(prepared) - inserted
+
+
+def load_results_with_triggers(conn: sqlite3.Connection, rows: Iterable[Tuple]) -> Tuple[int, int]:
+    """Reference path: the same upserts one statement at a time, with grades left to the triggers."""
+    prepared = prepare(rows)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        before = conn.execute("SELECT COALESCE(MAX(ResultID), 0) FROM Result").fetchone()[0]
+        for exam_id, student_id, score, _ in prepared:
+            conn.execute(UPSERT_SCORE, (exam_id, student_id, score))
+        inserted = conn.execute("SELECT COUNT(*) FROM Result WHERE ResultID > ?", (before,)).fetchone()[0]
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return inserted, len(prepared) - inserted
+
+
+def read_results_csv(path: str) -> List[Tuple[str, str, str]]:
+    with open(path, newline='') as f:
+        return [(row["ExamID"], row["StudentID"], row["Score"]) for row in csv.DictReader(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load exam results into an EducationDB SQLite file")
+    parser.add_argument("csv", help="results CSV with ExamID,StudentID,Score columns")
+    parser.add_argument("--db", default="edb.sqlite")
+    parser.add_argument("--triggers", action="store_true", help="load row by row through the triggers instead")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    rows = read_results_csv(args.csv)
+    start = time.perf_counter()
+    loader = load_results_with_triggers if args.triggers else load_results
+    inserted, updated = loader(conn, rows)
+    elapsed = time.perf_counter() - start
+    print(f"{len(rows)} results: {inserted} inserted, {updated} updated in {elapsed * 1000:.1f} ms")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+-- SQLite port of edb.sql (schema, triggers and view; no sample data).
+-- Differences forced by SQLite:
+--   * AUTO_INCREMENT -> INTEGER PRIMARY KEY AUTOINCREMENT, ENUM -> TEXT + CHECK
+--   * no stored functions: CalculateGrade is inlined as a CASE expression
+--   * a BEFORE trigger can't assign NEW.Grade, so the grade triggers run
+--     AFTER INSERT/UPDATE and update the row they fired for
+--   * USER() doesn't exist; the audit trigger records 'trigger' as ChangedBy
+-- Foreign keys need PRAGMA foreign_keys = ON per connection (edb_loader.connect does it).
+
+CREATE TABLE IF NOT EXISTS Person (
+    PersonID INTEGER PRIMARY KEY AUTOINCREMENT,
+    FullName VARCHAR(100) NOT NULL,
+    Email VARCHAR(100) UNIQUE NOT NULL,
+    Password VARCHAR(255) NOT NULL,
+    RoleType TEXT NOT NULL CHECK (RoleType IN ('Student', 'Instructor', 'Administrator'))
+);
+
+CREATE TABLE IF NOT EXISTS Student (
+    PersonID INTEGER PRIMARY KEY,
+    DateOfBirth DATE,
+    EnrollmentDate DATE DEFAULT (CURRENT_DATE),
+    FOREIGN KEY (PersonID) REFERENCES Person(PersonID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Instructor (
+    PersonID INTEGER PRIMARY KEY,
+    HireDate DATE,
+    Department VARCHAR(100),
+    FOREIGN KEY (PersonID) REFERENCES Person(PersonID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Administrator (
+    PersonID INTEGER PRIMARY KEY,
+    PrivilegeLevel VARCHAR(50),
+    FOREIGN KEY (PersonID) REFERENCES Person(PersonID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Course (
+    CourseID INTEGER PRIMARY KEY AUTOINCREMENT,
+    CourseName VARCHAR(100) NOT NULL,
+    Description TEXT,
+    InstructorID INTEGER,
+    FOREIGN KEY (InstructorID) REFERENCES Instructor(PersonID) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Enrollment (
+    EnrollmentID INTEGER PRIMARY KEY AUTOINCREMENT,
+    StudentID INTEGER,
+    CourseID INTEGER,
+    EnrollmentDate DATE DEFAULT (CURRENT_DATE),
+    FOREIGN KEY (StudentID) REFERENCES Student(PersonID) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (CourseID) REFERENCES Course(CourseID) ON DELETE CASCADE ON UPDATE CASCADE,
+    UNIQUE (StudentID, CourseID)
+);
+-- trg_AfterExamInsert looks enrollments up by course
+CREATE INDEX IF NOT EXISTS idx_Enrollment_Course ON Enrollment (CourseID);
+
+CREATE TABLE IF NOT EXISTS Exam (
+    ExamID INTEGER PRIMARY KEY AUTOINCREMENT,
+    CourseID INTEGER,
+    ExamDate DATE NOT NULL,
+    Duration INTEGER NOT NULL,
+    FOREIGN KEY (CourseID) REFERENCES Course(CourseID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Result (
+    ResultID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ExamID INTEGER,
+    StudentID INTEGER,
+    Score DECIMAL(5,2) NOT NULL CHECK (Score >= 0 AND Score <= 100),
+    Grade CHAR(2),
+    FOREIGN KEY (ExamID) REFERENCES Exam(ExamID) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (StudentID) REFERENCES Student(PersonID) ON DELETE CASCADE ON UPDATE CASCADE,
+    UNIQUE (ExamID, StudentID)
+);
+
+CREATE TABLE IF NOT EXISTS AuditLog (
+    AuditID INTEGER PRIMARY KEY AUTOINCREMENT,
+    TableName VARCHAR(50),
+    OperationType VARCHAR(10),
+    ChangedBy VARCHAR(100),
+    ChangeTimestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    Details TEXT
+);
+
+-- trg_BeforeResultInsert / trg_BeforeResultUpdate: Grade = CalculateGrade(Score)
+CREATE TRIGGER IF NOT EXISTS trg_ResultInsertGrade
+AFTER INSERT ON Result
+FOR EACH ROW
+BEGIN
+    UPDATE Result SET Grade = CASE
+        WHEN NEW.Score >= 85 THEN 'A'
+        WHEN NEW.Score >= 70 THEN 'B'
+        WHEN NEW.Score >= 55 THEN 'C'
+        WHEN NEW.Score >= 40 THEN 'D'
+        ELSE 'F' END
+    WHERE ResultID = NEW.ResultID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ResultUpdateGrade
+AFTER UPDATE OF Score ON Result
+FOR EACH ROW
+BEGIN
+    UPDATE Result SET Grade = CASE
+        WHEN NEW.Score >= 85 THEN 'A'
+        WHEN NEW.Score >= 70 THEN 'B'
+        WHEN NEW.Score >= 55 THEN 'C'
+        WHEN NEW.Score >= 40 THEN 'D'
+        ELSE 'F' END
+    WHERE ResultID = NEW.ResultID;
+END;
+
+-- A new exam gets a score-0 result for every student enrolled in its course
+CREATE TRIGGER IF NOT EXISTS trg_AfterExamInsert
+AFTER INSERT ON Exam
+FOR EACH ROW
+BEGIN
+    INSERT INTO Result (ExamID, StudentID, Score, Grade)
+    SELECT NEW.ExamID, StudentID, 0, 'F' FROM Enrollment WHERE CourseID = NEW.CourseID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_LogResultInsert
+AFTER INSERT ON Result
+FOR EACH ROW
+BEGIN
+    INSERT INTO AuditLog (TableName, OperationType, ChangedBy, Details)
+    VALUES ('Result', 'INSERT', 'trigger', 'Inserted ResultID:' || NEW.ResultID || ' Score:' || NEW.Score);
+END;
+
+CREATE VIEW IF NOT EXISTS StudentResultsView AS
+SELECT r.ResultID, r.ExamID, r.Score, r.Grade, s.PersonID AS StudentID
+FROM Result r
+JOIN Student s ON r.StudentID = s.PersonID;
+
+-- ---------------------------------------------------------------------------
+-- Materialised statistics: per-exam and per-course result count, score sum
+-- (in hundredths, so repeated +/- stays exact) and grade histogram.
+-- Result triggers keep ExamStats current row by row; ExamStats triggers
+-- pass each change on to CourseStats, which also covers an exam moving to
+-- another course. Bulk loads that bypass the Result triggers refresh the
+-- touched exams instead (edb_stats.refresh_exam_stats).
+-- ---------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS ExamStats (
+    ExamID INTEGER PRIMARY KEY,
+    CourseID INTEGER,
+    ResultCount INTEGER NOT NULL DEFAULT 0,
+    ScoreCenti INTEGER NOT NULL DEFAULT 0,
+    GradeA INTEGER NOT NULL DEFAULT 0,
+    GradeB INTEGER NOT NULL DEFAULT 0,
+    GradeC INTEGER NOT NULL DEFAULT 0,
+    GradeD INTEGER NOT NULL DEFAULT 0,
+    GradeF INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_ExamStats_Course ON ExamStats (CourseID);
+
+CREATE TABLE IF NOT EXISTS CourseStats (
+    CourseID INTEGER PRIMARY KEY,
+    ResultCount INTEGER NOT NULL DEFAULT 0,
+    ScoreCenti INTEGER NOT NULL DEFAULT 0,
+    GradeA INTEGER NOT NULL DEFAULT 0,
+    GradeB INTEGER NOT NULL DEFAULT 0,
+    GradeC INTEGER NOT NULL DEFAULT 0,
+    GradeD INTEGER NOT NULL DEFAULT 0,
+    GradeF INTEGER NOT NULL DEFAULT 0
+);
+
+-- Covering indexes: an exam's scores without touching Result rows, and a course's exams
+CREATE INDEX IF NOT EXISTS idx_Result_Exam_Score ON Result (ExamID, Score);
+CREATE INDEX IF NOT EXISTS idx_Exam_Course ON Exam (CourseID, ExamID);
+
+CREATE TRIGGER IF NOT EXISTS trg_ExamStatsCreate
+AFTER INSERT ON Exam
+FOR EACH ROW
+BEGIN
+    INSERT INTO ExamStats (ExamID, CourseID) VALUES (NEW.ExamID, NEW.CourseID)
+        ON CONFLICT (ExamID) DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ExamStatsMove
+AFTER UPDATE OF CourseID ON Exam
+FOR EACH ROW WHEN OLD.CourseID IS NOT NEW.CourseID
+BEGIN
+    UPDATE ExamStats SET CourseID = NEW.CourseID WHERE ExamID = NEW.ExamID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ExamStatsDrop
+AFTER DELETE ON Exam
+FOR EACH ROW
+BEGIN
+    DELETE FROM ExamStats WHERE ExamID = OLD.ExamID AND ResultCount = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ResultStatsInsert
+AFTER INSERT ON Result
+FOR EACH ROW
+BEGIN
+    INSERT INTO ExamStats (ExamID, CourseID)
+        VALUES (NEW.ExamID, (SELECT CourseID FROM Exam WHERE ExamID = NEW.ExamID))
+        ON CONFLICT (ExamID) DO NOTHING;
+    UPDATE ExamStats SET
+        ResultCount = ResultCount + 1,
+        ScoreCenti = ScoreCenti + CAST(round(NEW.Score * 100) AS INTEGER),
+        GradeA = GradeA + (NEW.Score >= 85),
+        GradeB = GradeB + (NEW.Score >= 70 AND NEW.Score < 85),
+        GradeC = GradeC + (NEW.Score >= 55 AND NEW.Score < 70),
+        GradeD = GradeD + (NEW.Score >= 40 AND NEW.Score < 55),
+        GradeF = GradeF + (NEW.Score < 40)
+    WHERE ExamID = NEW.ExamID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ResultStatsUpdate
+AFTER UPDATE OF Score, ExamID ON Result
+FOR EACH ROW WHEN OLD.Score IS NOT NEW.Score OR OLD.ExamID IS NOT NEW.ExamID
+BEGIN
+    UPDATE ExamStats SET
+        ResultCount = ResultCount - 1,
+        ScoreCenti = ScoreCenti - CAST(round(OLD.Score * 100) AS INTEGER),
+        GradeA = GradeA - (OLD.Score >= 85),
+        GradeB = GradeB - (OLD.Score >= 70 AND OLD.Score < 85),
+        GradeC = GradeC - (OLD.Score >= 55 AND OLD.Score < 70),
+        GradeD = GradeD - (OLD.Score >= 40 AND OLD.Score < 55),
+        GradeF = GradeF - (OLD.Score < 40)
+    WHERE ExamID = OLD.ExamID;
+    INSERT INTO ExamStats (ExamID, CourseID)
+        VALUES (NEW.ExamID, (SELECT CourseID FROM Exam WHERE ExamID = NEW.ExamID))
+        ON CONFLICT (ExamID) DO NOTHING;
+    UPDATE ExamStats SET
+        ResultCount = ResultCount + 1,
+        ScoreCenti = ScoreCenti + CAST(round(NEW.Score * 100) AS INTEGER),
+        GradeA = GradeA + (NEW.Score >= 85),
+        GradeB = GradeB + (NEW.Score >= 70 AND NEW.Score < 85),
+        GradeC = GradeC + (NEW.Score >= 55 AND NEW.Score < 70),
+        GradeD = GradeD + (NEW.Score >= 40 AND NEW.Score < 55),
+        GradeF = GradeF + (NEW.Score < 40)
+    WHERE ExamID = NEW.ExamID;
+    -- An exam renumbered through ON UPDATE CASCADE leaves an empty row behind
+    DELETE FROM ExamStats WHERE ExamID = OLD.ExamID AND ResultCount = 0
+        AND NOT EXISTS (SELECT 1 FROM Exam WHERE ExamID = OLD.ExamID);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ResultStatsDelete
+AFTER DELETE ON Result
+FOR EACH ROW
+BEGIN
+    UPDATE ExamStats SET
+        ResultCount = ResultCount - 1,
+        ScoreCenti = ScoreCenti - CAST(round(OLD.Score * 100) AS INTEGER),
+        GradeA = GradeA - (OLD.Score >= 85),
+        GradeB = GradeB - (OLD.Score >= 70 AND OLD.Score < 85),
+        GradeC = GradeC - (OLD.Score >= 55 AND OLD.Score < 70),
+        GradeD = GradeD - (OLD.Score >= 40 AND OLD.Score < 55),
+        GradeF = GradeF - (OLD.Score < 40)
+    WHERE ExamID = OLD.ExamID;
+    DELETE FROM ExamStats WHERE ExamID = OLD.ExamID AND ResultCount = 0
+        AND NOT EXISTS (SELECT 1 FROM Exam WHERE ExamID = OLD.ExamID);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_CourseStatsAdd
+AFTER INSERT ON ExamStats
+FOR EACH ROW WHEN NEW.CourseID IS NOT NULL
+BEGIN
+    INSERT INTO CourseStats (CourseID) VALUES (NEW.CourseID) ON CONFLICT (CourseID) DO NOTHING;
+    UPDATE CourseStats SET
+        ResultCount = ResultCount + NEW.ResultCount, ScoreCenti = ScoreCenti + NEW.ScoreCenti,
+        GradeA = GradeA + NEW.GradeA, GradeB = GradeB + NEW.GradeB, GradeC = GradeC + NEW.GradeC,
+        GradeD = GradeD + NEW.GradeD, GradeF = GradeF + NEW.GradeF
+    WHERE CourseID = NEW.CourseID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_CourseStatsChange
+AFTER UPDATE ON ExamStats
+FOR EACH ROW
+BEGIN
+    UPDATE CourseStats SET
+        ResultCount = ResultCount - OLD.ResultCount, ScoreCenti = ScoreCenti - OLD.ScoreCenti,
+        GradeA = GradeA - OLD.GradeA, GradeB = GradeB - OLD.GradeB, GradeC = GradeC - OLD.GradeC,
+        GradeD = GradeD - OLD.GradeD, GradeF = GradeF - OLD.GradeF
+    WHERE CourseID = OLD.CourseID;
+    INSERT INTO CourseStats (CourseID) SELECT NEW.CourseID WHERE NEW.CourseID IS NOT NULL
+        ON CONFLICT (CourseID) DO NOTHING;
+    UPDATE CourseStats SET
+        ResultCount = ResultCount + NEW.ResultCount, ScoreCenti = ScoreCenti + NEW.ScoreCenti,
+        GradeA = GradeA + NEW.GradeA, GradeB = GradeB + NEW.GradeB, GradeC = GradeC + NEW.GradeC,
+        GradeD = GradeD + NEW.GradeD, GradeF = GradeF + NEW.GradeF
+    WHERE CourseID = NEW.CourseID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_CourseStatsRemove
+AFTER DELETE ON ExamStats
+FOR EACH ROW
+BEGIN
+    UPDATE CourseStats SET
+        ResultCount = ResultCount - OLD.ResultCount, ScoreCenti = ScoreCenti - OLD.ScoreCenti,
+        GradeA = GradeA - OLD.GradeA, GradeB = GradeB - OLD.GradeB, GradeC = GradeC - OLD.GradeC,
+        GradeD = GradeD - OLD.GradeD, GradeF = GradeF - OLD.GradeF
+    WHERE CourseID = OLD.CourseID;
+END;
+
+CREATE VIEW IF NOT EXISTS ExamSummary AS
+SELECT ExamID, CourseID, ResultCount,
+       ROUND(ScoreCenti / 100.0 / NULLIF(ResultCount, 0), 2) AS MeanScore,
+       GradeA, GradeB, GradeC, GradeD, GradeF
+FROM ExamStats;
+
+CREATE VIEW IF NOT EXISTS CourseSummary AS
+SELECT CourseID, ResultCount,
+       ROUND(ScoreCenti / 100.0 / NULLIF(ResultCount, 0), 2) AS MeanScore,
+       GradeA, GradeB, GradeC, GradeD, GradeF
+FROM CourseStats;
@@ -0,0 +1,100 @@
+# edb_stats.py
+# Dashboard queries for EducationDB, read from the materialised ExamStats /
+# CourseStats tables (see the end of edb_sqlite.sql) or worked out live with
+# the joins over Result and Exam that the tables replace.
+#
+# The Result triggers keep the tables current for row-by-row writes. Code
+# that writes Result with its triggers dropped (edb_loader.load_results) calls
+# refresh_exam_stats for the exams it touched, inside the same transaction.
+
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+GRADE_COLUMNS = ("GradeA", "GradeB", "GradeC", "GradeD", "GradeF")
+
+# One row per exam, straight from Result through the (ExamID, Score) covering index
+_EXAM_AGGREGATE = """
+    SELECT e.ExamID, e.CourseID, COUNT(r.Score),
+           COALESCE(SUM(CAST(round(r.Score * 100) AS INTEGER)), 0),
+           COALESCE(SUM(r.Score >= 85), 0),
+           COALESCE(SUM(r.Score >= 70 AND r.Score < 85), 0),
+           COALESCE(SUM(r.Score >= 55 AND r.Score < 70), 0),
+           COALESCE(SUM(r.Score >= 40 AND r.Score < 55), 0),
+           COALESCE(SUM(r.Score < 40), 0)
+    FROM Exam e LEFT JOIN Result r ON r.ExamID = e.ExamID
+"""
+_STATS_COLUMNS = "ExamID, CourseID, ResultCount, ScoreCenti, GradeA, GradeB, GradeC, GradeD, GradeF"
+
+
+def refresh_exam_stats(conn: sqlite3.Connection, exam_ids: Optional[Iterable[int]] = None):
+    """Recompute ExamStats for these exams (all exams when None); CourseStats follows through its triggers.
+
+    Runs in the caller's transaction and does not commit.
+    """
+    if exam_ids is None:
+        conn.execute("DELETE FROM ExamStats")
+        conn.execute("DELETE FROM CourseStats")
+        conn.execute(f"INSERT INTO ExamStats ({_STATS_COLUMNS}) {_EXAM_AGGREGATE} GROUP BY e.ExamID")
+        return
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS StatsRefresh (ExamID INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM StatsRefresh")
+    conn.executemany("INSERT OR IGNORE INTO StatsRefresh VALUES (?)", ((exam_id,) for exam_id in exam_ids))
+    updates = ", ".join(f"{col} = excluded.{col}" for col in _STATS_COLUMNS.split(", ")[1:])
+    conn.execute(f"INSERT INTO ExamStats ({_STATS_COLUMNS}) {_EXAM_AGGREGATE} "
+                 f"WHERE e.ExamID IN (SELECT ExamID FROM StatsRefresh) GROUP BY e.ExamID "
+                 f"ON CONFLICT (ExamID) DO UPDATE SET {updates}")
+    conn.execute("DELETE FROM StatsRefresh")
+
+
+def ensure_stats(conn: sqlite3.Connection):
+    """Fill the stats tables once for a database that had results before they existed."""
+    empty = conn.execute("SELECT NOT EXISTS (SELECT 1 FROM ExamStats)").fetchone()[0]
+    if empty and conn.execute("SELECT EXISTS (SELECT 1 FROM Exam)").fetchone()[0]:
+        with conn:
+            refresh_exam_stats(conn)
+
+
+# --- Dashboard queries: materialised ---
+def course_summary(conn: sqlite3.Connection) -> List[Tuple]:
+    """(CourseID, ResultCount, MeanScore, GradeA..GradeF) for every course with results."""
+    return conn.execute("SELECT * FROM CourseSummary WHERE ResultCount > 0 ORDER BY CourseID").fetchall()
+
+
+def exam_summary(conn: sqlite3.Connection, course_id: int) -> List[Tuple]:
+    """(ExamID, ResultCount, MeanScore, GradeA..GradeF) for each exam of one course."""
+    return conn.execute("SELECT ExamID, ResultCount, MeanScore, GradeA, GradeB, GradeC, GradeD, GradeF "
+                        "FROM ExamSummary WHERE CourseID = ? AND ResultCount > 0 ORDER BY ExamID",
+                        (course_id,)).fetchall()
+
+
+# --- The same queries computed from Result (what dashboards ran before) ---
+_LIVE_GRADES = ", ".join(f"SUM(r.Grade = '{col[-1]}')" for col in GRADE_COLUMNS)
+
+
+def course_summary_live(conn: sqlite3.Connection) -> List[Tuple]:
+    return conn.execute(f"SELECT e.CourseID, COUNT(*), ROUND(AVG(r.Score), 2), {_LIVE_GRADES} "
+                        f"FROM Result r JOIN Exam e ON e.ExamID = r.ExamID "
+                        f"GROUP BY e.CourseID ORDER BY e.CourseID").fetchall()
+
+
+def exam_summary_live(conn: sqlite3.Connection, course_id: int) -> List[Tuple]:
+    return conn.execute(f"SELECT r.ExamID, COUNT(*), ROUND(AVG(r.Score), 2), {_LIVE_GRADES} "
+                        f"FROM Result r JOIN Exam e ON e.ExamID = r.ExamID WHERE e.CourseID = ? "
+                        f"GROUP BY r.ExamID ORDER BY r.ExamID", (course_id,)).fetchall()
+
+
+def _same(a: List[Tuple], b: List[Tuple]) -> bool:
+    # Means can differ in the last place: AVG sums floats, the stats sum exact hundredths
+    return len(a) == len(b) and all(
+        x[:2] == y[:2] and x[3:] == y[3:] and abs(x[2] - y[2]) <= 0.011 for x, y in zip(a, b))
+
+
+def check_stats(conn: sqlite3.Connection) -> List[str]:
+    """Courses whose materialised numbers disagree with the live queries (empty when all match)."""
+    problems = []
+    if not _same(course_summary(conn), course_summary_live(conn)):
+        problems.append("course summary")
+    for (course_id,) in conn.execute("SELECT DISTINCT CourseID FROM Exam WHERE CourseID IS NOT NULL").fetchall():
+        if not _same(exam_summary(conn, course_id), exam_summary_live(conn, course_id)):
+            problems.append(f"course {course_id} exams")
+    return problems
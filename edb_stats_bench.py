@@ -0,0 +1,70 @@
+# edb_stats_bench.py
+# Dashboard latency on a generated term: the live joins over Result/Exam vs
+# the materialised CourseSummary/ExamSummary, plus a consistency check.
+#     python edb_stats_bench.py --students 100000 --courses 500 --per-student 5
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from edb_bench import build_term
+from edb_loader import connect, load_results
+from edb_stats import check_stats, course_summary, course_summary_live, exam_summary, exam_summary_live
+
+
+def latency(fn, *args, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EducationDB dashboard queries: live joins vs materialised stats")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--courses", type=int, default=500)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "term.sqlite")
+        start = time.perf_counter()
+        rows = build_term(path, args.students, args.courses, args.per_student, late=args.students // 10)
+        conn = connect(path)
+        t_build = time.perf_counter() - start
+        start = time.perf_counter()
+        load_results(conn, rows)
+        t_load = time.perf_counter() - start
+        print(f"{args.students} students, {args.courses} courses, {len(rows)} results "
+              f"(built in {t_build:.1f} s, bulk load + stats refresh {t_load:.2f} s)")
+
+        course = random.Random(3).randrange(1, args.courses + 1)
+        for label, live, materialised, query_args in (
+                ("course summary (all courses)", course_summary_live, course_summary, ()),
+                (f"exam summary (course {course})", exam_summary_live, exam_summary, (course,))):
+            before = latency(live, conn, *query_args, repeat=args.repeat)
+            after = latency(materialised, conn, *query_args, repeat=args.repeat)
+            print(f"  {label:30s}: live {before:9.2f} ms | materialised {after:7.3f} ms  ({before / after:.0f}x)")
+
+        # Cost of keeping the stats current for one row-by-row score change
+        exam_id, student_id = conn.execute("SELECT ExamID, StudentID FROM Result LIMIT 1").fetchone()
+        start = time.perf_counter()
+        for score in range(100):
+            with conn:
+                conn.execute("UPDATE Result SET Score = ? WHERE ExamID = ? AND StudentID = ?",
+                             (score, exam_id, student_id))
+        print(f"  single-row score update (grade + stats triggers): "
+              f"{(time.perf_counter() - start) * 10:.3f} ms each")
+        problems = check_stats(conn)
+        print(f"  materialised == live: {not problems}{'' if not problems else ' ' + ', '.join(problems[:5])}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
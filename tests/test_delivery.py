@@ -0,0 +1,117 @@
+import importlib.util
+import os
+import unittest
+
+# "Test 2.py" has a space in its name, so it is loaded by path
+spec = importlib.util.spec_from_file_location(
+    "test2", os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Test 2.py"))
+test2 = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(test2)
+
+
+class TestDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        # Two couriers and three orders, each to its own building
+        self.engine = test2.DeliveryEngine()
+        self.engine.add_courier(test2.Courier(1, "Toshinori Yagi"))
+        self.engine.add_courier(test2.Courier(2, "Yami Sukehiro"))
+        for order_id, building in ((101, "Black Bulls Base"), (102, "UA Apartments"), (103, "Black Gate Hostel")):
+            self.engine.add_delivery(test2.Deliveries(order_id, "Ramen", (building, "Room 1")))
+
+    def test_least_loaded_after_release(self):
+        self.assertEqual(self.engine.dispatch_pending(), 3)
+        self.assertEqual(self.engine.courier_queue_lengths(), {1: 2, 2: 1})
+
+        self.engine.complete_delivery(101)
+        self.engine.complete_delivery(103)
+        self.assertEqual(self.engine.courier_queue_lengths(), {1: 0, 2: 1})
+        self.engine.add_delivery(test2.Deliveries(104, "Ramen", ("Dorm D", "Room 1")))
+        self.assertEqual(self.engine.dispatch_pending(), 1)
+        self.assertEqual(self.engine.courier_of(104), 1)
+
+    def test_reassign_to_explicit_courier(self):
+        self.engine.dispatch_pending(limit=2)
+        self.assertEqual(self.engine.courier_of(102), 2)
+
+        self.assertEqual(self.engine.reassign(102, 1), 1)
+        self.assertEqual(self.engine.courier_of(102), 1)
+        self.assertEqual(self.engine.courier_queue_lengths(), {1: 2, 2: 0})
+        self.assertEqual(self.engine.reassign(101), 2)   # released first, then courier 2 is the least loaded
+
+        with self.assertRaises(test2.DeliveryError):
+            self.engine.reassign(102, 9)
+        with self.assertRaises(test2.DeliveryError):
+            self.engine.reassign(999, 1)
+
+    def test_auto_dispatch_on_completion(self):
+        self.engine.auto_dispatch = True
+        self.assertEqual(self.engine.dispatch_pending(limit=2), 2)
+        self.assertEqual(self.engine.waiting(), 1)
+        self.assertIsNone(self.engine.courier_of(103))
+
+        self.engine.complete_delivery(101)
+        self.assertEqual(self.engine.courier_of(103), 1)
+        self.assertEqual(self.engine.waiting(), 0)
+
+    def test_queue_lengths_total(self):
+        for i in range(9):
+            self.engine.add_delivery(test2.Deliveries(200 + i, "Ramen", ("AB"[i % 2], "Room 1")))
+        self.engine.dispatch_pending(limit=8)
+        self.engine.complete_delivery(101)
+        self.engine.complete_delivery(208)   # never dispatched
+        self.engine.reassign(103, 2)
+
+        lengths = self.engine.courier_queue_lengths()
+        self.assertEqual(sum(lengths.values()), len(self.engine.dispatcher.assigned))
+        self.assertEqual(sum(lengths.values()), 7)
+        self.assertEqual(sum(lengths.values()) + self.engine.waiting(), self.engine.outstanding())
+        self.assertEqual(self.engine.outstanding(), 10)
+
+
+class TestDeliveryEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = test2.DeliveryEngine()
+        for order_id in range(1, 11):
+            self.engine.add_delivery(test2.Deliveries(order_id, "Ramen", ("UA Apartments", f"Room {order_id}")))
+
+    def page(self, offset, limit):
+        return [d.order_id for d in self.engine.incomplete_deliveries(offset, limit)]
+
+    def test_paging(self):
+        self.assertEqual(self.page(0, 4), [1, 2, 3, 4])
+        self.assertEqual(self.page(8, 4), [9, 10])
+        self.assertEqual(self.page(10, 4), [])
+        self.assertEqual(self.page(3, None), [4, 5, 6, 7, 8, 9, 10])
+
+        # The oldest order stays open, so completed ones pile up behind it until the queue is rebuilt
+        for order_id in range(2, 9):
+            self.engine.complete_delivery(order_id)
+        # Rebuilt after the sixth completion; 8, completed later, is still skipped lazily
+        self.assertEqual(list(self.engine._arrivals), [1, 8, 9, 10])
+        self.assertEqual(self.page(0, 2), [1, 9])
+        self.assertEqual(self.page(2, 2), [10])
+        self.engine.complete_delivery(1)
+        self.assertEqual(self.page(0, 5), [9, 10])
+
+        # A page can be walked while its orders are completed
+        for delivery in self.engine.pending_deliveries(0, 5):
+            self.engine.complete_delivery(delivery.order_id)
+        self.assertEqual(self.engine.outstanding(), 0)
+        self.assertEqual(self.page(0, 5), [])
+
+    def test_complete_unknown_or_twice(self):
+        with self.assertRaises(test2.DeliveryError):
+            self.engine.complete_delivery(999)
+        self.engine.complete_delivery(3)
+        with self.assertRaises(test2.DeliveryError):
+            self.engine.complete_delivery(3)
+        self.assertEqual(self.engine.outstanding(), 9)
+
+    def test_duplicate_add_rejected(self):
+        with self.assertRaises(test2.DeliveryError):
+            self.engine.add_delivery(test2.Deliveries(5, "Gyoza", ("Black Gate Hostel", "Room 2")))
+        self.assertEqual(self.engine.orders[5].item, "Ramen")
+        self.assertEqual(len(self.engine.deliveries), 10)
+        self.assertEqual(self.page(4, 2), [5, 6])
@@ -0,0 +1,142 @@
+import sqlite3
+import unittest
+
+from edb_loader import connect, load_results, load_results_with_triggers
+from edb_stats import check_stats, refresh_exam_stats
+
+
+def make_term(conn: sqlite3.Connection, students: int = 12):
+    """Students 1..n, course 1 with student 1 enrolled, and exam 1 of course 1."""
+    with conn:
+        for person_id in range(1, students + 1):
+            conn.execute("INSERT INTO Person (PersonID, FullName, Email, Password, RoleType) "
+                         "VALUES (?, ?, ?, 'x', 'Student')",
+                         (person_id, f"Student {person_id}", f"s{person_id}@edb"))
+            conn.execute("INSERT INTO Student (PersonID) VALUES (?)", (person_id,))
+        conn.execute("INSERT INTO Course (CourseID, CourseName) VALUES (1, 'Databases')")
+        conn.execute("INSERT INTO Enrollment (StudentID, CourseID) VALUES (1, 1)")
+        # trg_AfterExamInsert adds a score-0 result for student 1
+        conn.execute("INSERT INTO Exam (ExamID, CourseID, ExamDate, Duration) VALUES (1, 1, '2024-05-01', 90)")
+
+
+def triggers(conn: sqlite3.Connection):
+    return sorted(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall())
+
+
+class TestEdbLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = connect(":memory:")
+        make_term(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def results(self, conn=None):
+        return (conn or self.conn).execute(
+            "SELECT ExamID, StudentID, Score, Grade FROM Result ORDER BY StudentID").fetchall()
+
+    def test_grade_band_edges(self):
+        scores = [85, 84.99, 70, 69.99, 55, 54.99, 40, 39.99, 100, 0]
+        rows = [(1, student_id, score) for student_id, score in enumerate(scores, start=2)]
+        self.assertEqual(load_results(self.conn, rows), (10, 0))
+        grades = {student_id: grade for _, student_id, _, grade in self.results()}
+        self.assertEqual([grades[student_id] for student_id in range(2, 12)],
+                         ['A', 'B', 'B', 'C', 'C', 'D', 'D', 'F', 'A', 'F'])
+
+    def test_upsert_on_duplicate(self):
+        result_id = self.conn.execute("SELECT ResultID FROM Result WHERE StudentID = 1").fetchone()[0]
+        self.assertEqual(load_results(self.conn, [(1, 1, 91.5), (1, 2, 60)]), (1, 1))
+        self.assertEqual(self.results(), [(1, 1, 91.5, 'A'), (1, 2, 60.0, 'C')])
+        self.assertEqual(self.conn.execute("SELECT ResultID FROM Result WHERE StudentID = 1").fetchone()[0],
+                         result_id)
+
+        # A second load of the same pairs only updates
+        self.assertEqual(load_results(self.conn, [(1, 1, 30), (1, 2, 75)]), (0, 2))
+        self.assertEqual(self.results(), [(1, 1, 30.0, 'F'), (1, 2, 75.0, 'B')])
+
+    def test_one_audit_row_per_insert(self):
+        before = self.conn.execute("SELECT MAX(ResultID) FROM Result").fetchone()[0]
+        load_results(self.conn, [(1, 1, 50), (1, 2, 60), (1, 3, 70)])
+        audit = self.conn.execute("SELECT TableName, OperationType, Details FROM AuditLog "
+                                  "WHERE ChangedBy = 'edb_loader' ORDER BY AuditID").fetchall()
+        new_ids = [row[0] for row in self.conn.execute(
+            "SELECT ResultID FROM Result WHERE ResultID > ? ORDER BY ResultID", (before,))]
+        self.assertEqual(len(audit), 2)
+        self.assertEqual(audit, [('Result', 'INSERT', f"Inserted ResultID:{result_id} Score:{score}")
+                                 for result_id, score in zip(new_ids, (60, 70))])
+
+    def test_same_end_state_as_triggers(self):
+        rows = [(1, 1, 88), (1, 4, 41.5), (1, 5, 12)]
+        reference = connect(":memory:")
+        make_term(reference)
+        self.assertEqual(load_results(self.conn, rows), load_results_with_triggers(reference, rows))
+        self.assertEqual(self.results(), self.results(reference))
+        reference.close()
+
+    def test_triggers_restored(self):
+        expected = triggers(self.conn)
+        load_results(self.conn, [(1, 2, 90)])
+        self.assertEqual(triggers(self.conn), expected)
+        # Student 99 does not exist: the batch fails after the triggers were dropped and is rolled back
+        with self.assertRaises(sqlite3.IntegrityError):
+            load_results(self.conn, [(1, 3, 50), (1, 99, 50)])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM Result WHERE StudentID = 3").fetchone()[0], 0)
+        self.assertEqual(triggers(self.conn), expected)
+
+        # And they fire again: a plain score update regrades the row
+        with self.conn:
+            self.conn.execute("UPDATE Result SET Score = 10 WHERE StudentID = 2")
+        self.assertEqual(self.results()[1], (1, 2, 10.0, 'F'))
+
+
+class TestEdbStats(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = connect(":memory:")
+        make_term(self.conn)
+        with self.conn:
+            self.conn.execute("INSERT INTO Course (CourseID, CourseName) VALUES (2, 'Networks')")
+            self.conn.execute("INSERT INTO Exam (ExamID, CourseID, ExamDate, Duration) "
+                              "VALUES (2, 2, '2024-05-02', 60)")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def assertStatsFresh(self):
+        self.assertEqual(check_stats(self.conn), [])
+        stats = lambda: (self.conn.execute("SELECT * FROM ExamStats ORDER BY ExamID").fetchall(),
+                         self.conn.execute("SELECT * FROM CourseStats WHERE ResultCount > 0 "
+                                           "ORDER BY CourseID").fetchall())
+        kept = stats()
+        self.conn.execute("SAVEPOINT fresh")
+        refresh_exam_stats(self.conn)
+        fresh = stats()
+        self.conn.execute("ROLLBACK TO fresh")
+        self.conn.execute("RELEASE fresh")
+        self.assertEqual(kept, fresh)
+
+    def execute(self, sql, params=()):
+        with self.conn:
+            self.conn.execute(sql, params)
+        self.assertStatsFresh()
+
+    def test_triggers_keep_stats_current(self):
+        self.assertStatsFresh()
+        for student_id, score in ((2, 91), (3, 70), (4, 54.99), (5, 12.5)):
+            self.execute("INSERT INTO Result (ExamID, StudentID, Score) VALUES (1, ?, ?)", (student_id, score))
+        self.execute("INSERT INTO Result (ExamID, StudentID, Score) VALUES (2, 6, 66)")
+        self.execute("UPDATE Result SET Score = 85 WHERE StudentID = 3")
+        self.execute("UPDATE Result SET ExamID = 2 WHERE StudentID = 4")
+        self.execute("DELETE FROM Result WHERE StudentID = 5")
+        self.execute("UPDATE Exam SET CourseID = 2 WHERE ExamID = 1")
+        self.execute("DELETE FROM Exam WHERE ExamID = 2")
+        self.assertEqual(self.conn.execute("SELECT ResultCount FROM CourseStats WHERE CourseID = 2").fetchone(),
+                         (3,))
+
+    def test_bulk_load_refreshes_stats(self):
+        load_results(self.conn, [(1, student_id, student_id * 7.5) for student_id in range(1, 13)])
+        self.assertStatsFresh()
+        load_results(self.conn, [(1, 1, 99), (2, 2, 40), (2, 3, 39.99)])
+        self.assertStatsFresh()
+        self.execute("UPDATE Result SET Score = 55 WHERE ExamID = 2 AND StudentID = 3")